@@ -33,10 +33,18 @@ unjsonify class method.
 
 """
 
+import importlib
+
+from typing import TYPE_CHECKING
+
+# codec and constraint are not imported lazily, as importing the modules
+# of the same names would replace the attributes
+from jsno.codec import Codec, codec
 from jsno.constraint import Constraint, constraint
 from jsno.extra_data import extra_data
 from jsno.jsonify import jsonify
 from jsno.jsonize import loads, dumps
+from jsno.lazy import register_lazy
 from jsno.method import jsonify_with_method
 from jsno.property_name import property_name
 from jsno.schema import Schema
@@ -47,28 +55,115 @@ from jsno.variant import get_variantfamily, variantfamily, variantlabel, Variant
 
 # import to register jsonifiers
 import jsno.abc  # noqa
-import jsno.datetime  # noqa
-import jsno.tuple  # noqa
+
+# jsonifiers for other standard library modules are registered when
+# a type from the module is first seen
+register_lazy("jsno.datetime", "datetime")
+register_lazy("jsno.decimal", "decimal")
+register_lazy("jsno.numpy", "numpy")
+register_lazy("jsno.pathlib", "pathlib")
+register_lazy("jsno.uuid", "uuid")
+register_lazy("jsno.zoneinfo", "zoneinfo")
+
+# the optional encodings and annotations are imported when first accessed
+lazy_attributes = {
+    "bypass_init": "jsno.construction",
+    "categorical": "jsno.interning",
+    "deep_jsonify": "jsno.deep",
+    "deep_unjsonify": "jsno.deep",
+    "dumpb": "jsno.buffers",
+    "enum_mode": "jsno.enum",
+    "loadb": "jsno.buffers",
+    "out_of_band": "jsno.buffers",
+    "pack_many": "jsno.packing",
+    "packb": "jsno.msgpack",
+    "packed": "jsno.array",
+    "set_codec_cache": "jsno.codegen",
+    "unpack_many": "jsno.packing",
+    "unpackb": "jsno.msgpack",
+    "Base64": "jsno.buffers",
+    "Columnar": "jsno.tabular",
+    "EnumCodec": "jsno.enum",
+    "GraphRegistry": "jsno.graph",
+    "Hex": "jsno.buffers",
+    "NamedTupleCodec": "jsno.tuple",
+    "Packed": "jsno.array",
+    "Registry": "jsno.registry",
+    "Rows": "jsno.tabular",
+}
+
+if TYPE_CHECKING:
+    from jsno.array import Packed, packed
+    from jsno.buffers import Base64, Hex, dumpb, loadb, out_of_band
+    from jsno.codegen import set_codec_cache
+    from jsno.construction import bypass_init
+    from jsno.deep import deep_jsonify, deep_unjsonify
+    from jsno.enum import EnumCodec, enum_mode
+    from jsno.graph import GraphRegistry
+    from jsno.interning import categorical
+    from jsno.msgpack import packb, unpackb
+    from jsno.packing import pack_many, unpack_many
+    from jsno.registry import Registry
+    from jsno.tabular import Columnar, Rows
+    from jsno.tuple import NamedTupleCodec
+
+
+def __getattr__(name: str):
+    module_name = lazy_attributes.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = globals()[name] = getattr(importlib.import_module(module_name), name)
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *lazy_attributes})
 
 
 __version__ = "1.2.3"
 
 __all__ = [
+    "bypass_init",
+    "categorical",
+    "codec",
     "constraint",
+    "deep_jsonify",
+    "deep_unjsonify",
+    "dumpb",
     "dumps",
+    "enum_mode",
     "jsonify",
     "jsonify_as_string",
     "jsonify_with_method",
     "extra_data",
     "get_variantfamily",
+    "loadb",
     "loads",
+    "out_of_band",
+    "pack_many",
+    "packb",
+    "packed",
     "property_name",
+    "set_codec_cache",
     "typecheck",
     "unjsonify",
+    "unpack_many",
+    "unpackb",
     "variantfamily",
     "variantlabel",
+    "Base64",
+    "Codec",
+    "Columnar",
     "Constraint",
+    "EnumCodec",
+    "GraphRegistry",
+    "Hex",
     "JSON",
+    "NamedTupleCodec",
+    "Packed",
+    "Registry",
+    "Rows",
     "Schema",
     "UnjsonifyError",
     "VariantFamily",
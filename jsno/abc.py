@@ -2,26 +2,30 @@
 Jsonification and unjsonification for abstract base classes
 """
 
-import base64
+import collections
 import typing
 
 from collections.abc import Mapping, Sequence, Set
 
-from jsno.jsonify import jsonify
+from jsno.constraint import get_bulk_check, validation
+from jsno.interning import intern_keys
+from jsno.jsonify import (
+    batch_types, call_jsonify, jsonify, jsonify_batch, jsonify_dict, native_types, options, register_container,
+)
 from jsno.typeddict import unjsonify_typeddict_factory
-from jsno.unjsonify import unjsonify, typecheck, UnjsonifyError, cast
+from jsno.unjsonify import active_unjsonify, unjsonify, typecheck, UnjsonifyError, cast
 
 
 # Mapping
 
 
 @jsonify.register
-def _(value: Mapping):
+def jsonify_mapping(value: Mapping):
     return {str(jsonify(key)): jsonify(val) for (key, val) in value.items()}
 
 
 @unjsonify.register_factory(Mapping)
-def _(as_type):
+def unjsonify_mapping_factory(as_type):
     """
     Unjsonify any Mapping type. Expects the input value to be
     a JSON object (dict).
@@ -41,7 +45,7 @@ def _(as_type):
                 unjsonify_key(key): unjsonify_val(val)
                 for (key, val) in value.items()
             }
-            return cast(as_dict, as_type)
+            return cast(intern_keys(as_dict), as_type)
 
         return unjsonify_dict_with_types
 
@@ -59,12 +63,37 @@ def _(as_type):
 
     return unjonify_untyped_mapping
 
+
+def jsonify_dict_subclass(value: dict) -> dict:
+    result = jsonify_dict(value)
+    return dict(result) if result is value else result
+
 # Sequence
 
 
 @jsonify.register
 def jsonify_sequence(value: Sequence):
-    return [jsonify(val) for val in value]
+    if value and type(value[0]) in batch_types and (batch_json := jsonify_batch(value)) is not None:
+        return batch_json
+
+    return [call_jsonify(val) for val in value]
+
+
+def get_bulk_unjsonify(item_type) -> tuple[typing.Callable, typing.Callable] | None:
+    """
+    For an item type annotated with range and length constraints only, get
+    the unjsonifier of the plain type, and the function checking all the
+    unjsonified items at once.
+    """
+
+    if typing.get_origin(item_type) is not typing.Annotated:
+        return None
+
+    (plain_type, *annotations) = typing.get_args(item_type)
+    if (check := get_bulk_check(plain_type, annotations)) is None:
+        return None
+
+    return (unjsonify[plain_type], check)
 
 
 @unjsonify.register_factory(Sequence)
@@ -78,6 +107,36 @@ def unjsonify_sequence_factory(as_type):
 
         return specialized_untyped
 
+    elif batch := active_unjsonify().get_batch(arg_types[0]):
+        item_type = arg_types[0]
+
+        def specialized_batch(value):
+            typecheck(value, (list, Sequence), as_type)
+            try:
+                return cast(batch(value, item_type), as_type)
+            except ValueError as exc:
+                detail = exc.args[0] if exc.args else None
+
+            raise UnjsonifyError(value, as_type, detail)
+
+        return specialized_batch
+
+    elif bulk := get_bulk_unjsonify(arg_types[0]):
+        (unjsonify_plain, check) = bulk
+        unjsonify_item = unjsonify[arg_types[0]]
+
+        def specialized_bulk(value):
+            typecheck(value, (list, Sequence), as_type)
+            items = [unjsonify_plain(item) for item in value]
+
+            if not validation.trusted and not check(items):
+                # unjsonify the items one by one, to find the invalid one
+                items = [unjsonify_item(item) for item in value]
+
+            return cast(items, as_type)
+
+        return specialized_bulk
+
     else:
         unjsonify_item = unjsonify[arg_types[0]]
 
@@ -92,18 +151,32 @@ def unjsonify_sequence_factory(as_type):
 
 
 @jsonify.register
-def _(value: Set):
+def jsonify_set(value: Set):
     """
     Set is not a sequence, so it needs it's own jsonifier.
     Because the order of iterating over a set is not defined, the jsonification
     tries to sort the set first, to make the results more predictable.
+    Sorting can be turned off with `jsonify.unsorted_sets()`.
     """
 
+    if not value or not options.sort_sets:
+        return jsonify_sequence(list(value))
+
+    types = set(map(type, value))
+    if len(types) == 1:
+        # the items can be compared without the key
+        try:
+            sorted_value = sorted(value)
+        except TypeError:
+            return jsonify_sequence(list(value))
+
+        return sorted_value if types <= native_types else jsonify_sequence(sorted_value)
+
     # if possible, sort the values first.
     try:
-        sorted_value: typing.Iterable = sorted(value, key=lambda v: (type(v).__name__, v))
+        sorted_value = sorted(value, key=lambda v: (type(v).__name__, v))
     except Exception:
-        sorted_value = value
+        sorted_value = list(value)
 
     return jsonify_sequence(sorted_value)
 
@@ -111,21 +184,11 @@ def _(value: Set):
 unjsonify.register_factory(Set)(unjsonify_sequence_factory)
 
 
-# ByteString abstract base class
-
-
-@jsonify.register
-def _(value: bytes):
-    return base64.b64encode(value).decode("ascii")
-
-
-@unjsonify.register(bytes)
-def _(value, as_type):
-    typecheck(value, str, as_type)
-
-    try:
-        return base64.b64decode(value.encode("ascii"))
-    except ValueError as exc:
-        detail = exc.args[0]
+# concrete containers, jsonified without dispatching
 
-    raise UnjsonifyError(value, as_type, detail)
+register_container(set, jsonify_set, jsonify_set)
+register_container(frozenset, jsonify_set, jsonify_set)
+register_container(collections.deque, jsonify_sequence, jsonify_sequence)
+register_container(collections.OrderedDict, jsonify_dict_subclass, jsonify_mapping)
+register_container(collections.defaultdict, jsonify_dict_subclass, jsonify_mapping)
+register_container(collections.Counter, jsonify_dict_subclass, jsonify_mapping)
@@ -0,0 +1,149 @@
+"""
+Compact storage of numeric lists in typed arrays of the standard library
+`array` module.
+
+Fields annotated as `array.array[int]` or `array.array[float]` are
+unjsonified from lists of numbers into arrays of 64-bit integers or
+floats. Lists can also be stored as arrays by annotating them with
+`jsno.packed`, or with `jsno.Packed(typecode)` for other item sizes:
+
+    @dataclass
+    class Series:
+        samples: Annotated[list[float], jsno.packed]
+        counts: Annotated[list[int], jsno.Packed("H")]
+
+The items are type-checked in bulk, and booleans are not accepted as
+numbers. Arrays and memoryviews are jsonified as lists.
+"""
+
+import array
+import dataclasses
+
+from typing import Any, Callable, get_args, get_origin
+
+from jsno.buffers import jsonify_buffer, unjsonify_buffer
+from jsno.codec import Codec
+from jsno.jsonify import call_jsonify, jsonify
+from jsno.unjsonify import active_unjsonify, unjsonify, typecheck, UnjsonifyError
+from jsno.utils import JSON
+
+
+# the default typecodes for the item types
+default_typecodes = {
+    int: "q",
+    float: "d",
+}
+
+# the types of JSON values accepted for each typecode
+accepted_types = {
+    **{typecode: frozenset({int}) for typecode in "bBhHiIlLqQ"},
+    "f": frozenset({int, float}),
+    "d": frozenset({int, float}),
+}
+
+
+def get_typecode(as_type) -> str | None:
+    """
+    Get the default typecode for array.array[T] or list[T], or None if
+    the item type is not given.
+    """
+
+    args = get_args(as_type)
+    if not args:
+        return None
+
+    if (typecode := default_typecodes.get(args[0])) is None:
+        raise TypeError(f"Cannot store the items of {as_type!r} in an array")
+
+    return typecode
+
+
+def infer_typecode(value: list) -> str:
+    """
+    Get the typecode for a list of numbers, when it isn't given by the type.
+    """
+    return "q" if all(type(item) is int for item in value) else "d"
+
+
+def get_unjsonify_array(as_type, typecode: str | None) -> Callable[[JSON], array.array]:
+    if typecode is not None and typecode not in accepted_types:
+        raise TypeError(f"Unsupported array typecode {typecode!r}")
+
+    def unjsonify_array(value):
+        typecheck(value, list, as_type)
+
+        code = typecode or infer_typecode(value)
+        if not set(map(type, value)) <= accepted_types[code]:
+            raise UnjsonifyError(value, as_type, "unexpected item types")
+
+        try:
+            return array.array(code, value)
+        except OverflowError as exc:
+            detail = exc.args[0]
+
+        raise UnjsonifyError(value, as_type, detail)
+
+    return unjsonify_array
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Packed(Codec):
+    """
+    Annotation for storing a list of numbers in an array.array, with the
+    given typecode. By default, 64-bit integers or floats are used, depending
+    on the item type of the list.
+    """
+
+    typecode: str | None = None
+
+    def get_jsonify(self, as_type) -> Callable[[Any], JSON]:
+        return call_jsonify
+
+    def get_unjsonify(self, as_type) -> Callable[[JSON], Any]:
+        typecode = self.typecode or get_typecode(as_type)
+
+        if (get_origin(as_type) or as_type) is memoryview:
+            unjsonify_array = get_unjsonify_array(as_type, typecode)
+            return lambda value: memoryview(unjsonify_array(value))
+
+        return get_unjsonify_array(as_type, typecode)
+
+
+packed = Packed()
+
+
+@jsonify.register(array.array)
+def _(value):
+    return value.tolist()
+
+
+@jsonify.register(memoryview)
+def _(value):
+    if value.format in ("B", "c"):
+        # jsonify byte buffers like bytes
+        return jsonify_buffer(value)
+
+    return value.tolist()
+
+
+@unjsonify.register_factory(array.array)
+def _(as_type):
+    return get_unjsonify_array(as_type, get_typecode(as_type))
+
+
+@unjsonify.register_factory(memoryview)
+def _(as_type):
+    unjsonify_array = get_unjsonify_array(as_type, None)
+    unjsonify_bytes = active_unjsonify()[bytes]
+
+    def unjsonify_memoryview(value):
+        if isinstance(value, list):
+            return memoryview(unjsonify_array(value))
+
+        if isinstance(value, str):
+            return memoryview(unjsonify_bytes(value))
+
+        # out-of-band buffers and bytes-like values are not copied
+        return memoryview(unjsonify_buffer(value, as_type))
+
+    return unjsonify_memoryview
@@ -0,0 +1,314 @@
+"""
+Binary data: bytes-like values are jsonified as base64 strings, or as
+references to out-of-band buffers.
+
+Inside an `out_of_band` context, binary values of at least `threshold`
+bytes are not encoded, but collected to a list of buffers, and replaced
+by references `{"$buffer": index}`:
+
+    with jsno.out_of_band(threshold=4096) as buffers:
+        value = jsno.jsonify(record)
+
+    with jsno.out_of_band(buffers):
+        record = jsno.unjsonify[Record](value)
+
+`dumpb` and `loadb` write and read the JSON value and the buffers as a
+single frame, without base64 encoding the buffers:
+
+    data = jsno.dumpb(record)
+    record = jsno.loadb[Record](data)
+
+The `Hex` and `Base64` codecs select another encoding for a field:
+
+    checksum: bytes // jsno.codec(jsno.Hex())
+"""
+
+import contextlib
+import dataclasses
+import json
+import struct
+import threading
+
+from typing import IO, Any, Callable, Generic, Iterator, TypeVar
+
+from jsno.codec import Codec
+from jsno.fields_unjsonifier import typecheck, UnjsonifyError
+from jsno.jsonify import jsonify
+from jsno.unjsonify import unjsonify
+from jsno.utils import JSON
+
+
+T = TypeVar("T")
+
+DEFAULT_THRESHOLD = 1024
+"""Minimum size of the binary values that are moved out of band"""
+
+BUFFER_KEY = "$buffer"
+
+buffer_types = (bytes, bytearray, memoryview)
+
+
+class OutOfBand:
+    """
+    The out-of-band buffers of the current context.
+    """
+
+    __slots__ = ("buffers", "threshold")
+
+    def __init__(self, buffers: list, threshold: int):
+        self.buffers = buffers
+        self.threshold = threshold
+
+    def add(self, value) -> JSON:
+        """
+        Add a binary value to the buffers, and return the reference to it.
+        """
+
+        self.buffers.append(memoryview(value).cast("B"))
+        return {BUFFER_KEY: len(self.buffers) - 1}
+
+    def get(self, value: dict, as_type) -> Any:
+        """
+        Get the buffer that a reference refers to.
+        """
+
+        index = value[BUFFER_KEY]
+        if type(index) is not int or not 0 <= index < len(self.buffers) or len(value) != 1:
+            raise UnjsonifyError(value, as_type, "Invalid buffer reference")
+
+        return self.buffers[index]
+
+
+class Sessions(threading.local):
+    current: OutOfBand | None = None
+
+
+sessions = Sessions()
+
+
+@contextlib.contextmanager
+def out_of_band(
+    buffers: list | None = None,
+    threshold: int = DEFAULT_THRESHOLD,
+) -> Iterator[list[memoryview]]:
+    """
+    Jsonify the binary values of at least `threshold` bytes as references
+    to out-of-band buffers, which are collected to the yielded list. When
+    unjsonifying, the references are resolved from the given buffers.
+    """
+
+    session = OutOfBand([] if buffers is None else buffers, threshold)
+    previous = sessions.current
+    sessions.current = session
+    try:
+        yield session.buffers
+    finally:
+        sessions.current = previous
+
+
+def jsonify_buffer(value) -> JSON:
+    """
+    Jsonify a bytes-like value as a base64 string, or as a reference to
+    an out-of-band buffer.
+    """
+
+    if (session := sessions.current) is not None and len(value) >= session.threshold:
+        return session.add(value)
+
+    # binascii is imported here, as it's not needed for importing jsno
+    import binascii
+    return binascii.b2a_base64(value, newline=False).decode("ascii")
+
+
+def unjsonify_buffer(value, as_type) -> Any:
+    """
+    Unjsonify a base64 string or a reference to an out-of-band buffer.
+    Bytes-like values are accepted as such. The result is a bytes-like
+    object, which may be a view of an out-of-band buffer.
+    """
+
+    if type(value) is str:
+        import binascii
+        try:
+            return binascii.a2b_base64(value)
+        except ValueError as exc:
+            detail = exc.args[0]
+
+        raise UnjsonifyError(value, as_type, detail)
+
+    if type(value) is dict and BUFFER_KEY in value and (session := sessions.current) is not None:
+        return session.get(value, as_type)
+
+    if isinstance(value, buffer_types):
+        return value
+
+    raise UnjsonifyError(value, as_type)
+
+
+jsonify.register(bytes)(jsonify_buffer)
+jsonify.register(bytearray)(jsonify_buffer)
+
+
+@unjsonify.register(bytes)
+def _(value, as_type):
+    return bytes(unjsonify_buffer(value, as_type))
+
+
+@unjsonify.register(bytearray)
+def _(value, as_type):
+    return bytearray(unjsonify_buffer(value, as_type))
+
+
+# codecs
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Hex(Codec):
+    """
+    Codec for jsonifying bytes as hexadecimal strings.
+    """
+
+    def get_jsonify(self, as_type) -> Callable[[Any], JSON]:
+        return bytes.hex
+
+    def get_unjsonify(self, as_type) -> Callable[[JSON], Any]:
+
+        def unjsonify_hex(value):
+            typecheck(value, str, as_type)
+            try:
+                return as_type(bytes.fromhex(value))
+            except ValueError as exc:
+                detail = exc.args[0]
+
+            raise UnjsonifyError(value, as_type, detail)
+
+        return unjsonify_hex
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Base64(Codec):
+    """
+    Codec for jsonifying bytes as base64 strings, optionally with the
+    URL and filename safe alphabet.
+    """
+
+    urlsafe: bool = False
+
+    def get_jsonify(self, as_type) -> Callable[[Any], JSON]:
+        # base64 is imported here, as it's only needed when the codec is used
+        import base64
+        encode = base64.urlsafe_b64encode if self.urlsafe else base64.b64encode
+        return lambda value: encode(value).decode("ascii")
+
+    def get_unjsonify(self, as_type) -> Callable[[JSON], Any]:
+        import base64
+        import binascii
+        altchars = b"-_" if self.urlsafe else None
+
+        def unjsonify_base64(value):
+            typecheck(value, str, as_type)
+            try:
+                return as_type(base64.b64decode(value.encode("ascii"), altchars, validate=True))
+            except (ValueError, binascii.Error) as exc:
+                detail = exc.args[0]
+
+            raise UnjsonifyError(value, as_type, detail)
+
+        return unjsonify_base64
+
+
+# frames
+
+header_length = struct.Struct(">I")
+
+
+def get_frame_parts(value, threshold: int) -> list:
+    with out_of_band(threshold=threshold) as buffers:
+        json_value = jsonify(value)
+
+    header = json.dumps(
+        {"value": json_value, "buffers": [buffer.nbytes for buffer in buffers]},
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+    return [header_length.pack(len(header)), header, *buffers]
+
+
+def dumpb(value, threshold: int = DEFAULT_THRESHOLD) -> bytes:
+    """
+    Jsonify the value, and encode it as a frame of the JSON value followed
+    by the raw out-of-band buffers.
+    """
+
+    return b"".join(get_frame_parts(value, threshold))
+
+
+def dump(value, file: IO[bytes], threshold: int = DEFAULT_THRESHOLD) -> None:
+    """
+    Jsonify the value, and write it to a binary file as a frame. The
+    buffers are written directly, without copying them.
+    """
+
+    for part in get_frame_parts(value, threshold):
+        file.write(part)
+
+
+def read_header(data: bytes) -> tuple[JSON, list[int]]:
+    header = json.loads(data)
+    return (header["value"], header["buffers"])
+
+
+class Loadb(Generic[T]):
+    """
+    Factory for type-specific functions reading frames. The binary values
+    that are unjsonified as memoryviews refer to the given data directly.
+    """
+
+    def __getitem__(self, type_: type[T]) -> Callable[[Any], T]:
+        unjsonify_ = unjsonify[type_]
+
+        def loadb(data) -> T:
+            view = memoryview(data).cast("B")
+            (length,) = header_length.unpack_from(view)
+
+            pos = header_length.size + length
+            (json_value, sizes) = read_header(bytes(view[header_length.size:pos]))
+
+            buffers = []
+            for size in sizes:
+                buffers.append(view[pos:pos + size])
+                pos += size
+
+            if pos != len(view):
+                raise ValueError("Invalid frame size")
+
+            with out_of_band(buffers):
+                return unjsonify_(json_value)
+
+        return loadb
+
+
+class Load(Generic[T]):
+    """
+    Factory for type-specific functions reading a frame from a file
+    """
+
+    def __getitem__(self, type_: type[T]) -> Callable[[IO[bytes]], T]:
+        unjsonify_ = unjsonify[type_]
+
+        def load(file: IO[bytes]) -> T:
+            (length,) = header_length.unpack(file.read(header_length.size))
+            (json_value, sizes) = read_header(file.read(length))
+            buffers = [memoryview(file.read(size)) for size in sizes]
+
+            if any(len(buffer) != size for (buffer, size) in zip(buffers, sizes)):
+                raise ValueError("Truncated frame")
+
+            with out_of_band(buffers):
+                return unjsonify_(json_value)
+
+        return load
+
+
+loadb: Loadb = Loadb()
+load: Load = Load()
@@ -0,0 +1,181 @@
+"""
+Caches for the specialized jsonifiers and unjsonifiers.
+
+Codecs for classes are stored in the classes themselves, in an attribute
+specific to the cache, so that they are garbage collected together with
+the class. (The codecs usually refer to their class, so a weak-keyed
+dictionary would never release them.) Builtin classes that can't be
+given attributes are kept in a regular dictionary.
+
+Other types, like parameterized generics (list[int]) and Annotated types
+are kept in a LRU cache of bounded size. Unhashable types are cached by
+their identity.
+"""
+
+import collections
+import itertools
+import threading
+import weakref
+
+from typing import Any, Callable, NamedTuple
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class IdentityKey(NamedTuple):
+    """
+    Key for caching unhashable types by their identity.
+    """
+    id: int
+
+
+class CodecCache:
+    """
+    Cache mapping types to codecs.
+    """
+
+    counter = itertools.count()
+
+    def __init__(self, maxsize: int = 1024):
+        self.attribute = f"__jsno_cache_{next(CodecCache.counter)}__"
+        self.maxsize = maxsize
+
+        self.permanent: dict[Any, Callable] = {}
+        self.pinned: set = set()
+        self.lru: collections.OrderedDict[Any, tuple[Any, Callable]] = collections.OrderedDict()
+        self.classes: weakref.WeakSet[type] = weakref.WeakSet()
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key) -> Any:
+        """
+        Get the cached value for the key, or None if not found.
+        """
+
+        try:
+            value = self.permanent.get(key)
+        except TypeError:
+            # unhashable key
+            return self._get_lru(IdentityKey(id(key)), key)
+
+        if value is not None:
+            self.hits += 1
+            return value
+
+        if isinstance(key, type):
+            entry = getattr(key, self.attribute, None)
+
+            # check the owner, as the attribute is inherited by subclasses
+            if entry is not None and entry[0] is key:
+                self.hits += 1
+                return entry[1]
+
+            self.misses += 1
+            return None
+
+        return self._get_lru(key, key)
+
+    def _get_lru(self, lru_key, key) -> Any:
+        with self.lock:
+            entry = self.lru.get(lru_key)
+            if entry is None or (isinstance(lru_key, IdentityKey) and entry[0] is not key):
+                self.misses += 1
+                return None
+
+            self.lru.move_to_end(lru_key)
+
+        self.hits += 1
+        return entry[1]
+
+    def __setitem__(self, key, value) -> None:
+        if isinstance(key, type):
+            try:
+                setattr(key, self.attribute, (key, value))
+                self.classes.add(key)
+            except (TypeError, AttributeError):
+                # builtin or otherwise immutable class
+                self.permanent[key] = value
+            return
+
+        lru_key: Any = key
+        try:
+            hash(key)
+        except TypeError:
+            lru_key = IdentityKey(id(key))
+
+        with self.lock:
+            self.lru[lru_key] = (key, value)
+            self.lru.move_to_end(lru_key)
+            self._evict()
+
+    def pin(self, key, value) -> None:
+        """
+        Add a value that is never evicted from the cache.
+        """
+        self.permanent[key] = value
+        self.pinned.add(key)
+
+    def _evict(self) -> None:
+        while len(self.lru) > self.maxsize:
+            self.lru.popitem(last=False)
+            self.evictions += 1
+
+    def resize(self, maxsize: int) -> None:
+        """
+        Set the maximum number of cached types that are not classes.
+        """
+        with self.lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def invalidate(self, predicate: Callable[[Any], bool]) -> int:
+        """
+        Remove the values for which the predicate is true, except the
+        pinned ones. Returns the number of removed values.
+        """
+
+        removed = 0
+
+        for cls in list(self.classes):
+            entry = getattr(cls, self.attribute, None)
+            if entry is not None and entry[0] is cls and predicate(entry[1]):
+                delattr(cls, self.attribute)
+                self.classes.discard(cls)
+                removed += 1
+
+        for (key, value) in list(self.permanent.items()):
+            if key not in self.pinned and predicate(value):
+                del self.permanent[key]
+                removed += 1
+
+        with self.lock:
+            for (lru_key, (_, value)) in list(self.lru.items()):
+                if predicate(value):
+                    del self.lru[lru_key]
+                    removed += 1
+
+        return removed
+
+    def clear(self) -> None:
+        """
+        Remove all the values, except the pinned ones.
+        """
+        self.invalidate(lambda value: True)
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            maxsize=self.maxsize,
+            currsize=len(self.permanent) + len(self.classes) + len(self.lru),
+        )
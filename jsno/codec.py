@@ -0,0 +1,110 @@
+"""
+Annotations that change the JSON representation of the annotated type:
+
+    Records = Annotated[list[Record], jsno.Columnar()]
+
+    value = jsno.jsonify[Records](records)
+    records = jsno.unjsonify[Records](value)
+
+The annotations are also effective when used in the annotations of
+dataclass fields, where they are compiled into the field's conversion:
+
+    @dataclass
+    class Message:
+        checksum: bytes // jsno.codec(jsno.Hex())
+        sent: datetime // jsno.codec(EpochMillis)
+"""
+
+import dataclasses
+
+from typing import Any, Callable, get_args, get_origin, Union
+from types import NoneType, UnionType
+
+from jsno.fields_unjsonifier import UnjsonifyError
+from jsno.utils import Annotation, JSON
+
+
+class Codec(Annotation):
+    """
+    Base class for annotations that define the jsonifier and the
+    unjsonifier of the annotated type.
+    """
+
+    def get_jsonify(self, as_type: Any) -> Callable[[Any], JSON]:
+        """
+        Get the jsonify function for the annotated type.
+        """
+        raise NotImplementedError
+
+    def get_unjsonify(self, as_type: Any) -> Callable[[JSON], Any]:
+        """
+        Get the unjsonify function for the annotated type.
+        """
+        raise NotImplementedError
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Functions(Codec):
+    """
+    Codec made of a pair of functions, converting a value to JSON and back.
+    The unjsonify function may raise ValueError for invalid values.
+    """
+
+    jsonify: Callable[[Any], JSON]
+    unjsonify: Callable[[JSON], Any]
+
+    def get_jsonify(self, as_type) -> Callable[[Any], JSON]:
+        return self.jsonify
+
+    def get_unjsonify(self, as_type) -> Callable[[JSON], Any]:
+        unjsonify = self.unjsonify
+
+        def unjsonify_value(value):
+            try:
+                return unjsonify(value)
+            except ValueError as exc:
+                detail = str(exc)
+
+            raise UnjsonifyError(value, as_type, detail)
+
+        return unjsonify_value
+
+
+def codec(
+    codec_or_jsonify: Codec | type[Codec] | Callable[[Any], JSON],
+    unjsonify: Callable[[JSON], Any] | None = None,
+) -> Codec:
+    """
+    Create a codec annotation for a field: from a codec, a codec class
+    (instantiated with the default arguments), or a pair of functions.
+    """
+
+    if unjsonify is not None:
+        return Functions(codec_or_jsonify, unjsonify)  # type: ignore
+
+    if isinstance(codec_or_jsonify, type) and issubclass(codec_or_jsonify, Codec):
+        return codec_or_jsonify()
+
+    if not isinstance(codec_or_jsonify, Codec):
+        raise TypeError(f"Expected a codec or a pair of functions, got {codec_or_jsonify!r}")
+
+    return codec_or_jsonify
+
+
+def get_codec(type_) -> tuple[Codec, Any, bool] | None:
+    """
+    Get the codec annotation of a type, the annotated type, and whether
+    the type is optional (T | None, where T has the annotation).
+    Returns None, if the type doesn't have a codec.
+    """
+
+    if codec_ := Codec.get_annotation(type_):
+        return (codec_, get_args(type_)[0], False)
+
+    if get_origin(type_) in (Union, UnionType):
+        args = [arg for arg in get_args(type_) if arg is not NoneType]
+        if len(args) == 1 and len(get_args(type_)) == 2:
+            if codec_ := Codec.get_annotation(args[0]):
+                return (codec_, get_args(args[0])[0], True)
+
+    return None
@@ -0,0 +1,361 @@
+"""
+Generating the source code of dataclass unjsonifiers, and caching the
+compiled unjsonifiers on disk.
+
+The generated unjsonifiers inline the conversion of the fields that
+have native JSON types, and resolve the unjsonifiers of the other
+fields lazily, on the first call. Loading a cached unjsonifier doesn't
+need to generate and compile the code, which makes it cheap to do at
+start up.
+
+Caching is enabled by setting a cache directory, either by calling
+`set_codec_cache` or with the JSNO_CODEC_CACHE environment variable.
+The cache entries are keyed by a fingerprint that is computed from the
+dataclass fields and their resolved type hints, and from the jsno and
+Python versions.
+"""
+
+import dataclasses
+import marshal
+import os
+import re
+import sys
+import threading
+import types
+import warnings
+
+from collections.abc import Mapping
+from typing import Callable, Union, get_args, get_origin, get_type_hints
+
+from jsno.construction import get_construction_configuration
+from jsno.extra_data import get_extra_data_configuration
+from jsno.fields_unjsonifier import UnjsonifyError, unjsonify_context
+from jsno.property_name import get_property_name
+
+
+GENERATOR_VERSION = 1
+"""Version of the generated code. Bumped when the generator changes."""
+
+
+MODULE_HEADER = '''"""
+Unjsonifiers generated by jsno.compile. Do not edit.
+"""
+
+from collections.abc import Mapping
+
+from jsno.codegen import install
+from jsno.fields_unjsonifier import UnjsonifyError, unjsonify_context
+'''
+
+
+native_type_names = {str: "str", int: "int", float: "float", bool: "bool"}
+
+
+def get_jsno_version() -> str:
+    # jsno.__init__ can't be imported here, as it imports this module
+    return getattr(sys.modules.get("jsno"), "__version__", "")
+
+
+def get_fingerprint(as_type: type) -> str:
+    """
+    Compute the fingerprint of a dataclass, identifying the generated
+    code. The fingerprint changes if the fields or their types change,
+    including the types that string annotations refer to.
+    """
+
+    parts: list = [
+        GENERATOR_VERSION,
+        get_jsno_version(),
+        sys.implementation.cache_tag,
+        as_type.__module__,
+        as_type.__qualname__,
+        repr(get_extra_data_configuration(as_type)),
+    ]
+
+    type_hints = get_type_hints(as_type, include_extras=True)
+
+    for field in dataclasses.fields(as_type):
+        type_ = type_hints[field.name]
+        parts.append((
+            field.name,
+            get_property_name(type_, field.name),
+            repr(type_),
+            field.init,
+            field.kw_only,
+        ))
+
+    # remove memory addresses (e.g. lambdas in constraints) from the
+    # representation, as they differ from run to run
+    text = re.sub(r" at 0x[0-9a-fA-F]+", "", repr(parts))
+
+    # hashlib is imported here, as it's slow to import and only
+    # needed when the codegen is used
+    import hashlib
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+def is_supported(as_type: type) -> bool:
+    """
+    Check if the code generator supports the dataclass's configuration.
+    """
+    return (
+        get_extra_data_configuration(as_type) is None and
+        get_construction_configuration(as_type) is None
+    )
+
+
+def get_inline_check(type_) -> str | None:
+    """
+    Get the Python expression that checks if a field's JSON value
+    (in variable `item`) can be used as-is, or None if the value
+    always needs to be unjsonified.
+    """
+
+    if name := native_type_names.get(type_):
+        return f"type(item) is {name}"
+
+    if get_origin(type_) in (Union, types.UnionType):
+        args = get_args(type_)
+        if len(args) == 2 and types.NoneType in args:
+            other = args[0] if args[1] is types.NoneType else args[1]
+            if name := native_type_names.get(other):
+                return f"item is None or type(item) is {name}"
+
+    return None
+
+
+def generate_factory(as_type: type, name: str = "create") -> str | None:
+    """
+    Generate the source code of a function that creates the unjsonifier
+    for a dataclass. Returns None, if the dataclass is not supported.
+
+    The generated function takes two arguments: the dataclass, and a
+    function that resolves the field unjsonifiers for the given fields.
+    """
+
+    if not dataclasses.is_dataclass(as_type):
+        return None
+
+    if not is_supported(as_type):
+        return None
+
+    type_hints = get_type_hints(as_type, include_extras=True)
+
+    fields = [
+        (field.name, json_name, get_inline_check(type_hints[field.name]))
+        for field in dataclasses.fields(as_type)
+        if (json_name := get_property_name(type_hints[field.name], field.name))
+    ]
+
+    names = tuple(name for (name, _, _) in fields)
+    json_names = sorted(json_name for (_, json_name, _) in fields)
+    resolve_first = any(check is None for (_, _, check) in fields)
+
+    lines = [
+        f"def {name}(as_type, resolve_fields):",
+        f"    names = {names!r}",
+        f"    json_names = frozenset({json_names!r})",
+        "    decoders = None",
+        "",
+        "    def decode(index, item):",
+        "        nonlocal decoders",
+        "        if decoders is None:",
+        "            decoders = [field.unjsonify for field in resolve_fields(as_type, names)]",
+        "        return decoders[index](item)",
+        "",
+        "    def unjsonify(value):",
+    ]
+
+    if resolve_first:
+        lines += [
+            "        nonlocal decoders",
+            "        if decoders is None:",
+            "            decoders = [field.unjsonify for field in resolve_fields(as_type, names)]",
+            "",
+        ]
+
+    lines += [
+        "        if not isinstance(value, (dict, Mapping)):",
+        "            raise UnjsonifyError(value, as_type)",
+        "",
+        "        kwargs = {}",
+        "        found = 0",
+        "",
+    ]
+
+    for (index, (field_name, json_name, check)) in enumerate(fields):
+        if check is None:
+            conversion = f"decoders[{index}](item)"
+        else:
+            conversion = f"item if {check} else decode({index}, item)"
+
+        lines += [
+            f"        if {json_name!r} in value:",
+            f"            item = value[{json_name!r}]",
+            f"            kwargs[{field_name!r}] = {conversion}",
+            "            found += 1",
+            "",
+        ]
+
+    lines += [
+        "        if found < len(value) and unjsonify_context.on_extra_key == 'error':",
+        "            extra_keys = ', '.join(repr(key) for key in value if key not in json_names)",
+        "            raise UnjsonifyError(value, as_type, f'Extra keys: {extra_keys}')",
+        "",
+        "        try:",
+        "            return as_type(**kwargs)",
+        "        except TypeError as exc:",
+        "            detail = exc.args[0]",
+        "",
+        "        raise UnjsonifyError(value, as_type, detail)",
+        "",
+        "    return unjsonify",
+        "",
+    ]
+
+    return "\n".join(lines)
+
+
+def generate_module(types_: list[type]) -> str:
+    """
+    Generate an importable module that installs precompiled unjsonifiers
+    for the given dataclasses.
+    """
+
+    imports = []
+    bodies = []
+
+    for as_type in types_:
+        if "<locals>" in as_type.__qualname__:
+            raise ValueError(f"Cannot import locally defined class {as_type.__qualname__}")
+
+        name = "create_" + re.sub(r"\W", "_", as_type.__qualname__)
+        source = generate_factory(as_type, name=name)
+        if source is None:
+            raise ValueError(f"Cannot generate unjsonifier for {as_type.__qualname__}")
+
+        toplevel = as_type.__qualname__.split(".")[0]
+        imports.append(f"from {as_type.__module__} import {toplevel}")
+        bodies.append(
+            f"{source}\n\n"
+            f"install({as_type.__qualname__}, {name}, fingerprint={get_fingerprint(as_type)!r})\n"
+        )
+
+    return "\n".join([
+        MODULE_HEADER,
+        *sorted(set(imports)),
+        "\n",
+        "\n\n".join(bodies),
+    ])
+
+
+# Precompiled unjsonifiers, installed by generated modules
+
+precompiled: dict[type, Callable] = {}
+
+
+def install(as_type: type, create: Callable, fingerprint: str) -> None:
+    """
+    Install a precompiled unjsonifier factory for a dataclass. Called by
+    the modules generated by jsno.compile. The modules must be imported
+    before the dataclass is unjsonified for the first time.
+    """
+
+    if fingerprint != get_fingerprint(as_type):
+        warnings.warn(f"Precompiled unjsonifier for {as_type.__qualname__} is out of date")
+        return
+
+    precompiled[as_type] = create
+
+
+# On-disk cache of the compiled unjsonifiers
+
+cache_directory: str | None = None
+
+
+def set_codec_cache(directory: str | os.PathLike | None) -> None:
+    """
+    Set the directory for caching the compiled unjsonifiers. Caching is
+    disabled if the directory is None.
+    """
+
+    global cache_directory
+    cache_directory = None if directory is None else os.fspath(directory)
+
+
+def read_cached_code(path: str) -> types.CodeType | None:
+    try:
+        with open(path, "rb") as file:
+            code = marshal.loads(file.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    return code if isinstance(code, types.CodeType) else None
+
+
+def write_cached_code(path: str, code: types.CodeType) -> None:
+    """
+    Write the code to the cache, atomically. Failures (e.g. read-only
+    file system) are ignored, as the cache is only an optimization.
+    """
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temp_path, "wb") as file:
+            file.write(marshal.dumps(code))
+        os.replace(temp_path, path)
+    except OSError:
+        pass
+
+
+def compile_factory(as_type: type) -> types.CodeType | None:
+    """
+    Get the compiled code of the unjsonifier factory for a dataclass,
+    either from the cache, or by generating it.
+    """
+
+    assert cache_directory is not None
+
+    path = os.path.join(cache_directory, f"{get_fingerprint(as_type)}.codec")
+
+    if (code := read_cached_code(path)) is not None:
+        return code
+
+    source = generate_factory(as_type)
+    if source is None:
+        return None
+
+    code = compile(source, f"<jsno codec {as_type.__qualname__}>", "exec")
+    write_cached_code(path, code)
+
+    return code
+
+
+def load_unjsonifier(as_type: type, resolve_fields: Callable) -> Callable | None:
+    """
+    Get a compiled unjsonifier for the dataclass, if one is installed
+    or caching is enabled. Returns None otherwise.
+    """
+
+    if (create := precompiled.get(as_type)) is not None:
+        return create(as_type, resolve_fields)
+
+    if cache_directory is None or not is_supported(as_type):
+        return None
+
+    code = compile_factory(as_type)
+    if code is None:
+        return None
+
+    namespace = {
+        "Mapping": Mapping,
+        "UnjsonifyError": UnjsonifyError,
+        "unjsonify_context": unjsonify_context,
+    }
+    exec(code, namespace)
+
+    return namespace["create"](as_type, resolve_fields)
+
+
+if directory := os.environ.get("JSNO_CODEC_CACHE"):
+    set_codec_cache(directory)
@@ -0,0 +1,62 @@
+"""
+Command line tool for generating vendorable unjsonifier modules:
+
+    python -m jsno.compile mypackage.models:User mypackage.models:Group -o codecs.py
+
+Importing the generated module installs the precompiled unjsonifiers, so
+that they are used instead of building the unjsonifiers at run time. This
+is useful in deployments with read-only file systems, where the on-disk
+codec cache can't be used.
+"""
+
+import argparse
+import importlib
+import sys
+
+from typing import Any
+
+from jsno.codegen import generate_module
+
+
+def load_type(spec: str) -> type:
+    """
+    Load a type given in the form "module:QualifiedName"
+    """
+
+    (module_name, _, qualname) = spec.partition(":")
+    if not qualname:
+        raise ValueError(f"Expected module:Type, got {spec!r}")
+
+    value: Any = importlib.import_module(module_name)
+    for name in qualname.split("."):
+        value = getattr(value, name)
+
+    return value
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m jsno.compile",
+        description="Generate a module with precompiled unjsonifiers for dataclasses",
+    )
+    parser.add_argument("types", nargs="+", metavar="module:Type")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+
+    args = parser.parse_args(argv)
+
+    try:
+        source = generate_module([load_type(spec) for spec in args.types])
+    except (ImportError, AttributeError, ValueError) as exc:
+        parser.error(str(exc))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(source)
+    else:
+        sys.stdout.write(source)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
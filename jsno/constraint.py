@@ -1,13 +1,22 @@
+import contextlib
 import functools
 import re
+import threading
 
 from dataclasses import dataclass
 from typing import Any, Callable
 
+from jsno.cache import CodecCache
 from jsno.utils import Annotation
 
 
-@functools.cache
+class_annotations = CodecCache()
+"""
+Class annotations are stored in the classes themselves, so that they
+are released together with the class.
+"""
+
+
 def get_class_annotations(class_) -> list[Annotation]:
     """
     Collect the class contraints of the base classes for a
@@ -15,11 +24,16 @@ def get_class_annotations(class_) -> list[Annotation]:
     appended to the list, and will be there when this is
     called next time
     """
-    return [
-        annotation
-        for base in class_.__bases__
-        for annotation in get_class_annotations(base)
-    ]
+    annotations = class_annotations.get(class_)
+    if annotations is None:
+        annotations = [
+            annotation
+            for base in class_.__bases__
+            for annotation in get_class_annotations(base)
+        ]
+        class_annotations[class_] = annotations
+
+    return annotations
 
 
 @functools.singledispatch
@@ -32,11 +46,139 @@ def get_annotation_validator(annotation) -> Callable | None:
 
 
 def get_validators(annotations) -> list[Callable]:
-    return [
-        validator
-        for annotation in annotations
-        if (validator := get_annotation_validator(annotation))
-    ]
+    """
+    Get the validators for the annotations. Consecutive constraints are
+    compiled into a single validator.
+    """
+
+    validators = []
+    constraints: list[Constraint] = []
+
+    for annotation in annotations:
+        if isinstance(annotation, Constraint):
+            constraints.append(annotation)
+            continue
+
+        if constraints:
+            validators.append(compile_constraints(constraints))
+            constraints = []
+
+        if validator := get_annotation_validator(annotation):
+            validators.append(validator)
+
+    if constraints:
+        validators.append(compile_constraints(constraints))
+
+    return validators
+
+
+def add_name(namespace: dict, value) -> str:
+    """
+    Add a value to the namespace of generated code, returning its name.
+    """
+    name = f"_{len(namespace)}"
+    namespace[name] = value
+    return name
+
+
+def is_evaluated(constraint: "Constraint") -> bool:
+    """
+    Check if the constraint is validated by evaluating it, i.e. its class
+    doesn't override the validate method.
+    """
+    return type(constraint).validate is Constraint.validate
+
+
+def compile_constraints(constraints: list["Constraint"]) -> Callable:
+    """
+    Compile the constraints into a single validator, which evaluates all
+    of them in one generated expression. If the value violates any of
+    them, the constraints are validated one by one, to raise the error
+    of the first violated constraint.
+    """
+
+    if len(constraints) == 1 and (
+        not is_evaluated(constraints[0]) or
+        type(constraints[0]).get_expression is Constraint.get_expression
+    ):
+        # nothing to gain by compiling
+        return constraints[0].validate
+
+    def violation(value):
+        for constraint in constraints:
+            constraint.validate(value)
+
+    namespace: dict[str, Any] = {"violation": violation}
+    expression = " and ".join(
+        f"({constraint.get_expression('value', namespace)})" if is_evaluated(constraint) else
+        f"({Constraint.get_expression(constraint, 'value', namespace)})"
+        for constraint in constraints
+    )
+
+    source = (
+        "def validate(value):\n"
+        f"    if not ({expression}):\n"
+        "        violation(value)\n"
+    )
+    exec(source, namespace)
+
+    return namespace["validate"]
+
+
+def get_bulk_check(as_type, annotations) -> Callable[[list], bool] | None:
+    """
+    Get a function checking the range and length constraints of a list of
+    values at once, or None if the annotations include other constraints
+    (or other annotations).
+    """
+
+    namespace: dict[str, Any] = {}
+    expressions = []
+
+    for annotation in annotations:
+        if type(annotation) is LenConstraint:
+            subject = "map(len, values)"
+        elif type(annotation) is RangeConstraint and as_type is int:
+            # only for ints, as floats may be NaNs, which min and max don't see
+            subject = "values"
+        else:
+            return None
+
+        if annotation.min is not None:
+            expressions.append(f"min({subject}) >= {add_name(namespace, annotation.min)}")
+        if annotation.max is not None:
+            expressions.append(f"max({subject}) <= {add_name(namespace, annotation.max)}")
+
+    if not expressions:
+        return None
+
+    exec(f"def check(values):\n    return not values or ({' and '.join(expressions)})\n", namespace)
+    return namespace["check"]
+
+
+class Validation(threading.local):
+    """
+    Validation options of this thread.
+    """
+    trusted: bool = False
+
+
+validation = Validation()
+
+
+@contextlib.contextmanager
+def trusted():
+    """
+    Skip evaluating the constraints in this context, for data that is
+    known to be valid.
+    """
+
+    previous = validation.trusted
+    validation.trusted = True
+    try:
+        yield
+    finally:
+        validation.trusted = previous
 
 
 class Constraint(Annotation):
@@ -74,6 +216,17 @@ class Constraint(Annotation):
         """
         raise NotImplementedError()  # pragma: no cover
 
+    def get_expression(self, var: str, namespace: dict) -> str:
+        """
+        Get the Python expression evaluating the constraint for the
+        variable, adding the values it refers to to the namespace.
+        """
+        if not is_evaluated(self):
+            # the overridden validate raises the error itself
+            return f"{add_name(namespace, self.validate)}({var}) or True"
+
+        return f"{add_name(namespace, self.evaluate)}({var})"
+
     def __call__(self, class_: type) -> type:
         """
         Using the constraint as a decorator to a dataclass
@@ -105,6 +258,17 @@ class OrConstraint(Constraint):
     def evaluate(self, value) -> bool:
         return self.left.evaluate(value) or self.right.evaluate(value)
 
+    def get_expression(self, var: str, namespace: dict) -> str:
+        if (
+            type(self).evaluate is not OrConstraint.evaluate or
+            not (is_evaluated(self.left) and is_evaluated(self.right))
+        ):
+            return Constraint.get_expression(self, var, namespace)
+
+        left = self.left.get_expression(var, namespace)
+        right = self.right.get_expression(var, namespace)
+        return f"({left}) or ({right})"
+
     @property
     def name(self):
         return f'{self.left.name} or {self.right.name}'
@@ -128,6 +292,21 @@ class RangeConstraint(Constraint):
             (self.max is None or value <= self.max)
         )
 
+    def get_expression(self, var: str, namespace: dict) -> str:
+        if type(self).evaluate is not RangeConstraint.evaluate:
+            return Constraint.get_expression(self, var, namespace)
+
+        return self.get_range_expression(var, namespace)
+
+    def get_range_expression(self, subject: str, namespace: dict) -> str:
+        checks = []
+        if self.min is not None:
+            checks.append(f"{subject} >= {add_name(namespace, self.min)}")
+        if self.max is not None:
+            checks.append(f"{subject} <= {add_name(namespace, self.max)}")
+
+        return " and ".join(checks) or "True"
+
     @property
     def name(self):
         if self.min is None:
@@ -149,6 +328,12 @@ class LenConstraint(RangeConstraint):
     def evaluate(self, value) -> bool:
         return super().evaluate(len(value))
 
+    def get_expression(self, var: str, namespace: dict) -> str:
+        if type(self).evaluate is not LenConstraint.evaluate:
+            return Constraint.get_expression(self, var, namespace)
+
+        return self.get_range_expression(f"len({var})", namespace)
+
 
 @dataclass(slots=True, frozen=True)
 class RegExConstraint(Constraint):
@@ -161,7 +346,14 @@ class RegExConstraint(Constraint):
     regex_: re.Pattern
 
     def evaluate(self, value) -> bool:
-        return self.regex_.fullmatch(str(value)) is not None
+        return self.regex_.fullmatch(value if type(value) is str else str(value)) is not None
+
+    def get_expression(self, var: str, namespace: dict) -> str:
+        if type(self).evaluate is not RegExConstraint.evaluate:
+            return Constraint.get_expression(self, var, namespace)
+
+        fullmatch = add_name(namespace, self.regex_.fullmatch)
+        return f"{fullmatch}({var} if type({var}) is str else str({var})) is not None"
 
 
 Constraint.range = RangeConstraint  # type: ignore
@@ -180,5 +372,11 @@ class FunctionConstraint(Constraint):
     def evaluate(self, value) -> bool:
         return self.function(value)
 
+    def get_expression(self, var: str, namespace: dict) -> str:
+        if type(self).evaluate is not FunctionConstraint.evaluate:
+            return Constraint.get_expression(self, var, namespace)
+
+        return f"{add_name(namespace, self.function)}({var})"
+
 
 constraint = Constraint
@@ -0,0 +1,155 @@
+"""
+Constructing dataclass instances without calling `__init__`.
+
+The `__init__` generated for frozen dataclasses sets each field with
+`object.__setattr__`, which makes unjsonifying them slow. Dataclasses
+marked with `bypass_init` are instead created with `object.__new__`, and
+their fields are stored directly to the instance dictionary or slots.
+"""
+
+import dataclasses
+import functools
+
+from typing import Any, Callable, ClassVar, NamedTuple, get_origin
+
+
+class Construction(NamedTuple):
+    post_init: bool
+
+
+@functools.singledispatch
+def _get_construction_configuration(arg) -> Construction | None:
+    return None
+
+
+def bypass_init(post_init: bool = True):
+    """
+    Decorator for dataclasses, to unjsonify them without calling their
+    `__init__`. The default values of the missing fields, including the
+    ones with `init=False`, are filled in as `__init__` would do. If
+    `post_init` is true, `__post_init__` is called as usual.
+
+    Custom `__init__` methods and InitVar fields are not supported:
+    dataclasses having InitVars are constructed by calling `__init__`.
+    """
+
+    construction = Construction(post_init=post_init)
+
+    def decorator(cls):
+        @_get_construction_configuration.register(cls)
+        def _(arg):
+            return construction
+
+        return cls
+
+    return decorator
+
+
+def get_construction_configuration(type_) -> Construction | None:
+    return _get_construction_configuration.dispatch(type_)(type_)
+
+
+def is_class_var(type_) -> bool:
+    if isinstance(type_, str):
+        # postponed annotation
+        return type_.startswith(("ClassVar", "typing.ClassVar"))
+
+    return type_ is ClassVar or get_origin(type_) is ClassVar
+
+
+def has_init_vars(as_type: type) -> bool:
+    """
+    Check if the dataclass has pseudo-fields that may be InitVars.
+    """
+
+    fields = {field.name for field in dataclasses.fields(as_type)}
+
+    return any(
+        not is_class_var(field.type)
+        for (name, field) in as_type.__dataclass_fields__.items()  # type: ignore
+        if name not in fields
+    )
+
+
+def get_initializer(as_type: type) -> Callable[[Any, dict], None] | None:
+    """
+    Get a function that initializes an instance of the dataclass,
+    allocated with `object.__new__`, from a dict of the init field values,
+    without calling `__init__`. Returns None if the dataclass should be
+    initialized by calling `__init__`.
+    """
+
+    construction = get_construction_configuration(as_type)
+    if construction is None or has_init_vars(as_type):
+        return None
+
+    fields = dataclasses.fields(as_type)
+    defaults = {
+        field.name: field.default
+        for field in fields
+        if field.default is not dataclasses.MISSING
+    }
+    factories = [
+        (field.name, field.default_factory)
+        for field in fields
+        if field.default_factory is not dataclasses.MISSING
+    ]
+
+    # the fields that have a value after __init__
+    field_count = sum(
+        1 for field in fields
+        if field.init or field.name in defaults or field.default_factory is not dataclasses.MISSING
+    )
+    required = [
+        field.name for field in fields
+        if field.init
+        if field.name not in defaults
+        if field.default_factory is dataclasses.MISSING
+    ]
+
+    post_init = construction.post_init and hasattr(as_type, "__post_init__")
+    setattr_ = object.__setattr__
+    uses_dict = hasattr(object.__new__(as_type), "__dict__")
+
+    def initialize(instance: Any, kwargs: dict) -> None:
+        values = defaults.copy()
+        values.update(kwargs)
+        for (name, factory) in factories:
+            if name not in values:
+                values[name] = factory()
+
+        if len(values) != field_count:
+            missing = ", ".join(repr(name) for name in required if name not in values)
+            raise TypeError(f"{as_type.__qualname__} missing required arguments: {missing}")
+
+        if uses_dict:
+            setattr_(instance, "__dict__", values)
+        else:
+            for (name, value) in values.items():
+                setattr_(instance, name, value)
+
+        if post_init:
+            instance.__post_init__()
+
+    return initialize
+
+
+def get_constructor(as_type: type) -> Callable[[dict], Any] | None:
+    """
+    Get a function that creates an instance of the dataclass from
+    a dict of the init field values, without calling `__init__`.
+    Returns None if the dataclass should be created by calling it.
+    """
+
+    initialize = get_initializer(as_type)
+    if initialize is None:
+        return None
+
+    new = object.__new__
+
+    def construct(kwargs: dict) -> Any:
+        instance: Any = new(as_type)
+        initialize(instance, kwargs)
+        return instance
+
+    return construct
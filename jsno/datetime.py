@@ -6,14 +6,26 @@ Jsonification and unjsonification for the datetime types.
 * datetime.time
 * datetime.timezone
 
+The types are jsonified as ISO-formatted strings by default. Other wire
+formats can be selected with the Epoch, Seconds and ISODuration
+annotations, or for all values in a registry with Registry.register_codec.
+
 """
 
+import dataclasses
 import datetime
-from typing import Literal
+import re
+
+from typing import Any, Callable, Literal, get_args, get_origin
 
+from jsno.codec import Codec
+from jsno.immutable import register_immutable
+from jsno.interning import exact_key
 from jsno.jsonify import jsonify
+from jsno.packing import register_field_layout
 from jsno.standard import jsonify_to_string
-from jsno.unjsonify import unjsonify, typecheck
+from jsno.unjsonify import unjsonify, typecheck, UnjsonifyError
+from jsno.utils import JSON
 
 
 # datetime.date
@@ -154,3 +166,353 @@ def _(value, as_type) -> datetime.timezone:
 
     # convert timedelta representing the UTC offset to a timezone
     return as_type(time)
+
+
+register_immutable(
+    datetime.date, datetime.time, datetime.datetime, datetime.timedelta, datetime.timezone
+)
+
+
+@exact_key.register(datetime.date)
+@exact_key.register(datetime.timedelta)
+def _(value):
+    return (type(value), value)
+
+
+@exact_key.register(datetime.datetime)
+@exact_key.register(datetime.time)
+def _(value):
+    # aware values are equal if they're the same instant, even if their
+    # timezones differ, so only naive and UTC values are identified
+    if value.tzinfo is not None and value.tzinfo is not datetime.timezone.utc:
+        raise TypeError("No exact key for a timezone-aware value")
+
+    return (type(value), value, value.fold, value.tzinfo is None)
+
+
+# dates and timezones typically have few distinct values, so parse
+# each of them only once
+unjsonify.memoize(datetime.date, maxsize=4096)
+unjsonify.memoize(datetime.timezone, maxsize=256)
+
+
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+MICROSECOND = datetime.timedelta(microseconds=1)
+EPOCH_ORDINAL = EPOCH.toordinal()
+
+
+# wire formats
+
+
+Unit = Literal["s", "ms", "us"]
+
+# number of microseconds in the units
+unit_factors = {"s": 1_000_000, "ms": 1_000, "us": 1}
+
+
+def to_number(microseconds: int, factor: int) -> int | float:
+    """
+    Convert microseconds to the unit. Whole numbers are returned as ints.
+    """
+
+    (quotient, remainder) = divmod(microseconds, factor)
+    return quotient if remainder == 0 else microseconds / factor
+
+
+def to_microseconds(value: int | float, factor: int) -> int:
+    return value * factor if type(value) is int else round(value * factor)
+
+
+def get_item_type(codec: Codec, as_type, types: tuple[type, ...]) -> tuple[type, bool]:
+    """
+    Get the type of the values, and whether the values are in a list.
+    """
+
+    if get_origin(as_type) is list and len(args := get_args(as_type)) == 1:
+        (item_type, is_list) = (args[0], True)
+    else:
+        (item_type, is_list) = (as_type, False)
+
+    if not (isinstance(item_type, type) and issubclass(item_type, types)):
+        raise TypeError(f"{type(codec).__name__} cannot be used for {as_type!r}")
+
+    return (item_type, is_list)
+
+
+def get_list_jsonify(convert: Callable, is_list: bool) -> Callable:
+    if not is_list:
+        return convert
+
+    return lambda values: [convert(value) for value in values]
+
+
+def get_numbers_unjsonify(
+    convert: Callable,
+    as_type,
+    is_list: bool,
+    convert_many: Callable | None = None,
+) -> Callable:
+    """
+    Get the unjsonifier for numbers, or for a list of numbers, converting
+    them with the function. The numbers are type-checked in bulk, and
+    converted with convert_many, if given.
+    """
+
+    if convert_many is None:
+        def convert_many(values):
+            return [convert(value) for value in values]
+
+    def unjsonify_number(value):
+        if type(value) is not int and type(value) is not float:
+            raise UnjsonifyError(value, as_type)
+
+        try:
+            return convert(value)
+        except (ValueError, OverflowError) as exc:
+            detail = exc.args[0]
+
+        raise UnjsonifyError(value, as_type, detail)
+
+    if not is_list:
+        return unjsonify_number
+
+    def unjsonify_numbers(value):
+        typecheck(value, list, as_type)
+
+        if not set(map(type, value)) <= {int, float}:
+            raise UnjsonifyError(value, as_type, "expected numbers")
+
+        try:
+            return convert_many(value)
+        except (ValueError, OverflowError) as exc:
+            detail = exc.args[0]
+
+        raise UnjsonifyError(value, as_type, detail)
+
+    return unjsonify_numbers
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Epoch(Codec):
+    """
+    Annotation for jsonifying datetimes and dates (or lists of them) as
+    numbers of seconds, milliseconds or microseconds since the Unix epoch.
+    Datetimes must be timezone-aware, and are unjsonified in UTC. Dates
+    are jsonified as their midnight in UTC.
+    """
+
+    unit: Unit = "s"
+
+    def get_jsonify(self, as_type) -> Callable[[Any], JSON]:
+        (item_type, is_list) = get_item_type(self, as_type, (datetime.date,))
+        factor = unit_factors[self.unit]
+
+        def jsonify_epoch(value):
+            if not isinstance(value, datetime.datetime):
+                value = datetime.datetime.combine(value, datetime.time(), datetime.timezone.utc)
+            elif value.tzinfo is None:
+                raise ValueError(f"Cannot jsonify naive datetime {value} as epoch time")
+
+            return to_number((value - EPOCH) // MICROSECOND, factor)
+
+        return get_list_jsonify(jsonify_epoch, is_list)
+
+    def get_unjsonify(self, as_type) -> Callable[[JSON], Any]:
+        (item_type, is_list) = get_item_type(self, as_type, (datetime.date,))
+        factor = unit_factors[self.unit]
+
+        if issubclass(item_type, datetime.datetime):
+            def convert(value):
+                return EPOCH + datetime.timedelta(microseconds=to_microseconds(value, factor))
+
+            if factor == 1:
+                return get_numbers_unjsonify(convert, as_type, is_list)
+
+            # fast path: fromtimestamp rounds the float to microseconds,
+            # which gives the exact time of whole seconds and milliseconds
+            # only if the float is precise to well under a microsecond.
+            # That holds within 2**32 seconds of the epoch (1833-2106), and
+            # the other values are converted exactly with integers.
+            fromtimestamp = item_type.fromtimestamp
+            seconds = unit_factors["s"] // factor
+            utc = datetime.timezone.utc
+            limit = 2**32 * seconds
+
+            def convert_fast(value):
+                if -limit < value < limit:
+                    try:
+                        return fromtimestamp(value / seconds, utc)
+                    except OSError:
+                        # negative timestamps on some platforms
+                        pass
+
+                return convert(value)
+
+            def convert_many(values):
+                try:
+                    return [
+                        fromtimestamp(value / seconds, utc) if -limit < value < limit else convert(value)
+                        for value in values
+                    ]
+                except OSError:
+                    return [convert_fast(value) for value in values]
+
+            return get_numbers_unjsonify(convert_fast, as_type, is_list, convert_many)
+        else:
+            def convert(value):
+                (days, rest) = divmod(to_microseconds(value, factor), 86_400_000_000)
+                if rest:
+                    raise ValueError("Not a midnight")
+                return item_type.fromordinal(EPOCH_ORDINAL + days)
+
+        return get_numbers_unjsonify(convert, as_type, is_list)
+
+
+EpochSeconds = Epoch("s")
+EpochMillis = Epoch("ms")
+EpochMicros = Epoch("us")
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Seconds(Codec):
+    """
+    Annotation for jsonifying timedeltas as their total number of seconds,
+    milliseconds or microseconds, and times as the number since midnight.
+    """
+
+    unit: Unit = "s"
+
+    def get_jsonify(self, as_type) -> Callable[[Any], JSON]:
+        (item_type, is_list) = get_item_type(self, as_type, (datetime.timedelta, datetime.time))
+        factor = unit_factors[self.unit]
+
+        if issubclass(item_type, datetime.timedelta):
+            def jsonify_seconds(value):
+                return to_number(value // MICROSECOND, factor)
+        else:
+            def jsonify_seconds(value):
+                microseconds = (
+                    ((value.hour * 60 + value.minute) * 60 + value.second) * 1_000_000 +
+                    value.microsecond
+                )
+                return to_number(microseconds, factor)
+
+        return get_list_jsonify(jsonify_seconds, is_list)
+
+    def get_unjsonify(self, as_type) -> Callable[[JSON], Any]:
+        (item_type, is_list) = get_item_type(self, as_type, (datetime.timedelta, datetime.time))
+        factor = unit_factors[self.unit]
+
+        if issubclass(item_type, datetime.timedelta):
+            def convert(value):
+                return item_type(microseconds=to_microseconds(value, factor))
+        else:
+            def convert(value):
+                (seconds, microsecond) = divmod(to_microseconds(value, factor), 1_000_000)
+                (minutes, second) = divmod(seconds, 60)
+                (hour, minute) = divmod(minutes, 60)
+                return item_type(hour, minute, second, microsecond)
+
+        return get_numbers_unjsonify(convert, as_type, is_list)
+
+
+iso_duration_pattern = re.compile(
+    r"(-)?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?=\d)(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)(?:\.(\d{1,6}))?S)?)?"
+)
+
+
+def format_iso_duration(value: datetime.timedelta) -> str:
+    if value < datetime.timedelta(0):
+        return "-" + format_iso_duration(-value)
+
+    (minutes, seconds) = divmod(value.seconds, 60)
+    (hours, minutes) = divmod(minutes, 60)
+
+    time = ""
+    if hours:
+        time += f"{hours}H"
+    if minutes:
+        time += f"{minutes}M"
+    if value.microseconds:
+        time += f"{seconds}.{value.microseconds:06}".rstrip("0") + "S"
+    elif seconds:
+        time += f"{seconds}S"
+
+    if not value.days:
+        return f"PT{time or '0S'}"
+
+    return f"P{value.days}D" + (f"T{time}" if time else "")
+
+
+def parse_iso_duration(value: str, as_type: type = datetime.timedelta) -> datetime.timedelta:
+    match = iso_duration_pattern.fullmatch(value)
+    if match is None or not any(match.groups()[1:]):
+        raise ValueError("Invalid ISO 8601 duration (years and months are not supported)")
+
+    (sign, weeks, days, hours, minutes, seconds, fraction) = match.groups()
+    duration = as_type(
+        weeks=int(weeks or 0),
+        days=int(days or 0),
+        hours=int(hours or 0),
+        minutes=int(minutes or 0),
+        seconds=int(seconds or 0),
+        microseconds=int((fraction or "").ljust(6, "0")),
+    )
+
+    return -duration if sign else duration
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class ISODuration(Codec):
+    """
+    Annotation for jsonifying timedeltas as ISO 8601 durations, like
+    "P1DT2H30M". Years and months are not supported, as their lengths vary.
+    """
+
+    def get_jsonify(self, as_type) -> Callable[[Any], JSON]:
+        (_, is_list) = get_item_type(self, as_type, (datetime.timedelta,))
+        return get_list_jsonify(format_iso_duration, is_list)
+
+    def get_unjsonify(self, as_type) -> Callable[[JSON], Any]:
+        (item_type, is_list) = get_item_type(self, as_type, (datetime.timedelta,))
+
+        def unjsonify_duration(value):
+            typecheck(value, str, as_type)
+            try:
+                return parse_iso_duration(value, item_type)
+            except (ValueError, OverflowError) as exc:
+                detail = exc.args[0]
+
+            raise UnjsonifyError(value, as_type, detail)
+
+        if not is_list:
+            return unjsonify_duration
+
+        def unjsonify_durations(value):
+            typecheck(value, list, as_type)
+            return [unjsonify_duration(item) for item in value]
+
+        return unjsonify_durations
+
+
+# binary record layouts
+
+
+def pack_datetime(value: datetime.datetime) -> int:
+    if value.tzinfo is None:
+        raise ValueError(f"Cannot pack naive datetime {value}")
+
+    return (value - EPOCH) // MICROSECOND
+
+
+def unpack_datetime(value: int) -> datetime.datetime:
+    return EPOCH + datetime.timedelta(microseconds=value)
+
+
+register_field_layout(datetime.datetime, "q", pack_datetime, unpack_datetime)
+register_field_layout(datetime.date, "i", datetime.date.toordinal, datetime.date.fromordinal)
+register_field_layout(
+    datetime.timedelta, "q",
+    lambda value: value // MICROSECOND,
+    lambda value: datetime.timedelta(microseconds=value),
+)
@@ -0,0 +1,34 @@
+"""
+Jsonification and unjsonification for decimal.Decimal
+"""
+
+import decimal
+
+from jsno.immutable import register_immutable
+from jsno.interning import exact_key
+from jsno.jsonify import jsonify
+from jsno.unjsonify import unjsonify, typecheck
+
+
+@jsonify.register(decimal.Decimal)
+def _(value):
+    """
+    Always jsnonify Decimal as a string.
+    """
+    return str(value)
+
+
+@unjsonify.register(decimal.Decimal)
+def _(value, as_type):
+    typecheck(value, (str, int), as_type)
+
+    return as_type(value)
+
+
+register_immutable(decimal.Decimal)
+
+
+@exact_key.register(decimal.Decimal)
+def _(value):
+    # the string keeps the exponent and the sign, e.g. "1.00" and "-0"
+    return (type(value), str(value))
@@ -0,0 +1,620 @@
+"""
+Jsonifying and unjsonifying deeply nested values without recursion.
+
+The regular jsonifiers and unjsonifiers call each other for the nested
+values, using several Python frames for each level of nesting, so that
+values nested more than a few hundred levels deep raise RecursionError.
+`deep_jsonify` and `deep_unjsonify` walk the lists, dicts and dataclasses
+(including variant families) with an explicit stack instead:
+
+    data = jsno.deep_jsonify(tree, max_depth=50_000)
+    tree = jsno.deep_unjsonify[Expression](data, max_depth=50_000)
+
+The parts of the value that can't nest, like dataclasses having only
+fields of native types, are handled by the regular functions. Note that
+the json module also limits the depth of the JSON it encodes and decodes.
+"""
+
+import dataclasses
+import types
+
+from collections.abc import Mapping, Sequence
+from typing import (
+    Annotated, Any, Callable, Generic, NewType, TypeAliasType, TypeVar, Union, get_args, get_origin, get_type_hints,
+)
+
+from jsno.abc import unjsonify_mapping_factory, unjsonify_sequence_factory
+from jsno.codec import Codec
+from jsno.constraint import get_class_annotations, get_validators, validation
+from jsno.construction import get_constructor
+from jsno.fields_unjsonifier import SchemaField, UnjsonifyError, create_unjsonifier, typecheck
+from jsno.interning import Categorical, get_key_intern, sessions
+from jsno.jsonify import (
+    DataclassJsonification, Jsonify, batch_types, call_jsonify, jsonify, jsonify_batch, native_types,
+)
+from jsno.unjsonify import Unjsonify, contains_self_type, is_shareable, unjsonify, unjsonify_factory
+from jsno.utils import DictWithoutKey, JSON, get_typename
+from jsno.variant import VariantFamily, OrphanVariant, get_variantfamily
+
+
+T = TypeVar("T")
+
+DEFAULT_MAX_DEPTH = 100_000
+"""Maximum nesting depth of the values, by default"""
+
+
+# jsonification
+
+
+class DeepJsonify:
+    """
+    Jsonify function for deeply nested values.
+
+    The nested values are jsonified in document order, as the regular
+    jsonifiers do.
+    """
+
+    tracking = False
+    """Whether `track` is called for the dataclass instances"""
+
+    def __init__(self, jsonify_: Jsonify = jsonify):
+        self.jsonify = jsonify_
+
+    def __call__(self, value, max_depth: int = DEFAULT_MAX_DEPTH) -> JSON:
+        """
+        Jsonify a value nested at most `max_depth` levels deep.
+        """
+
+        if self.jsonify.parent is None:
+            return self.walk(value, max_depth)
+
+        return self.jsonify.call_in_scope(self.walk, value, max_depth)
+
+    def walk(self, value, max_depth: int) -> JSON:
+        root: list = [None]
+
+        # the jsonifiers of the classes seen, or their dataclass jsonifications
+        handlers: dict[type, Any] = {}
+        track = self.track if self.tracking else None
+
+        # the values to jsonify, where to store the results, and the codec's
+        # jsonifier for the values of fields having one. The nested values
+        # are pushed in reverse order, so that they're popped in order.
+        stack: list = [(value, root, 0, 0, None)]
+        push = stack.append
+        pop = stack.pop
+
+        while stack:
+            (value, target, key, depth, convert) = pop()
+
+            if convert is not None:
+                target[key] = convert(value)
+                continue
+
+            cls = type(value)
+            if cls in native_types:
+                target[key] = value
+                continue
+
+            if depth >= max_depth:
+                raise ValueError(f"Cannot jsonify values nested more than {max_depth} levels deep")
+
+            depth += 1
+
+            if cls is list:
+                if value and type(value[0]) in batch_types and (batch_json := jsonify_batch(value)) is not None:
+                    target[key] = batch_json
+                    continue
+
+                target[key] = result = value.copy()
+                for index in range(len(value) - 1, -1, -1):
+                    if type(item := value[index]) not in native_types:
+                        push((item, result, index, depth, None))
+
+            elif cls is dict:
+                target[key] = result = {}
+                nested: list = []
+                for (item_key, item) in value.items():
+                    item_key = item_key if isinstance(item_key, str) else str(jsonify(item_key))
+                    result[item_key] = item
+                    if type(item) not in native_types:
+                        nested.append((item, result, item_key, depth, None))
+
+                stack.extend(reversed(nested))
+
+            else:
+                handler = handlers.get(cls)
+                if handler is None:
+                    handler = handlers[cls] = self.get_handler(cls)
+
+                if type(handler) is not DataclassJsonification:
+                    target[key] = handler(value)
+                    continue
+
+                target[key] = result = {}
+                if track is not None and (reference := track(cls, value, result)) is not None:
+                    target[key] = reference
+                    continue
+
+                if handler.label_name:
+                    result[handler.label_name] = handler.label
+
+                nested = []
+                for (name, json_name, optional, jsonify_field) in handler.fields:
+                    item = getattr(value, name)
+                    if item is None and optional:
+                        continue
+
+                    if jsonify_field is not call_jsonify:
+                        result[json_name] = None
+                        nested.append((item, result, json_name, depth, jsonify_field))
+                    elif type(item) in native_types:
+                        result[json_name] = item
+                    else:
+                        result[json_name] = None
+                        nested.append((item, result, json_name, depth, None))
+
+                if isinstance(handler.extra_data_property, str):
+                    for (item_key, item) in (getattr(value, handler.extra_data_property) or {}).items():
+                        result[item_key] = None
+                        nested.append((item, result, item_key, depth, None))
+
+                stack.extend(reversed(nested))
+
+        return root[0]
+
+    def get_handler(self, cls: type) -> Any:
+        """
+        Get the dataclass jsonification of a class, whose fields are walked
+        through, or the jsonifier for the values of the class.
+        """
+
+        jsonify_ = self.jsonify.get_exact(cls)
+        if type(specialized := getattr(jsonify_, "__self__", None)) is DataclassJsonification:
+            return specialized
+
+        return jsonify_
+
+    def track(self, cls: type, value, result: dict) -> JSON | None:
+        """
+        Called with each dataclass instance and its (still empty) JSON
+        object, if `tracking` is true. Returns the JSON to use instead,
+        or None to jsonify the instance's fields.
+        """
+        return None
+
+
+# unjsonification
+#
+# Unjsonifying a value is planned for each type that can nest. Visiting a
+# JSON value with a plan stores the result to target[key], and pushes the
+# nested values, which are visited later, to the stack. The entries of the
+# stack are tuples (visit, value, target, key, depth). The nested values
+# are pushed in reverse order, so that they're visited in document order.
+
+
+class Plan:
+    """
+    Plan for unjsonifying the values of a type that can nest.
+    """
+
+    def visit(self, stack: list, value, target, key, depth: int) -> None:
+        raise NotImplementedError
+
+
+Field = tuple[str, str, Callable | None, Callable]
+"""
+The name and the JSON name of a dataclass field, the visit function of
+the plan for its type if it's nested, and the regular unjsonifier.
+"""
+
+
+class ListPlan(Plan):
+    def __init__(self, as_type, item: Plan):
+        self.as_type = as_type
+        self.item = item
+
+    def visit(self, stack, value, target, key, depth):
+        if type(value) is not list:
+            typecheck(value, (list, Sequence), self.as_type)
+
+        target[key] = result = [None] * len(value)
+
+        visit = self.item.visit
+        depth += 1
+        stack.extend([(visit, value[index], result, index, depth) for index in range(len(value) - 1, -1, -1)])
+
+
+class DictPlan(Plan):
+    def __init__(self, as_type, unjsonify_key: Callable, item: Plan):
+        self.as_type = as_type
+        self.unjsonify_key = unjsonify_key
+        self.item = item
+
+    def visit(self, stack, value, target, key, depth):
+        typecheck(value, (dict, Mapping), self.as_type)
+
+        target[key] = result = {}
+
+        intern = get_key_intern()
+        visit = self.item.visit
+        depth += 1
+        nested = []
+        for (item_key, item) in value.items():
+            item_key = self.unjsonify_key(item_key)
+            if intern is not None:
+                item_key = intern(item_key)
+
+            result[item_key] = None
+            nested.append((visit, item, result, item_key, depth))
+
+        stack.extend(reversed(nested))
+
+
+class OptionalPlan(Plan):
+    def __init__(self, plan: Plan):
+        self.plan = plan
+
+    def visit(self, stack, value, target, key, depth):
+        if value is None:
+            target[key] = None
+        else:
+            self.plan.visit(stack, value, target, key, depth)
+
+
+class ValidatedPlan(Plan):
+    """
+    Plan for an Annotated type with constraints. The result is validated
+    after the nested values have been unjsonified.
+    """
+
+    def __init__(self, as_type, plan: Plan, validators: list[Callable]):
+        self.as_type = as_type
+        self.plan = plan
+        self.validators = validators
+
+    def visit(self, stack, value, target, key, depth):
+        stack.append((self.validate, value, target, key, depth))
+        self.plan.visit(stack, value, target, key, depth)
+
+    def validate(self, stack, value, target, key, depth):
+        if validation.trusted:
+            return
+
+        try:
+            for validate in self.validators:
+                validate(target[key])
+            return
+        except ValueError as exc:
+            detail = exc.args[0]
+
+        raise UnjsonifyError(value, self.as_type, detail)
+
+
+class DataclassPlan(Plan):
+    """
+    Plan for a dataclass with nested fields. The fields are unjsonified
+    into a dict, and the instance is created after the nested values.
+    """
+
+    def __init__(self, as_type: type):
+        self.as_type = as_type
+        self.fields: list[Field] = []
+        self.construct = get_constructor(as_type)
+        self.validators = get_validators(get_class_annotations(as_type))
+        self.shareable = is_shareable(as_type)
+        self.unjsonifier = create_unjsonifier(as_type, fields=[])
+        self.json_names: frozenset[str] = frozenset()
+
+    def set_fields(self, fields: list[Field]) -> None:
+        self.fields = fields
+        self.json_names = frozenset(json_name for (_, json_name, _, _) in fields)
+
+        # for handling the extra keys like the regular unjsonifier
+        self.unjsonifier = create_unjsonifier(
+            self.as_type,
+            fields=[
+                SchemaField(name=name, json_name=json_name, unjsonify=unjsonify_)
+                for (name, json_name, _, unjsonify_) in fields
+            ],
+        )
+
+    def visit(self, stack, value, target, key, depth):
+        typecheck(value, (dict, Mapping), self.as_type)
+
+        kwargs = {}
+        stack.append((self.create, (value, kwargs), target, key, depth))
+
+        if self.visit_fields(stack, value, kwargs, depth + 1) < len(value):
+            self.unjsonifier.handle_extra_keys(value, kwargs)
+
+    def visit_variant(self, stack, value, target, key, depth, label_name: str):
+        """
+        Visit the JSON object of a variant, ignoring the variant label.
+        """
+
+        if label_name in self.json_names:
+            return self.visit(stack, DictWithoutKey(base=value, key=label_name), target, key, depth)
+
+        kwargs: dict[str, Any] = {}
+        stack.append((self.create, (value, kwargs), target, key, depth))
+
+        if self.visit_fields(stack, value, kwargs, depth + 1) < len(value) - 1:
+            self.unjsonifier.handle_extra_keys(DictWithoutKey(base=value, key=label_name), kwargs)
+
+    def visit_fields(self, stack, value, kwargs: dict, depth: int) -> int:
+        """
+        Unjsonify the fields that don't nest, and push the nested ones to
+        the stack. Returns the number of fields found.
+        """
+
+        found_count = 0
+        nested = []
+        for (name, json_name, visit, unjsonify_) in self.fields:
+            if json_name in value:
+                found_count += 1
+                if visit is None:
+                    kwargs[name] = unjsonify_(value[json_name])
+                else:
+                    kwargs[name] = None
+                    nested.append((visit, value[json_name], kwargs, name, depth))
+
+        stack.extend(reversed(nested))
+        return found_count
+
+    def create(self, stack, args, target, key, depth):
+        (value, kwargs) = args
+        try:
+            result = self.as_type(**kwargs) if self.construct is None else self.construct(kwargs)
+        except TypeError as exc:
+            raise UnjsonifyError(value, self.as_type, exc.args[0]) from None
+
+        self.validate_instance(value, result)
+
+        if self.shareable and (session := sessions.current) is not None and session.objects:
+            result = session.share(result)
+
+        target[key] = result
+
+    def validate_instance(self, value, result) -> None:
+        if self.validators and not validation.trusted:
+            try:
+                for validate in self.validators:
+                    validate(result)
+            except ValueError as exc:
+                raise UnjsonifyError(value, self.as_type, exc.args[0]) from None
+
+
+class VariantPlan(Plan):
+    """
+    Plan for a variant family. The variants are planned when they are
+    first seen.
+    """
+
+    def __init__(self, as_type: type, family: VariantFamily | OrphanVariant, planner: "Planner"):
+        self.as_type = as_type
+        self.family = family
+        self.planner = planner
+        self.variants: dict[str, tuple[DataclassPlan | None, Callable | None, bool]] = {}
+
+    def visit(self, stack, value, target, key, depth):
+        typecheck(value, Mapping, self.as_type)
+
+        label_name = self.family.label_name
+        label = value.get(label_name)
+        if not isinstance(label, str):
+            raise UnjsonifyError(value, self.as_type, f"missing {label}")
+
+        entry = self.variants.get(label)
+        if entry is None:
+            entry = self.variants[label] = self.plan_variant(value, label)
+
+        (plan, unjsonify_variant, include_label) = entry
+
+        if plan is None:
+            # call the variant unjsonifier with the label removed
+            target[key] = unjsonify_variant(value if include_label else DictWithoutKey(base=value, key=label_name))
+        elif include_label:
+            plan.visit(stack, value, target, key, depth)
+        else:
+            plan.visit_variant(stack, value, target, key, depth, label_name)
+
+    def plan_variant(self, value, label: str) -> tuple[DataclassPlan | None, Callable | None, bool]:
+        variant_type = self.family.get_variant(label)
+        if variant_type is None:
+            raise UnjsonifyError(value, self.as_type, f"unknown {self.family.label_name}: {label}")
+        if not issubclass(variant_type, self.as_type):
+            raise UnjsonifyError(value, self.as_type, f"not subclass of {self.as_type}: {label}")
+
+        include_label = self.family.includes_label(variant_type)
+
+        if (plan := self.planner.plan_class(variant_type)) is not None:
+            return (plan, None, include_label)
+
+        registry = self.planner.registry
+        with registry.specializing():
+            return (None, registry.specialize(variant_type), include_label)
+
+
+class Planner:
+    """
+    Plans the types for a registry. The types that can't nest are left
+    unplanned, and unjsonified with the registry's unjsonifiers.
+    """
+
+    dataclass_plan: type[DataclassPlan] = DataclassPlan
+    variant_plan: type[VariantPlan] = VariantPlan
+
+    def __init__(self, registry: Unjsonify):
+        self.registry = registry
+        self.plans: dict[Any, Plan | None] = {}
+        self.class_plans: dict[type, DataclassPlan | None] = {}
+
+    def plan(self, type_) -> Plan | None:
+        """
+        Get the plan for the type, or None if it's not nested.
+        """
+
+        if isinstance(type_, type):
+            return self.plan_type(type_)
+
+        try:
+            if type_ in self.plans:
+                return self.plans[type_]
+        except TypeError:
+            # unhashable type
+            return None
+
+        # recursive type aliases refer to the regular unjsonifier
+        self.plans[type_] = None
+        plan = self.plans[type_] = self.create(type_)
+        return plan
+
+    def plan_type(self, type_: type) -> Plan | None:
+        if (family := get_variantfamily(type_)) is not None:
+            if (plan := self.plans.get(type_)) is None:
+                plan = self.plans[type_] = self.variant_plan(type_, family, self)
+            return plan
+
+        if self.registry.get_memo_size(type_):
+            return None
+
+        return self.plan_class(type_)
+
+    def create(self, type_) -> Plan | None:
+        if isinstance(type_, NewType):
+            return self.plan(type_.__supertype__)
+
+        if isinstance(type_, TypeAliasType):
+            return self.plan(type_.__value__)
+
+        origin = get_origin(type_)
+        args = get_args(type_)
+
+        if origin is Annotated:
+            if Codec.get_annotation(type_) or Categorical.get_annotation(type_):
+                return None
+
+            if (plan := self.plan(args[0])) is None:
+                return None
+
+            validators = get_validators(args[1:])
+            return ValidatedPlan(args[0], plan, validators) if validators else plan
+
+        if origin is Union or origin is types.UnionType:
+            options = [arg for arg in args if arg is not types.NoneType]
+            if len(options) == 1 and len(args) == 2 and (plan := self.plan(options[0])) is not None:
+                return OptionalPlan(plan)
+            return None
+
+        if origin is list and args:
+            if (
+                self.registry.dispatch_factory(list) is not unjsonify_sequence_factory or
+                self.registry.get_batch(args[0]) is not None or
+                (item := self.plan(args[0])) is None
+            ):
+                return None
+
+            return ListPlan(type_, item)
+
+        if origin is dict and len(args) == 2:
+            if (
+                self.registry.dispatch_factory(dict) is not unjsonify_mapping_factory or
+                (item := self.plan(args[1])) is None
+            ):
+                return None
+
+            return DictPlan(type_, self.registry[args[0]], item)
+
+        return None
+
+    def plan_class(self, as_type: type) -> DataclassPlan | None:
+        """
+        Get the plan for a dataclass, without considering its variant family.
+        """
+
+        if as_type in self.class_plans:
+            return self.class_plans[as_type]
+
+        if (
+            not dataclasses.is_dataclass(as_type) or
+            self.registry.dispatch_factory(as_type) is not unjsonify_factory.registry[object]
+        ):
+            self.class_plans[as_type] = None
+            return None
+
+        # the plan is in the table while planning the fields, for recursive dataclasses
+        plan = self.class_plans[as_type] = self.dataclass_plan(as_type)
+
+        fields = self.registry.resolve_fields(
+            as_type,
+            field_names=[
+                field.name for field in dataclasses.fields(as_type)
+                if plan.construct is None or field.init
+            ],
+        )
+        type_hints = get_type_hints(as_type, include_extras=True)
+
+        field_plans = [
+            None if contains_self_type(type_hints[field.name]) else self.plan(type_hints[field.name])
+            for field in fields
+        ]
+
+        if all(field_plan is None for field_plan in field_plans):
+            # no nested fields
+            self.class_plans[as_type] = None
+            return None
+
+        plan.set_fields([
+            (field.name, field.json_name, None if field_plan is None else field_plan.visit, field.unjsonify)
+            for (field, field_plan) in zip(fields, field_plans)
+        ])
+        return plan
+
+
+class DeepUnjsonify(Generic[T]):
+    """
+    Factory for type-specific unjsonify functions for deeply nested values.
+    """
+
+    planner: type[Planner] = Planner
+
+    def __init__(self, unjsonify_: Unjsonify = unjsonify):
+        self.unjsonify = unjsonify_
+
+    def __getitem__(self, type_: type[T]) -> Callable[..., T]:
+        plan = self.planner(self.unjsonify).plan(type_)
+        unjsonify_ = self.unjsonify[type_]
+
+        def deep_unjsonify(value, max_depth: int = DEFAULT_MAX_DEPTH) -> T:
+            """
+            Unjsonify a value nested at most `max_depth` levels deep.
+            """
+
+            if plan is None:
+                return unjsonify_(value)
+
+            return walk(plan, value, type_, max_depth)
+
+        return deep_unjsonify
+
+
+def walk(plan: Plan, value, as_type, max_depth: int) -> Any:
+    root: list = [None]
+
+    stack: list = [(plan.visit, value, root, 0, 0)]
+    pop = stack.pop
+
+    while stack:
+        (visit, value, target, key, depth) = pop()
+        if depth >= max_depth:
+            message = f"Cannot unjsonify as {get_typename(as_type)}: nested more than {max_depth} levels deep"
+            raise UnjsonifyError(value, as_type, message=message)
+
+        visit(stack, value, target, key, depth)
+
+    return root[0]
+
+
+deep_jsonify = DeepJsonify()
+deep_unjsonify: DeepUnjsonify = DeepUnjsonify()
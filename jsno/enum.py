@@ -0,0 +1,226 @@
+"""
+Jsonification and unjsonification for enums.
+
+Enums are jsonified as the names of their members by default. Another
+wire mode can be selected for an enum class with the enum_mode decorator,
+or for a field or a registry with the EnumCodec annotation:
+
+* "name": the name of the member
+* "value": the (jsonified) value of the member
+* "int": the integer value of the member, for IntEnum and IntFlag
+
+Flags are jsonified as lists of the names of the members they combine,
+or as integers in the "value" and "int" modes.
+
+The members are looked up from tables precomputed for each enum class.
+"""
+
+import dataclasses
+import enum
+import functools
+import operator
+import types
+
+from typing import Any, Callable, Literal
+
+from jsno.cache import CodecCache
+from jsno.codec import Codec
+from jsno.jsonify import jsonify
+from jsno.unjsonify import unjsonify, UnjsonifyError
+from jsno.utils import JSON
+
+
+EnumMode = Literal["name", "value", "int"]
+
+
+@functools.singledispatch
+def _get_enum_mode(arg) -> EnumMode:
+    return "name"
+
+
+def enum_mode(mode: EnumMode):
+    """
+    Decorator for enum classes, selecting how their members are jsonified.
+    """
+
+    if mode not in ("name", "value", "int"):
+        raise ValueError(f"Unknown enum mode {mode!r}")
+
+    def decorator(cls):
+        @_get_enum_mode.register(cls)
+        def _(arg):
+            return mode
+
+        # drop the codecs created with the previous mode
+        if (previous := enum_jsonifiers.get(cls)) is not None:
+            enum_jsonifiers.invalidate(lambda jsonifier: jsonifier is previous)
+        unjsonify.invalidate(cls)
+        return cls
+
+    return decorator
+
+
+def get_enum_mode(type_) -> EnumMode:
+    return _get_enum_mode.dispatch(type_)(type_)
+
+
+hashable_json_types = {str, int, float, bool, types.NoneType}
+
+
+def get_value_table(as_type: type[enum.Enum], mode: EnumMode) -> dict[tuple, Any]:
+    """
+    Get the table mapping the jsonified values of the members to the
+    members. The keys include the type, so that 1 and true don't match.
+    """
+
+    table = {}
+    for member in as_type.__members__.values():
+        json_value = member.value if mode == "value" else int(member.value)
+        json_value = jsonify(json_value)
+
+        if type(json_value) not in hashable_json_types:
+            raise TypeError(f"Cannot unjsonify {as_type.__qualname__} by values of type {type(json_value)}")
+
+        table[(type(json_value), json_value)] = member
+
+    return table
+
+
+def check_mode(as_type: type[enum.Enum], mode: EnumMode) -> None:
+    if mode == "int" and not all(isinstance(member.value, int) for member in as_type):
+        raise TypeError(f"Cannot use enum mode 'int' for {as_type.__qualname__}")
+
+
+def get_enum_jsonify(as_type: type[enum.Enum], mode: EnumMode) -> Callable[[Any], JSON]:
+    check_mode(as_type, mode)
+    is_flag = issubclass(as_type, enum.Flag)
+
+    if mode == "name":
+        if is_flag:
+            return lambda value: [member._name_ for member in value]
+
+        return operator.attrgetter("_name_")
+
+    if mode == "int":
+        return lambda value: int(value._value_)
+
+    # precompute the jsonified values
+    values = {member: jsonify(member.value) for member in as_type}
+
+    def jsonify_enum_value(value):
+        json_value = values.get(value)
+        if json_value is None:
+            # a combination of flags
+            return jsonify(value._value_)
+        return json_value
+
+    return jsonify_enum_value
+
+
+def get_enum_unjsonify(as_type: type[enum.Enum], mode: EnumMode) -> Callable[[JSON], Any]:
+    check_mode(as_type, mode)
+
+    if mode == "name":
+        members = dict(as_type.__members__)
+
+        if issubclass(as_type, enum.Flag):
+            return get_flag_unjsonify(as_type, members)
+
+        def unjsonify_enum(value):
+            member = members.get(value) if type(value) is str else None
+            if member is None:
+                raise UnjsonifyError(value, as_type)
+            return member
+
+        return unjsonify_enum
+
+    table = get_value_table(as_type, mode)
+    is_flag = issubclass(as_type, enum.Flag)
+
+    def unjsonify_enum_value(value):
+        if type(value) in hashable_json_types:
+            member = table.get((type(value), value))
+            if member is not None:
+                return member
+
+            if is_flag and type(value) is int:
+                # a combination of flags
+                try:
+                    return as_type(value)
+                except ValueError:
+                    pass
+
+        raise UnjsonifyError(value, as_type)
+
+    return unjsonify_enum_value
+
+
+def get_flag_unjsonify(as_type: type[enum.Enum], members: dict) -> Callable[[JSON], Any]:
+    empty = as_type(0)
+
+    def unjsonify_flag(value):
+        if type(value) is str:
+            # a single name, or names separated by "|"
+            value = value.split("|")
+        elif type(value) is not list:
+            raise UnjsonifyError(value, as_type)
+
+        result = empty
+        for name in value:
+            member = members.get(name) if type(name) is str else None
+            if member is None:
+                raise UnjsonifyError(value, as_type, f"Unknown flag {name!r}")
+            result |= member
+
+        return result
+
+    return unjsonify_flag
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class EnumCodec(Codec):
+    """
+    Annotation for selecting the wire mode of an enum, for a field or,
+    with Registry.register_codec, for a registry.
+    """
+
+    mode: EnumMode = "name"
+
+    def get_jsonify(self, as_type) -> Callable[[Any], JSON]:
+        return get_enum_jsonify(as_type, self.mode)
+
+    def get_unjsonify(self, as_type) -> Callable[[JSON], Any]:
+        return get_enum_unjsonify(as_type, self.mode)
+
+
+class EnumJsonifierCache(CodecCache):
+    """
+    Cache of the jsonifiers of the enum classes.
+    """
+
+    def __getitem__(self, cls: type[enum.Enum]) -> Callable:
+        jsonifier = self.get(cls)
+        if jsonifier is None:
+            jsonifier = get_enum_jsonify(cls, get_enum_mode(cls))
+            self[cls] = jsonifier
+
+        return jsonifier
+
+
+enum_jsonifiers = EnumJsonifierCache()
+
+
+@jsonify.register(enum.Enum)
+def jsonify_enum(value):
+    # fast path: look up the jsonifier directly from the class
+    cls = type(value)
+    entry = getattr(cls, enum_jsonifiers.attribute, None)
+    if entry is not None and entry[0] is cls:
+        return entry[1](value)
+
+    return enum_jsonifiers[cls](value)
+
+
+@unjsonify.register_factory(enum.Enum)
+def _(as_type):
+    return get_enum_unjsonify(as_type, get_enum_mode(as_type))
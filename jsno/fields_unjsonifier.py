@@ -2,21 +2,38 @@ import copy
 import dataclasses
 import functools
 import json
+import reprlib
 
 from collections.abc import Mapping
 from typing import Any, Callable, Required, NotRequired
 
 from jsno.extra_data import get_extra_data_configuration, IgnoreExtraKeys
+from jsno.immutable import is_immutable
+from jsno.interning import get_key_intern
 from jsno.utils import contextvar, get_typename
 
 
+def format_value(value) -> str:
+    """
+    Format a value for error messages, as JSON if possible.
+    """
+
+    try:
+        return json.dumps(value)
+    except Exception:
+        pass
+
+    try:
+        return repr(value)
+    except RecursionError:
+        # too deeply nested to show as a whole
+        return reprlib.repr(value)
+
+
 class UnjsonifyError(TypeError):
     def __init__(self, value, type, detail=None, message=None):
         if message is None:
-            try:
-                jsonvalue = json.dumps(value)
-            except Exception:
-                jsonvalue = repr(value)
+            jsonvalue = format_value(value)
 
             message = f"Cannot unjsonify as {get_typename(type)}: {jsonvalue}"
             if detail is not None:
@@ -65,6 +82,22 @@ class SchemaField:
     be omitted from the result.
     """
 
+    default_factory: Callable | None = None
+    """
+    Function that creates the default value. If not given, and the default
+    value is not known to be immutable, the default value is deep-copied.
+    """
+
+    def __post_init__(self):
+        default = self.default
+        if (
+            self.default_factory is None and
+            default is not Required and
+            default is not NotRequired and
+            not is_immutable(default)
+        ):
+            object.__setattr__(self, "default_factory", functools.partial(copy.deepcopy, default))
+
 
 @dataclasses.dataclass
 class FieldsUnjsonifier:
@@ -97,10 +130,13 @@ class FieldsUnjsonifier:
                 detail = f"Required key not found: {repr(field.json_name)}"
                 raise UnjsonifyError(value, self.as_type, detail)
 
+            elif field.default_factory is not None:
+                result[field.name] = field.default_factory()
             elif field.default is NotRequired:
                 pass
             else:
-                result[field.name] = copy.deepcopy(field.default)
+                # immutable default, can be shared
+                result[field.name] = field.default
 
         if found_count < len(value):
             self.handle_extra_keys(value, result)
@@ -154,10 +190,12 @@ class ExtraKeysUnjsonifier(FieldsUnjsonifier):
 
             extra = result[self.extra_data_key]
 
+        intern = get_key_intern()
+
         # copy the extra values
         for key in value:
             if key not in self.source_names:
-                extra[key] = self.default_unjsonifier(value[key])
+                extra[intern(key) if intern else key] = self.default_unjsonifier(value[key])
 
     @staticmethod
     def create(extra_data_key, default_unjsonifier=None, **kwargs):
@@ -0,0 +1,519 @@
+"""
+Object graphs: jsonifying shared and cyclic dataclass instances once.
+
+The registries of `GraphRegistry` jsonify a dataclass instance that occurs
+more than once in a value only on its first occurrence, which is given an
+id, and the later occurrences as references to it:
+
+    graph = jsno.GraphRegistry()
+    data = graph.jsonify(scene)
+    # {"bricks": [{"material": {"name": "oak", "$id": 0}}, {"material": {"$ref": 0}}]}
+
+    scene = graph.unjsonify[Scene](data)
+
+Unjsonifying restores the shared instances, and cycles. The instances are
+identified by identity. With `GraphRegistry(by_value=True)`, instances of
+frozen dataclasses are identified also by value, so that identical
+instances are jsonified only once. Only values that have exact keys (see
+`jsno.interning.exact_key`) are identified by value, so that values that
+only compare equal, like Decimal("1.0") and Decimal("1.00"), or the same
+time in different timezones, are not merged.
+
+References are resolved where the expected type is a dataclass. An object
+with an id is allocated before its fields are unjsonified, and initialized
+after (by calling `__init__`, unless bypassed), so that references in its
+fields can refer to it. Such an object must not be hashed before it has
+been initialized.
+
+The deep functions of the registry, `graph.deep_jsonify` and
+`graph.deep_unjsonify[Scene]`, handle the references in the same way.
+"""
+
+import dataclasses
+import functools
+import threading
+
+from collections.abc import Mapping
+from typing import Any, Callable
+
+from jsno.constraint import get_class_annotations, get_validators
+from jsno.construction import get_initializer
+from jsno.deep import DEFAULT_MAX_DEPTH, DataclassPlan, DeepJsonify, DeepUnjsonify, Planner, VariantPlan
+from jsno.fields_unjsonifier import UnjsonifyError, create_unjsonifier
+from jsno.interning import exact_key
+from jsno.jsonify import DataclassJsonification, Jsonify
+from jsno.jsonize import Loads
+from jsno.registry import Registry, default_registry
+from jsno.unjsonify import (
+    ReferThrough, Unjsonify, get_unjsonify_dataclass, get_validating_unjsonify, is_shareable,
+    resolve_field_unjsonifiers, scope, unjsonify_factory,
+)
+from jsno.utils import DictWithoutKey, JSON
+from jsno.variant import get_variantfamily
+
+
+ID_KEY = "$id"
+REF_KEY = "$ref"
+
+
+class Entry:
+    """
+    An object seen while jsonifying, and its JSON object.
+    """
+
+    __slots__ = ("value", "json", "id")
+
+    def __init__(self, value):
+        # keep the value alive, as objects are identified by their ids
+        self.value = value
+        self.json: dict | None = None
+        self.id: int | None = None
+
+
+class JsonifySession:
+    """
+    The objects seen in a jsonify call.
+    """
+
+    __slots__ = ("entries", "count")
+
+    def __init__(self) -> None:
+        self.entries: dict[Any, Entry] = {}
+        self.count = 0
+
+    def lookup(self, value, shareable: bool) -> tuple[Any, Entry | None]:
+        """
+        Get the key of an object, and its entry if it has been seen before.
+        Shareable objects are identified by their exact keys, if they have
+        them, and other objects by identity.
+        """
+
+        key: Any = id(value)
+        if shareable:
+            try:
+                key = exact_key(value)
+            except TypeError:
+                pass
+
+        return (key, self.entries.get(key))
+
+    def refer(self, entry: Entry) -> JSON:
+        """
+        Get a reference to an object seen before, giving it an id first.
+        """
+
+        if entry.id is None:
+            entry.id = self.count
+            self.count += 1
+
+            if entry.json is not None:
+                entry.json[ID_KEY] = entry.id
+
+        return {REF_KEY: entry.id}
+
+
+class UnjsonifySession:
+    """
+    The objects with ids, in an unjsonify call.
+    """
+
+    __slots__ = ("objects",)
+
+    def __init__(self) -> None:
+        self.objects: dict[int, Any] = {}
+
+    def get(self, value: Mapping, as_type) -> Any:
+        """
+        Get the object that a reference refers to.
+        """
+
+        obj = self.objects.get(value[REF_KEY], Entry)
+        if obj is Entry or len(value) != 1:
+            raise UnjsonifyError(value, as_type, "Invalid reference")
+
+        if not isinstance(obj, as_type):
+            raise UnjsonifyError(value, as_type, f"Reference to {type(obj).__qualname__}")
+
+        return obj
+
+
+class Sessions(threading.local):
+    jsonify: JsonifySession | None = None
+    unjsonify: UnjsonifySession | None = None
+
+
+sessions = Sessions()
+
+
+def in_unjsonify_session(function: Callable, *args) -> Any:
+    """
+    Call the function in an unjsonify session, unless it's called in one.
+    """
+
+    if sessions.unjsonify is not None:
+        return function(*args)
+
+    sessions.unjsonify = UnjsonifySession()
+    try:
+        return function(*args)
+    finally:
+        sessions.unjsonify = None
+
+
+# jsonification
+
+
+def get_jsonify_tracked(cls: type, jsonify_: Callable, by_value: bool) -> Callable:
+    """
+    Wrap the jsonifier of a dataclass, to jsonify the repeated instances
+    as references.
+    """
+
+    shareable = by_value and is_shareable(cls)
+
+    def jsonify_tracked(value):
+        session = sessions.jsonify
+        if session is None:
+            return jsonify_(value)
+
+        (key, entry) = session.lookup(value, shareable)
+        if entry is not None:
+            return session.refer(entry)
+
+        entry = session.entries[key] = Entry(value)
+        result = jsonify_(value)
+        entry.json = result
+
+        if entry.id is not None:
+            # referred to by its own fields
+            result[ID_KEY] = entry.id
+
+        return result
+
+    return jsonify_tracked
+
+
+class GraphJsonify(Jsonify):
+    """
+    Jsonify function that jsonifies repeated dataclass instances as
+    references.
+    """
+
+    def __init__(self, parent: Jsonify, by_value: bool = False) -> None:
+        super().__init__(parent)
+        self.by_value = by_value
+
+    def call_in_scope(self, function: Callable, *args) -> JSON:
+        if sessions.jsonify is not None:
+            return super().call_in_scope(function, *args)
+
+        sessions.jsonify = JsonifySession()
+        try:
+            return super().call_in_scope(function, *args)
+        finally:
+            sessions.jsonify = None
+
+    def resolve(self, cls: type) -> Callable | None:
+        jsonify_ = super().resolve(cls)
+        if jsonify_ is not None and type(getattr(jsonify_, "__self__", None)) is DataclassJsonification:
+            return get_jsonify_tracked(cls, jsonify_, self.by_value)
+
+        return jsonify_
+
+
+# unjsonification
+
+
+def get_initialize(as_type: type) -> Callable[[Any, dict], None]:
+    """
+    Get a function that initializes an allocated instance of a dataclass
+    from a dict of the init field values, in the same way as the instances
+    are constructed when unjsonified: without calling `__init__`, if the
+    dataclass is marked with `bypass_init`.
+    """
+
+    initialize = get_initializer(as_type)
+    if initialize is not None:
+        return initialize
+
+    init = as_type.__init__  # type: ignore[misc]
+
+    def call_init(instance, kwargs: dict) -> None:
+        init(instance, **kwargs)
+
+    return call_init
+
+
+def get_unjsonify_tracked(as_type: type, unjsonify_plain: Callable) -> Callable:
+    """
+    Wrap the unjsonifier of a dataclass, to resolve the references, and
+    to store the objects with ids.
+    """
+
+    unjsonifier = create_unjsonifier(
+        as_type=as_type,
+        fields=resolve_field_unjsonifiers(
+            as_type,
+            field_names=[field.name for field in dataclasses.fields(as_type) if field.init],
+        ),
+    )
+    new = object.__new__
+    initialize = get_initialize(as_type)
+
+    def unjsonify_tracked(value):
+        if (session := sessions.unjsonify) is None or not isinstance(value, Mapping):
+            return unjsonify_plain(value)
+
+        if REF_KEY in value:
+            return session.get(value, as_type)
+
+        object_id = value.get(ID_KEY)
+        if object_id is None:
+            return unjsonify_plain(value)
+
+        if type(object_id) is not int:
+            raise UnjsonifyError(value, as_type, "Invalid id")
+
+        # the object is referred to before it's initialized, in cycles
+        instance = session.objects[object_id] = new(as_type)
+
+        kwargs = unjsonifier.unjsonify_fields(DictWithoutKey(base=value, key=ID_KEY))
+        try:
+            initialize(instance, kwargs)
+            return instance
+        except TypeError as exc:
+            detail = exc.args[0]
+
+        raise UnjsonifyError(value, as_type, detail)
+
+    return unjsonify_tracked
+
+
+def get_unjsonify_reference(as_type: type, unjsonify_: Callable) -> Callable:
+    """
+    Wrap the unjsonifier of a variant family, to resolve the references.
+    """
+
+    def unjsonify_reference(value):
+        if (session := sessions.unjsonify) is not None and isinstance(value, Mapping) and REF_KEY in value:
+            return session.get(value, as_type)
+
+        return unjsonify_(value)
+
+    return unjsonify_reference
+
+
+class GraphUnjsonify(Unjsonify):
+    """
+    Unjsonify registry that resolves the references to dataclass
+    instances.
+    """
+
+    def __getitem__(self, type_):
+        unjsonify_ = super().__getitem__(type_)
+        if scope.registry is not None:
+            # specializing an unjsonifier
+            return unjsonify_
+
+        def unjsonify_graph(value):
+            return in_unjsonify_session(unjsonify_, value)
+
+        return unjsonify_graph
+
+    def _dispatch(self, type_) -> Callable:
+        unjsonify_ = super()._dispatch(type_)
+        if isinstance(type_, type) and get_variantfamily(type_):
+            return get_unjsonify_reference(type_, unjsonify_)
+
+        return unjsonify_
+
+    def specialize(self, type_) -> Callable:
+        if not (
+            isinstance(type_, type) and
+            dataclasses.is_dataclass(type_) and
+            self.dispatch_factory(type_) is unjsonify_factory.registry[object]
+        ):
+            return super().specialize(type_)
+
+        if type_ in self._context_stack:
+            return ReferThrough(type_, self)
+
+        if scope.dependencies:
+            scope.dependencies[-1].add(type_)
+
+        unjsonify_ = get_unjsonify_tracked(type_, get_unjsonify_dataclass(type_))
+
+        validators = get_validators(get_class_annotations(type_))
+        return get_validating_unjsonify(type_, unjsonify_, validators)
+
+
+# deeply nested values
+
+
+class GraphDeepJsonify(DeepJsonify):
+    """
+    Jsonify function for deeply nested values, that jsonifies repeated
+    dataclass instances as references.
+    """
+
+    tracking = True
+
+    def __init__(self, jsonify_: GraphJsonify) -> None:
+        super().__init__(jsonify_)
+        self.by_value = jsonify_.by_value
+        self.shareable: dict[type, bool] = {}
+
+    def get_handler(self, cls: type) -> Any:
+        # the dataclasses are walked through without the tracking
+        # jsonifiers, and tracked by `track`
+        jsonify_ = Jsonify.resolve(self.jsonify, cls)
+        if type(specialized := getattr(jsonify_, "__self__", None)) is DataclassJsonification:
+            self.shareable[cls] = self.by_value and is_shareable(cls)
+            return specialized
+
+        return self.jsonify.get_exact(cls)
+
+    def track(self, cls: type, value, result: dict) -> JSON | None:
+        session = sessions.jsonify
+        assert session is not None
+
+        (key, entry) = session.lookup(value, self.shareable[cls])
+        if entry is not None:
+            return session.refer(entry)
+
+        entry = session.entries[key] = Entry(value)
+        entry.json = result
+        return None
+
+
+def get_visit_regular(unjsonify_: Callable) -> Callable:
+    """
+    Get a visit function unjsonifying the value with the regular
+    unjsonifier, for the fields that are not planned.
+    """
+
+    def visit_regular(stack, value, target, key, depth):
+        target[key] = unjsonify_(value)
+
+    return visit_regular
+
+
+class GraphDataclassPlan(DataclassPlan):
+    """
+    Plan for a dataclass that resolves the references, and stores the
+    objects with ids. All the fields are visited in document order, so
+    that the objects with ids are stored before the references to them.
+    """
+
+    def __init__(self, as_type: type):
+        super().__init__(as_type)
+        self.initialize_instance = get_initialize(as_type)
+
+    def set_fields(self, fields) -> None:
+        super().set_fields([
+            (name, json_name, visit or get_visit_regular(unjsonify_), unjsonify_)
+            for (name, json_name, visit, unjsonify_) in fields
+        ])
+
+    def visit(self, stack, value, target, key, depth):
+        if (session := sessions.unjsonify) is None or not isinstance(value, Mapping):
+            return super().visit(stack, value, target, key, depth)
+
+        if REF_KEY in value:
+            target[key] = session.get(value, self.as_type)
+            return
+
+        object_id = value.get(ID_KEY)
+        if object_id is None:
+            return super().visit(stack, value, target, key, depth)
+
+        if type(object_id) is not int:
+            raise UnjsonifyError(value, self.as_type, "Invalid id")
+
+        # the object is referred to before it's initialized, in cycles
+        instance = session.objects[object_id] = object.__new__(self.as_type)
+
+        value = DictWithoutKey(base=value, key=ID_KEY)
+        kwargs: dict[str, Any] = {}
+        stack.append((self.initialize, (value, kwargs, instance), target, key, depth))
+
+        if self.visit_fields(stack, value, kwargs, depth + 1) < len(value):
+            self.unjsonifier.handle_extra_keys(value, kwargs)
+
+    def visit_variant(self, stack, value, target, key, depth, label_name: str):
+        if ID_KEY in value:
+            return self.visit(stack, DictWithoutKey(base=value, key=label_name), target, key, depth)
+
+        super().visit_variant(stack, value, target, key, depth, label_name)
+
+    def initialize(self, stack, args, target, key, depth):
+        (value, kwargs, instance) = args
+        try:
+            self.initialize_instance(instance, kwargs)
+        except TypeError as exc:
+            raise UnjsonifyError(value, self.as_type, exc.args[0]) from None
+
+        self.validate_instance(value, instance)
+        target[key] = instance
+
+
+class GraphVariantPlan(VariantPlan):
+    """
+    Plan for a variant family that resolves the references.
+    """
+
+    def visit(self, stack, value, target, key, depth):
+        if (session := sessions.unjsonify) is not None and isinstance(value, Mapping) and REF_KEY in value:
+            target[key] = session.get(value, self.as_type)
+            return
+
+        super().visit(stack, value, target, key, depth)
+
+
+class GraphPlanner(Planner):
+    """
+    Plans the types for a graph registry.
+    """
+
+    dataclass_plan = GraphDataclassPlan
+    variant_plan = GraphVariantPlan
+
+
+class GraphDeepUnjsonify(DeepUnjsonify):
+    """
+    Factory for type-specific unjsonify functions for deeply nested values,
+    that resolve the references to dataclass instances.
+    """
+
+    planner = GraphPlanner
+
+    def __getitem__(self, type_):
+        deep_unjsonify_ = super().__getitem__(type_)
+
+        def deep_unjsonify_graph(value, max_depth: int = DEFAULT_MAX_DEPTH):
+            return in_unjsonify_session(deep_unjsonify_, value, max_depth)
+
+        return deep_unjsonify_graph
+
+
+class GraphRegistry(Registry):
+    """
+    Registry whose jsonify and unjsonify functions handle shared and
+    cyclic dataclass instances, using references.
+    """
+
+    jsonify: GraphJsonify
+
+    def __init__(self, parent: Registry | None = None, by_value: bool = False):
+        self.parent = parent or default_registry
+        self.jsonify = GraphJsonify(parent=self.parent.jsonify, by_value=by_value)
+        self.unjsonify = GraphUnjsonify(parent=self.parent.unjsonify)
+        self.loads = Loads(self.unjsonify)
+
+    @functools.cached_property
+    def deep_jsonify(self) -> DeepJsonify:
+        return GraphDeepJsonify(self.jsonify)
+
+    @functools.cached_property
+    def deep_unjsonify(self) -> DeepUnjsonify:
+        return GraphDeepUnjsonify(self.unjsonify)
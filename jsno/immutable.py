@@ -0,0 +1,75 @@
+"""
+Classifying values as immutable, so that they can be shared instead
+of copied, for example when used as default values.
+"""
+
+import dataclasses
+import enum
+import functools
+import types
+
+from jsno.lazy import load_registrations
+
+
+@functools.singledispatch
+def is_immutable(value) -> bool:
+    """
+    Check if a value is known to be immutable. Returns False for values
+    of unknown types.
+    """
+
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return (
+            type(value).__dataclass_params__.frozen and  # type: ignore
+            all(
+                is_immutable(getattr(value, field.name))
+                for field in dataclasses.fields(value)
+            )
+        )
+
+    if load_registrations(type(value)):
+        check = is_immutable.dispatch(type(value))
+        if check is not is_immutable.registry[object]:
+            return check(value)
+
+    return False
+
+
+immutable_types: set[type] = set()
+"""Types whose instances are always immutable"""
+
+
+def register_immutable(*types_: type) -> None:
+    """
+    Register types whose instances are always immutable.
+    """
+
+    for type_ in types_:
+        is_immutable.register(type_)(lambda value: True)
+        immutable_types.add(type_)
+
+
+def is_immutable_type(type_) -> bool:
+    """
+    Check if the instances of a type are known to be always immutable.
+    """
+
+    if not isinstance(type_, type):
+        return False
+
+    # the type may be registered lazily
+    load_registrations(type_)
+
+    return any(issubclass(type_, immutable) for immutable in immutable_types)
+
+
+register_immutable(
+    types.NoneType, types.EllipsisType, bool, int, float, complex, str, bytes,
+    range, type, enum.Enum,
+)
+
+
+@is_immutable.register(tuple)
+@is_immutable.register(frozenset)
+def _(value) -> bool:
+    return all(is_immutable(item) for item in value)
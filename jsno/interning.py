@@ -0,0 +1,228 @@
+"""
+Sharing repeated values while unjsonifying.
+
+Decoding large lists of records produces many equal strings and
+immutable objects. Inside an interning session, the equal values are
+replaced by a single shared instance:
+
+    with unjsonify.interning(keys=True):
+        records = unjsonify[list[Record]](data)
+
+The session shares the values of fields annotated with `jsno.categorical`,
+the keys of typed mappings (if `keys` is true), and frozen dataclasses
+and tuples (if `objects` is true). The tables are bounded: once they are
+full, new values are not shared anymore.
+
+Values are shared only if they are identical, not just equal: 0.0 and
+-0.0, Decimal("1.0") and Decimal("1.00"), or the same instant in different
+timezones, are all kept apart. The values are identified by their exact
+keys, which are defined for the basic types, and registered for the
+other immutable types with `exact_key.register`. Values of other types
+are not shared.
+"""
+
+import contextlib
+import dataclasses
+import enum
+import functools
+import threading
+import types
+
+from typing import Any, Callable, Hashable, Iterator
+
+from jsno.lazy import load_registrations
+from jsno.utils import Annotation
+
+
+class Categorical(Annotation):
+    """
+    Annotation for values that have only a few distinct values, such as
+    country codes, and are shared inside interning sessions.
+    """
+
+
+categorical = Categorical()
+
+
+@functools.singledispatch
+def exact_key(value) -> Hashable:
+    """
+    Get a key that identifies a value exactly: values with equal keys are
+    interchangeable. Raises TypeError for values that can't be identified
+    (e.g. mutable values, and values of unknown types).
+    """
+
+    cls = type(value)
+    params = getattr(cls, "__dataclass_params__", None)
+    if params is not None and params.frozen and params.eq:
+        return (cls, *(exact_key(getattr(value, field.name)) for field in dataclasses.fields(value)))
+
+    if load_registrations(cls):
+        get_key = exact_key.dispatch(cls)
+        if get_key is not exact_key.registry[object]:
+            return get_key(value)
+
+    raise TypeError(f"No exact key for {cls.__qualname__}")
+
+
+@exact_key.register(types.NoneType)
+@exact_key.register(bool)
+@exact_key.register(int)
+@exact_key.register(str)
+@exact_key.register(bytes)
+@exact_key.register(enum.Enum)
+def _(value) -> Hashable:
+    return (type(value), value)
+
+
+@exact_key.register(float)
+def _(value) -> Hashable:
+    # the hex representation tells 0.0 from -0.0 (which are equal), and
+    # NaNs are never equal
+    if value != value:
+        raise TypeError("No exact key for NaN")
+
+    return (type(value), value.hex())
+
+
+@exact_key.register(tuple)
+def _(value) -> Hashable:
+    return (type(value), *map(exact_key, value))
+
+
+@exact_key.register(frozenset)
+def _(value) -> Hashable:
+    return (type(value), frozenset(map(exact_key, value)))
+
+
+class InterningSession:
+    """
+    Tables of the shared values.
+    """
+
+    __slots__ = ("keys", "objects", "maxsize", "strings", "values", "hits")
+
+    def __init__(self, keys: bool, objects: bool, maxsize: int):
+        self.keys = keys
+        self.objects = objects
+        self.maxsize = maxsize
+        self.strings: dict[str, str] = {}
+        self.values: dict[Hashable, Any] = {}
+        self.hits = 0
+
+    def intern(self, value):
+        """
+        Get the shared instance of a string or other hashable value.
+        """
+
+        if type(value) is not str:
+            return self.share(value)
+
+        shared = self.strings.get(value)
+        if shared is not None:
+            self.hits += 1
+            return shared
+
+        if len(self.strings) < self.maxsize:
+            self.strings[value] = value
+
+        return value
+
+    def share(self, value):
+        """
+        Get the shared instance of an immutable value. Values that have no
+        exact key are returned as is.
+        """
+
+        try:
+            key = exact_key(value)
+        except TypeError:
+            return value
+
+        shared = self.values.get(key)
+        if shared is not None:
+            self.hits += 1
+            return shared
+
+        if len(self.values) < self.maxsize:
+            self.values[key] = value
+
+        return value
+
+
+class Sessions(threading.local):
+    current: InterningSession | None = None
+
+
+sessions = Sessions()
+
+
+@contextlib.contextmanager
+def interning(
+    keys: bool = False,
+    objects: bool = True,
+    maxsize: int = 1_000_000,
+) -> Iterator[InterningSession]:
+    """
+    Share the repeated values unjsonified in this context (in the current
+    thread). The session is released at the end of the context.
+    """
+
+    session = InterningSession(keys=keys, objects=objects, maxsize=maxsize)
+    previous = sessions.current
+    sessions.current = session
+    try:
+        yield session
+    finally:
+        sessions.current = previous
+
+
+def interned(unjsonify: Callable) -> Callable:
+    """
+    Wrap an unjsonifier of categorical values.
+    """
+
+    def unjsonify_interned(value):
+        result = unjsonify(value)
+        if (session := sessions.current) is not None:
+            return session.intern(result)
+        return result
+
+    return unjsonify_interned
+
+
+def shared(unjsonify: Callable) -> Callable:
+    """
+    Wrap an unjsonifier of immutable objects.
+    """
+
+    def unjsonify_shared(value):
+        result = unjsonify(value)
+        if (session := sessions.current) is not None and session.objects:
+            return session.share(result)
+        return result
+
+    return unjsonify_shared
+
+
+def get_key_intern() -> Callable[[Any], Any] | None:
+    """
+    Get the function for interning mapping keys in this context, or None
+    if the keys are not interned.
+    """
+
+    if (session := sessions.current) is not None and session.keys:
+        return session.intern
+
+    return None
+
+
+def intern_keys(mapping: dict) -> dict:
+    """
+    Intern the keys of a mapping, if interning keys in this context.
+    """
+
+    if (intern := get_key_intern()) is not None:
+        return {intern(key): value for (key, value) in mapping.items()}
+
+    return mapping
@@ -1,9 +1,15 @@
+import contextlib
 import dataclasses
 import functools
+import threading
+import weakref
 
-from typing import NamedTuple
+from collections.abc import Sequence
+from typing import Annotated, Callable, NamedTuple, get_args, get_origin, get_type_hints
 
+from jsno.cache import CacheInfo, CodecCache
 from jsno.extra_data import get_extra_data_configuration
+from jsno.lazy import load_registrations
 from jsno.property_name import get_property_name
 from jsno.utils import JSON
 from jsno.variant import get_variantfamily
@@ -13,6 +19,7 @@ class FieldSpec(NamedTuple):
     name: str
     json_name: str
     optional: bool
+    jsonify: Callable
 
 
 @dataclasses.dataclass(slots=True, frozen=True)
@@ -40,7 +47,7 @@ class DataclassJsonification:
         for field in self.fields:
             val = getattr(value, field.name)
             if not (val is None and field.optional):
-                result[field.json_name] = jsonify(val)
+                result[field.json_name] = field.jsonify(val)
 
         # if extra data is defined, add it's contents
         if isinstance(self.extra_data_property, str):
@@ -60,29 +67,60 @@ class DataclassJsonification:
         else:
             label = None
 
+        try:
+            type_hints = get_type_hints(type_, include_extras=True)
+        except NameError:
+            # unresolvable forward references
+            type_hints = {}
+
+        fields = []
+        for field in dataclasses.fields(type_):
+            field_type = type_hints.get(field.name, field.type)
+            json_name = get_property_name(field_type, field.name)
+            if field.name != extra_data_property and json_name:
+                fields.append(FieldSpec(
+                    field.name, json_name, field.default is None, get_field_jsonify(field_type)
+                ))
+
         return DataclassJsonification(
             label_name=family and family.label_name,
             label=label,
             extra_data_property=extra_data_property,
-            fields=[
-                FieldSpec(field.name, json_name, field.default is None)
-                for field in dataclasses.fields(type_)
-                if field.name != extra_data_property
-                if (json_name := get_property_name(field.type, field.name))
-            ]
+            fields=fields,
         )
 
 
-class JsonificationCache(dict):
+def get_field_jsonify(field_type) -> Callable:
+    """
+    Get the jsonify function for values of a dataclass field. Jsonifies
+    based on the value's type, unless there's a codec annotation.
     """
-    Specialized dictionary that creates jsonifications on demand
 
-    Could use functools.cache, but directly using this is a
-    little bit faster
+    # the codecs are imported here, as they're not needed for importing jsno
+    from jsno.codec import get_codec
+
+    if found := get_codec(field_type):
+        (codec, as_type, optional) = found
+        jsonify_ = codec.get_jsonify(as_type)
+        if optional:
+            return lambda value: None if value is None else jsonify_(value)
+
+        return jsonify_
+
+    return call_jsonify
+
+
+class JsonificationCache(CodecCache):
+    """
+    Cache that creates dataclass jsonifications on demand
     """
-    def __missing__(self, key: type):
-        self[key] = DataclassJsonification.create(key)
-        return self[key]
+    def __getitem__(self, key: type) -> DataclassJsonification:
+        specialized = self.get(key)
+        if specialized is None:
+            specialized = DataclassJsonification.create(key)
+            self[key] = specialized
+
+        return specialized
 
 
 jsonifications = JsonificationCache()
@@ -92,8 +130,15 @@ def jsonify_dataclass(value) -> dict[str, JSON]:
     """
     Jsonify a value whose type is a dataclass.
     """
-    specialized = jsonifications[type(value)]
-    return specialized.jsonify(value)
+
+    # fast path: look up the jsonification directly from the class
+    cls = type(value)
+    entry = getattr(cls, jsonifications.attribute, None)
+    if entry is not None and entry[0] is cls:
+        jsonifications.hits += 1
+        return entry[1].jsonify(value)
+
+    return jsonifications[cls].jsonify(value)
 
 
 def jsonify_list(value: list) -> list[JSON]:
@@ -107,6 +152,10 @@ def jsonify_list(value: list) -> list[JSON]:
         # shortcut for empty lists
         return value
 
+    if batch_types and type(value[0]) in batch_types:
+        if (batch_json := jsonify_batch(value)) is not None:
+            return batch_json
+
     ix = 1
 
     val_json = call_jsonify(value[0])
@@ -176,15 +225,88 @@ def generic_jsonify(value):
     if dataclasses.is_dataclass(value):
         return jsonify_dataclass(value)
 
+    if load_registrations(type(value)):
+        jsonify_ = generic_jsonify.dispatch(type(value))
+        if jsonify_ is not generic_jsonify.registry[object]:
+            return jsonify_(value)
+
     raise TypeError("Don't know how to jsonify", value, type(value))
 
 
 native_types = {str, int, float, bool, type(None)}
 
+batch_types: set[type] = set()
+"""Types that have a batch jsonifier registered in any registry"""
+
+
+def jsonify_batch(values: Sequence) -> list[JSON] | None:
+    """
+    Jsonify the values with the batch jsonifier of their type, if they
+    all have the same type, and the type has one. Otherwise returns None.
+    """
+
+    cls = type(values[0])
+    batch = (scope.jsonify or jsonify).get_batch(cls)
+    if batch is None or not all(type(value) is cls for value in values):
+        return None
+
+    return batch(values)
+
+
+class Scope(threading.local):
+    """
+    The registry whose jsonifiers are used in this thread, or None
+    for the default registry.
+    """
+    jsonify: "Jsonify | None" = None
+
+
+scope = Scope()
+
+
+class Options(threading.local):
+    """
+    Jsonification options of this thread.
+    """
+    sort_sets: bool = True
+
+
+options = Options()
+
+
+container_jsonifiers: dict[type, tuple[Callable, Callable]] = {}
+"""
+Jsonifiers of the exact container types (tuple, set, deque, ...), used
+instead of the dispatched ones. Maps the types to the jsonifier, and the
+jsonifier registered for the type, which must still be the dispatched one.
+"""
+
+
+def register_container(cls: type, jsonify_: Callable, registered: Callable | None = None) -> None:
+    """
+    Use the jsonifier directly for the values of exactly the class, as
+    long as no other jsonifier is registered for it. `registered` is the
+    jsonifier currently dispatched for the class, if known, as dispatching
+    it at import time is slow.
+    """
+    container_jsonifiers[cls] = (jsonify_, registered or generic_jsonify.dispatch(cls))
+
+
+exact_jsonifiers = CodecCache()
+"""
+The exact-type table of the default registry. The jsonifiers of classes
+are stored in the classes, and those of builtin classes in a dictionary.
+"""
+
+exact_builtins = exact_jsonifiers.permanent
+exact_attribute = exact_jsonifiers.attribute
+
 
 def call_jsonify(value) -> JSON:
     """
     Call jsonify, using optimised paths for the native JSON types.
+    Other values are jsonified with the jsonifier of their exact type,
+    which is dispatched on the first time the type is seen.
     """
 
     if type(value) in native_types:
@@ -193,8 +315,14 @@ def call_jsonify(value) -> JSON:
         return jsonify_list(value)
     elif type(value) is dict:
         return jsonify_dict(value)
+    elif (scoped := scope.jsonify) is not None:
+        return scoped.call_exact(value)
+    elif (jsonify_ := exact_builtins.get(type(value))) is not None:
+        return jsonify_(value)
+    elif (entry := getattr(type(value), exact_attribute, None)) is not None and entry[0] is type(value):
+        return entry[1](value)
     else:
-        return generic_jsonify(value)
+        return jsonify.jsonify_miss(value)
 
 
 def call_jsonify_as_type(value, as_type: type) -> JSON:
@@ -213,32 +341,254 @@ def call_jsonify_as_type(value, as_type: type) -> JSON:
     elif as_type is dict:
         return jsonify_dict(value)
     else:
-        return generic_jsonify.dispatch(as_type)(value)
+        return (scope.jsonify or jsonify).dispatch(as_type)(value)
 
 
 class Jsonify:
     """
-    Singleton type for the jsonify function
+    Type of the jsonify function. The default one inherits nothing,
+    others inherit the jsonifiers registered in their parent.
     """
 
+    instances: "weakref.WeakSet[Jsonify]" = weakref.WeakSet()
+
+    def __init__(self, parent: "Jsonify | None" = None) -> None:
+        self.parent = parent
+        self.generic = (
+            generic_jsonify if parent is None
+            else functools.singledispatch(self._inherited)
+        )
+        self.batches: dict[type, Callable] = {}
+        self.exact = exact_jsonifiers if parent is None else CodecCache()
+        self.misses: weakref.WeakKeyDictionary[type, int] = weakref.WeakKeyDictionary()
+        Jsonify.instances.add(self)
+
+    def _inherited(self, value) -> JSON:
+        assert self.parent is not None
+        return self.parent.generic(value)
+
     def __call__(self, value) -> JSON:
         """
         Jsonify any value that supports jsonification.
         """
-        return call_jsonify(value)
+        if self.parent is None:
+            return call_jsonify(value)
+
+        return self.call_in_scope(call_jsonify, value)
+
+    def call_in_scope(self, function: Callable, *args) -> JSON:
+        """
+        Call a function, having the nested values jsonified
+        with this registry's jsonifiers.
+        """
+
+        previous = scope.jsonify
+        scope.jsonify = self
+        try:
+            return function(*args)
+        finally:
+            scope.jsonify = previous
 
     def call_as_type(self, value, as_type: type) -> JSON:
         """
         Jsonify any value that supports jsonification, dispatching
         on the given type.
         """
-        return call_jsonify_as_type(value, as_type)
+        if self.parent is None:
+            return call_jsonify_as_type(value, as_type)
+
+        return self.call_in_scope(call_jsonify_as_type, value, as_type)
 
     def __getitem__(self, type_):
-        return lambda value: jsonify.call_as_type(value, type_)
+        if get_origin(type_) is Annotated:
+            from jsno.codec import Codec
+            real_type = get_args(type_)[0]
+
+            if codec := Codec.get_annotation(type_):
+                jsonify_ = codec.get_jsonify(real_type)
+                if self.parent is None:
+                    return jsonify_
+
+                return lambda value: self.call_in_scope(jsonify_, value)
+
+            type_ = real_type
+
+        return lambda value: self.call_as_type(value, type_)
+
+    def call_exact(self, value) -> JSON:
+        """
+        Jsonify a value with the jsonifier of its exact type.
+        """
+
+        cls = type(value)
+        if (jsonify_ := self.exact.permanent.get(cls)) is not None:
+            return jsonify_(value)
+
+        entry = getattr(cls, self.exact.attribute, None)
+        if entry is not None and entry[0] is cls:
+            return entry[1](value)
+
+        return self.jsonify_miss(value)
+
+    def get_exact(self, cls: type) -> Callable:
+        """
+        Get the jsonifier for the values of exactly the class from the
+        exact-type table, adding it to the table if it's not there yet.
+        """
+
+        if (jsonify_ := self.exact.get(cls)) is not None:
+            return jsonify_
+
+        jsonify_ = self.resolve(cls)
+        if jsonify_ is None:
+            return self.generic
+
+        self.exact[cls] = jsonify_
+        return jsonify_
+
+    def jsonify_miss(self, value) -> JSON:
+        """
+        Jsonify a value whose type is not in the exact-type table yet,
+        and add the type to the table.
+        """
+
+        cls = type(value)
+        try:
+            self.misses[cls] = self.misses.get(cls, 0) + 1
+        except TypeError:
+            # not weakly referenceable
+            pass
+
+        jsonify_ = self.resolve(cls)
+        if jsonify_ is None:
+            return self.generic(value)
+
+        self.exact[cls] = jsonify_
+        return jsonify_(value)
+
+    def resolve(self, cls: type) -> Callable | None:
+        """
+        Get the jsonifier for the values of exactly the class, or None if
+        the class can't be jsonified.
+        """
+
+        jsonify_ = self.dispatch(cls)
+
+        if (container := container_jsonifiers.get(cls)) is not None and container[1] is jsonify_:
+            return container[0]
+
+        if jsonify_ is generic_jsonify.registry[object]:
+            if dataclasses.is_dataclass(cls):
+                return jsonifications[cls].jsonify
+            return None
+
+        return jsonify_
+
+    def dispatch_misses(self) -> list[tuple[type, int]]:
+        """
+        Get the types that were jsonified without the exact-type table,
+        and how many times, most common first. Each type misses once,
+        until the table is cleared by registering a jsonifier. Types that
+        keep missing can't be jsonified.
+        """
+        return sorted(self.misses.items(), key=lambda item: item[1], reverse=True)
+
+    def dispatch(self, cls: type) -> Callable:
+        """
+        Get the jsonifier registered for the class, or for its closest
+        base class. Falls back to the parent registry.
+        """
+
+        jsonify_ = self.generic.dispatch(cls)
+        if jsonify_ is self.generic.registry[object]:
+            if self.parent is not None:
+                return self.parent.dispatch(cls)
+            if load_registrations(cls):
+                return self.generic.dispatch(cls)
+
+        return jsonify_
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Get the statistics of the dataclass jsonification cache.
+        """
+        return jsonifications.cache_info()
 
     def register(self, type_):
-        return generic_jsonify.register(type_)
+        if isinstance(type_, type):
+            # load the lazy registrations first, so that they don't
+            # override this one
+            load_registrations(type_)
+
+        register = self.generic.register(type_)
+
+        if not isinstance(type_, type):
+            # registered by the annotation of the function
+            clear_exact_tables()
+            return register
+
+        def decorator(func):
+            register(func)
+            clear_exact_tables()
+            return func
+
+        return decorator
+
+    def unsorted_sets(self) -> contextlib.AbstractContextManager:
+        """
+        Jsonify sets in their iteration order in this context, instead of
+        sorting them, when deterministic output is not needed.
+        """
+        return unsorted_sets()
+
+    def register_batch(self, type_: type):
+        """
+        Register a function that jsonifies a list of values of the type
+        at once. It's used for lists and other sequences whose items all
+        have exactly the type, instead of jsonifying each item separately.
+        """
+
+        def decorator(func):
+            self.batches[type_] = func
+            batch_types.add(type_)
+            return func
+
+        return decorator
+
+    def get_batch(self, cls: type) -> Callable | None:
+        """
+        Get the batch jsonifier for the class, or None if there's none.
+        The registrations for single values override the batch
+        jsonifiers of the parent registry.
+        """
+
+        if (batch := self.batches.get(cls)) is not None:
+            return batch
+
+        if self.parent is None or cls in self.generic.registry:
+            return None
+
+        return self.parent.get_batch(cls)
+
+
+def clear_exact_tables() -> None:
+    """
+    Clear the exact-type tables of all the registries, after registering
+    a jsonifier, as it may apply to the subclasses of the registered type
+    and in the registries inheriting it.
+    """
+    for instance in Jsonify.instances:
+        instance.exact.clear()
+
+
+@contextlib.contextmanager
+def unsorted_sets():
+    previous = options.sort_sets
+    options.sort_sets = False
+    try:
+        yield
+    finally:
+        options.sort_sets = previous
 
 
 jsonify = Jsonify()
@@ -24,8 +24,11 @@ class Loads:
     Factory for type-specific loads functions
     """
 
+    def __init__(self, unjsonify_=unjsonify):
+        self.unjsonify = unjsonify_
+
     def __getitem__(self, type_):
-        unjsonify_ = unjsonify[type_]
+        unjsonify_ = self.unjsonify[type_]
         return lambda *args, **kwargs: unjsonify_(json.loads(*args, **kwargs))
 
 
@@ -0,0 +1,108 @@
+"""
+Deferred registration of jsonifiers and unjsonifiers.
+
+Importing the standard library modules that define the supported types,
+and registering their jsonifiers and unjsonifiers, takes time. Instead
+of doing it when jsno is imported, the registrations are loaded when
+a type defined in one of the modules is jsonified or unjsonified for
+the first time.
+
+The jsno modules for builtin types, and for types that would otherwise be
+handled by the registrations of their base classes (IntEnum by int, arrays
+by Sequence), are registered with `register_lazy_types` instead. It
+registers placeholders for the types, which import the jsno module when
+they are first called.
+"""
+
+import importlib
+import threading
+
+from typing import get_origin
+
+
+pending: dict[str, str] = {}
+"""
+Maps the names of (top-level) modules to the names of the jsno modules
+that register the jsonifiers and unjsonifiers for their types.
+"""
+
+lock = threading.RLock()
+
+
+def register_lazy(jsno_module: str, *module_names: str) -> None:
+    """
+    Register a jsno module to be imported when a type defined in any
+    of the given modules is seen for the first time.
+    """
+
+    for module_name in module_names:
+        pending[module_name] = jsno_module
+
+
+def get_module_names(type_) -> set[str]:
+    """
+    Get the names of the top-level modules defining the type and
+    it's base classes.
+    """
+
+    return {
+        getattr(cls, "__module__", "").partition(".")[0]
+        for cls in getattr(type_, "__mro__", (type_,))
+    }
+
+
+def load_registrations(type_) -> bool:
+    """
+    Load the pending registrations for the modules that define the type
+    or any of its base classes. Returns True if there were registrations
+    for the type, so that the caller should retry the dispatch.
+    """
+
+    if not pending:
+        return False
+
+    jsno_modules = {
+        jsno_module
+        for module_name in get_module_names(type_)
+        if (jsno_module := pending.get(module_name))
+    }
+
+    if not jsno_modules:
+        return False
+
+    with lock:
+        for jsno_module in jsno_modules:
+            importlib.import_module(jsno_module)
+
+            # remove the entries only after the registrations are done,
+            # so that concurrent callers wait for the lock
+            for (module_name, name) in list(pending.items()):
+                if name == jsno_module:
+                    del pending[module_name]
+
+    return True
+
+
+def register_lazy_types(jsno_module: str, *types: type) -> None:
+    """
+    Register a jsno module to be imported when a value of any of the
+    given types, or their subclasses, is first jsonified or unjsonified.
+    The module must register its jsonifiers and unjsonifiers for exactly
+    the same types, replacing the placeholders.
+    """
+
+    # imported here, as jsno.jsonify and jsno.unjsonify depend on this module
+    from jsno.jsonify import call_jsonify, jsonify
+    from jsno.unjsonify import active_unjsonify, unjsonify
+
+    def jsonify_lazy(value):
+        importlib.import_module(jsno_module)
+        return call_jsonify(value)
+
+    def unjsonify_factory_lazy(as_type):
+        importlib.import_module(jsno_module)
+        return active_unjsonify().dispatch_factory(get_origin(as_type) or as_type)(as_type)
+
+    for type_ in types:
+        jsonify.register(type_)(jsonify_lazy)
+        unjsonify.register_factory(type_)(unjsonify_factory_lazy)
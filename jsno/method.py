@@ -1,6 +1,9 @@
 """
 Decorator for marking a class so that it will be jsonified by a method
 call: obj.jsonify()
+
+The class may also define the class methods jsonify_many and unjsonify_many
+for converting lists of its instances at once.
 """
 from typing import Any
 
@@ -33,4 +36,10 @@ def jsonify_with_method(cls: type) -> type:
     jsonify.register(cls)(jsonify_with_method_call)
     unjsonify.register(cls)(unjsonify_with_method_call)
 
+    if hasattr(cls, "jsonify_many"):
+        jsonify.register_batch(cls)(cls.jsonify_many)
+
+    if hasattr(cls, "unjsonify_many"):
+        unjsonify.register_batch(cls)(lambda values, as_type: as_type.unjsonify_many(values))
+
     return cls
@@ -0,0 +1,340 @@
+"""
+MessagePack encoding, for compact binary messages:
+
+    data = jsno.packb(value)
+    value = jsno.unpackb[Type](data)
+
+The values are jsonified and unjsonified with the same jsonifiers and
+unjsonifiers as for JSON, except that bytes are represented as binary
+data instead of base64 strings. The registry used for it is available
+as `jsno.msgpack.registry`, for registering MessagePack-specific ones.
+
+Only the standard MessagePack types are supported, not extension types.
+"""
+
+import struct
+
+from typing import IO, Any, Callable, Generic, TypeVar
+
+from jsno.fields_unjsonifier import typecheck
+from jsno.registry import Registry
+
+
+T = TypeVar("T")
+
+CHUNK_SIZE = 65536
+"""Size of the chunks written when packing to a file"""
+
+
+registry = Registry()
+
+
+@registry.jsonify.register(bytes)
+def _(value):
+    return value
+
+
+@registry.jsonify.register(bytearray)
+@registry.jsonify.register(memoryview)
+def _(value):
+    # pass the buffer to the packer without copying it
+    view = memoryview(value)
+    return view.cast("B") if view.c_contiguous else view.tobytes()
+
+
+@registry.unjsonify.register(bytes)
+def _(value, as_type):
+    typecheck(value, (bytes, bytearray, memoryview), as_type)
+    return as_type(value)
+
+
+# encoding
+
+pack_uint8 = struct.Struct(">BB").pack
+pack_uint16 = struct.Struct(">BH").pack
+pack_uint32 = struct.Struct(">BI").pack
+pack_uint64 = struct.Struct(">BQ").pack
+pack_int8 = struct.Struct(">Bb").pack
+pack_int16 = struct.Struct(">Bh").pack
+pack_int32 = struct.Struct(">Bi").pack
+pack_int64 = struct.Struct(">Bq").pack
+pack_float64 = struct.Struct(">Bd").pack
+
+
+def pack_length(out: bytearray, length: int, fix: int | None, fix_limit: int, codes: tuple) -> None:
+    """
+    Write the header of a str, bin, array or map of the given length.
+    """
+
+    if fix is not None and length < fix_limit:
+        out.append(fix | length)
+    elif length < 0x100 and codes[0] is not None:
+        out += pack_uint8(codes[0], length)
+    elif length < 0x10000:
+        out += pack_uint16(codes[1], length)
+    elif length < 0x100000000:
+        out += pack_uint32(codes[2], length)
+    else:
+        raise ValueError(f"Too long to pack: {length}")
+
+
+def pack_int(out: bytearray, value: int) -> None:
+    if 0 <= value < 0x80:
+        out.append(value)
+    elif -0x20 <= value < 0:
+        out.append(value & 0xff)
+    elif value >= 0:
+        if value < 0x100:
+            out += pack_uint8(0xcc, value)
+        elif value < 0x10000:
+            out += pack_uint16(0xcd, value)
+        elif value < 0x100000000:
+            out += pack_uint32(0xce, value)
+        elif value < 0x10000000000000000:
+            out += pack_uint64(0xcf, value)
+        else:
+            raise OverflowError(f"Integer too large to pack: {value}")
+    else:
+        if value >= -0x80:
+            out += pack_int8(0xd0, value)
+        elif value >= -0x8000:
+            out += pack_int16(0xd1, value)
+        elif value >= -0x80000000:
+            out += pack_int32(0xd2, value)
+        elif value >= -0x8000000000000000:
+            out += pack_int64(0xd3, value)
+        else:
+            raise OverflowError(f"Integer too small to pack: {value}")
+
+
+STR_CODES = (0xd9, 0xda, 0xdb)
+BIN_CODES = (0xc4, 0xc5, 0xc6)
+ARRAY_CODES = (None, 0xdc, 0xdd)
+MAP_CODES = (None, 0xde, 0xdf)
+
+
+class Packer:
+    """
+    Encoder of jsonified values. If a file is given, the output is
+    written to it in chunks.
+    """
+
+    def __init__(self, file: IO[bytes] | None = None):
+        self.out = bytearray()
+        self.file = file
+
+    def flush(self) -> None:
+        if self.file is not None and self.out:
+            self.file.write(self.out)
+            self.out.clear()
+
+    def pack(self, value) -> None:
+        out = self.out
+        type_ = type(value)
+
+        if type_ is str:
+            data = value.encode("utf-8")
+            if len(data) < 32:
+                out.append(0xa0 | len(data))
+            else:
+                pack_length(out, len(data), None, 0, STR_CODES)
+            out += data
+        elif type_ is int:
+            if 0 <= value < 0x80:
+                out.append(value)
+            else:
+                pack_int(out, value)
+        elif type_ is float:
+            out += pack_float64(0xcb, value)
+        elif value is None:
+            out.append(0xc0)
+        elif type_ is bool:
+            out.append(0xc3 if value else 0xc2)
+        elif type_ is list or type_ is tuple:
+            pack_length(out, len(value), 0x90, 16, ARRAY_CODES)
+            pack = self.pack
+            if self.file is None:
+                for item in value:
+                    pack(item)
+            else:
+                for item in value:
+                    pack(item)
+                    if len(out) >= CHUNK_SIZE:
+                        self.flush()
+        elif type_ is dict:
+            pack_length(out, len(value), 0x80, 16, MAP_CODES)
+            pack = self.pack
+            for (key, item) in value.items():
+                if type(key) is str and len(key) < 32 and key.isascii():
+                    out.append(0xa0 | len(key))
+                    out += key.encode("ascii")
+                else:
+                    pack(key)
+                pack(item)
+                if self.file is not None and len(out) >= CHUNK_SIZE:
+                    self.flush()
+        elif type_ is bytes or type_ is bytearray or type_ is memoryview:
+            pack_length(out, len(value), None, 0, BIN_CODES)
+            if self.file is not None and len(value) >= CHUNK_SIZE:
+                # write large buffers directly
+                self.flush()
+                self.file.write(value)
+            else:
+                out += value
+        else:
+            raise TypeError(f"Cannot pack value of type {type_.__qualname__}")
+
+
+def packb(value) -> bytes:
+    """
+    Jsonify the value, and encode it as MessagePack.
+    """
+
+    packer = Packer()
+    packer.pack(registry.jsonify(value))
+    return bytes(packer.out)
+
+
+def pack(value, file: IO[bytes]) -> None:
+    """
+    Jsonify the value, and write it to a binary file as MessagePack.
+    """
+
+    packer = Packer(file)
+    packer.pack(registry.jsonify(value))
+    packer.flush()
+
+
+# decoding
+
+FIXED_SIZE: dict[int, tuple[struct.Struct, int]] = {
+    0xca: (struct.Struct(">f"), 4),
+    0xcb: (struct.Struct(">d"), 8),
+    0xcc: (struct.Struct(">B"), 1),
+    0xcd: (struct.Struct(">H"), 2),
+    0xce: (struct.Struct(">I"), 4),
+    0xcf: (struct.Struct(">Q"), 8),
+    0xd0: (struct.Struct(">b"), 1),
+    0xd1: (struct.Struct(">h"), 2),
+    0xd2: (struct.Struct(">i"), 4),
+    0xd3: (struct.Struct(">q"), 8),
+}
+
+LENGTH_SIZE = {
+    0xc4: 1, 0xc5: 2, 0xc6: 4,
+    0xd9: 1, 0xda: 2, 0xdb: 4,
+    0xdc: 2, 0xdd: 4,
+    0xde: 2, 0xdf: 4,
+}
+
+
+class Unpacker:
+    """
+    Decoder of MessagePack data.
+    """
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def read_length(self, size: int) -> int:
+        pos = self.pos
+        self.pos = pos + size
+        if self.pos > len(self.data):
+            raise ValueError("Truncated MessagePack data")
+
+        return int.from_bytes(self.data[pos:self.pos], "big")
+
+    def read_bytes(self, length: int) -> bytes:
+        pos = self.pos
+        self.pos = pos + length
+        if self.pos > len(self.data):
+            raise ValueError("Truncated MessagePack data")
+
+        return self.data[pos:self.pos]
+
+    def unpack(self) -> Any:
+        data = self.data
+        pos = self.pos
+        try:
+            code = data[pos]
+        except IndexError:
+            raise ValueError("Truncated MessagePack data") from None
+
+        pos += 1
+        self.pos = pos
+
+        if code < 0x80:
+            return code
+        elif code >= 0xe0:
+            return code - 0x100
+        elif code >= 0xa0 and code < 0xc0:
+            end = pos + (code & 0x1f)
+            if end > len(data):
+                raise ValueError("Truncated MessagePack data")
+            self.pos = end
+            return data[pos:end].decode("utf-8")
+        elif code < 0x90:
+            unpack = self.unpack
+            return {unpack(): unpack() for _ in range(code & 0x0f)}
+        elif code < 0xa0:
+            unpack = self.unpack
+            return [unpack() for _ in range(code & 0x0f)]
+        elif code == 0xc0:
+            return None
+        elif code == 0xc2:
+            return False
+        elif code == 0xc3:
+            return True
+        elif fixed := FIXED_SIZE.get(code):
+            (format, size) = fixed
+            return format.unpack(self.read_bytes(size))[0]
+        elif length_size := LENGTH_SIZE.get(code):
+            length = self.read_length(length_size)
+            if code <= 0xc6:
+                return self.read_bytes(length)
+            elif code <= 0xdb:
+                return self.read_bytes(length).decode("utf-8")
+            elif code <= 0xdd:
+                return [self.unpack() for _ in range(length)]
+            else:
+                return {self.unpack(): self.unpack() for _ in range(length)}
+
+        raise ValueError(f"Unsupported MessagePack type: 0x{code:02x}")
+
+
+def decode(data) -> Any:
+    """
+    Decode MessagePack data to a (JSON-like) value.
+    """
+
+    unpacker = Unpacker(bytes(data))
+    value = unpacker.unpack()
+    if unpacker.pos != len(unpacker.data):
+        raise ValueError("Extra data after MessagePack value")
+
+    return value
+
+
+class Unpackb(Generic[T]):
+    """
+    Factory for type-specific unpackb functions
+    """
+
+    def __getitem__(self, type_: type[T]) -> Callable[[Any], T]:
+        unjsonify_ = registry.unjsonify[type_]
+        return lambda data: unjsonify_(decode(data))
+
+
+class Unpack(Generic[T]):
+    """
+    Factory for type-specific functions reading MessagePack from a file
+    """
+
+    def __getitem__(self, type_: type[T]) -> Callable[[IO[bytes]], T]:
+        unjsonify_ = registry.unjsonify[type_]
+        return lambda file: unjsonify_(decode(file.read()))
+
+
+unpackb: Unpackb = Unpackb()
+unpack: Unpack = Unpack()
@@ -0,0 +1,234 @@
+"""
+Jsonification and unjsonification for NumPy arrays and scalars.
+
+Arrays are jsonified as (nested) lists, and unjsonified from them in
+bulk. The dtype and the shape can be given with an Array annotation,
+which can also select a base64-encoded raw buffer representation:
+
+    @dataclass
+    class Image:
+        pixels: Annotated[numpy.ndarray, Array(dtype="uint8", shape=(None, None, 3))]
+        weights: Annotated[numpy.ndarray, Array(dtype="float32", encoding="base64")]
+
+The dtype is also taken from annotations like `numpy.typing.NDArray[numpy.float64]`.
+
+Registered when a NumPy type is first seen.
+"""
+
+import base64
+import dataclasses
+
+from typing import Any, Callable, Literal, TypeVar, get_args
+
+import numpy
+
+from jsno.codec import Codec
+from jsno.immutable import register_immutable
+from jsno.jsonify import jsonify
+from jsno.unjsonify import unjsonify, typecheck, UnjsonifyError
+from jsno.utils import JSON
+
+
+# the kinds of arrays inferred from JSON values, accepted for each target kind
+accepted_kinds = {
+    "b": "b",
+    "i": "iu",
+    "u": "iu",
+    "f": "iuf",
+    "c": "iuf",
+}
+
+# the types of JSON values accepted for each target kind
+accepted_types = {
+    "b": {bool},
+    "i": {int},
+    "u": {int},
+    "f": {int, float},
+    "c": {int, float},
+}
+
+
+def get_item_types(value: list, depth: int) -> set[type]:
+    """
+    Get the types of the items of a nested list.
+    """
+
+    if depth <= 1:
+        return set(map(type, value))
+
+    types: set[type] = set()
+    for row in value:
+        types |= get_item_types(row, depth - 1)
+
+    return types
+
+
+def get_dtype(as_type) -> numpy.dtype | None:
+    """
+    Get the dtype from a type like numpy.ndarray[Shape, numpy.dtype[numpy.float64]].
+    """
+
+    args = get_args(as_type)
+    if len(args) == 2 and (dtype_args := get_args(args[1])):
+        if not isinstance(dtype_args[0], TypeVar):
+            return numpy.dtype(dtype_args[0])
+
+    return None
+
+
+def check_shape(array: numpy.ndarray, shape: tuple | None) -> str | None:
+    if shape is None:
+        return None
+
+    if len(shape) != array.ndim or any(
+        expected is not None and expected != actual
+        for (expected, actual) in zip(shape, array.shape)
+    ):
+        return f"expected shape {shape}, got {array.shape}"
+
+    return None
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Array(Codec):
+    """
+    Annotation for NumPy arrays, giving their dtype, shape (None for any
+    length), and encoding: either "list" for nested lists of numbers, or
+    "base64" for an object with the dtype, shape, and the base64-encoded
+    contents of the array.
+    """
+
+    dtype: Any = None
+    shape: tuple[int | None, ...] | None = None
+    encoding: Literal["list", "base64"] = "list"
+
+    def get_jsonify(self, as_type) -> Callable[[Any], JSON]:
+        dtype = numpy.dtype(self.dtype) if self.dtype is not None else get_dtype(as_type)
+        encoding = self.encoding
+
+        def jsonify_array(value) -> JSON:
+            array = numpy.asarray(value, dtype=dtype)
+            if encoding == "base64":
+                return {
+                    "dtype": array.dtype.str,
+                    "shape": list(array.shape),
+                    "data": base64.b64encode(numpy.ascontiguousarray(array).data).decode("ascii"),
+                }
+
+            return jsonify_ndarray(array)
+
+        return jsonify_array
+
+    def get_unjsonify(self, as_type) -> Callable[[JSON], Any]:
+        dtype = numpy.dtype(self.dtype) if self.dtype is not None else get_dtype(as_type)
+        if self.encoding == "base64":
+            return get_unjsonify_base64(as_type, dtype, self.shape)
+        else:
+            return get_unjsonify_list(as_type, dtype, self.shape)
+
+
+def get_unjsonify_list(as_type, dtype: numpy.dtype | None, shape: tuple | None) -> Callable:
+    kinds = accepted_kinds.get(dtype.kind, "") if dtype is not None else "biuf"
+    types = accepted_types.get(dtype.kind, set()) if dtype is not None else {bool, int, float}
+
+    def unjsonify_array(value):
+        typecheck(value, list, as_type)
+
+        try:
+            array = numpy.asarray(value)
+        except ValueError as exc:
+            raise UnjsonifyError(value, as_type, exc.args[0]) from None
+
+        if array.dtype.kind not in kinds and array.size:
+            raise UnjsonifyError(value, as_type, f"cannot accept items of kind {array.dtype.kind!r}")
+
+        if array.dtype.kind != "b" and not get_item_types(value, array.ndim) <= types:
+            # booleans mixed with numbers are cast to numbers
+            raise UnjsonifyError(value, as_type, "unexpected item types")
+
+        if detail := check_shape(array, shape):
+            raise UnjsonifyError(value, as_type, detail)
+
+        if dtype is not None:
+            array = array.astype(dtype, copy=False)
+
+        return array
+
+    return unjsonify_array
+
+
+def get_unjsonify_base64(as_type, dtype: numpy.dtype | None, shape: tuple | None) -> Callable:
+
+    def unjsonify_array(value):
+        typecheck(value, dict, as_type)
+
+        try:
+            value_dtype = numpy.dtype(value["dtype"])
+            value_shape = tuple(value["shape"])
+            data = base64.b64decode(value["data"])
+        except (KeyError, TypeError, ValueError) as exc:
+            raise UnjsonifyError(value, as_type, str(exc)) from None
+
+        if value_dtype.hasobject or (dtype is not None and value_dtype != dtype):
+            raise UnjsonifyError(value, as_type, f"unexpected dtype {value_dtype}")
+
+        try:
+            array = numpy.frombuffer(data, dtype=value_dtype).reshape(value_shape)
+        except ValueError as exc:
+            raise UnjsonifyError(value, as_type, exc.args[0]) from None
+
+        if detail := check_shape(array, shape):
+            raise UnjsonifyError(value, as_type, detail)
+
+        # the array is a read-only view of the decoded bytes, so copy it
+        # to get a writable array, like the ones unjsonified from lists
+        return array.copy()
+
+    return unjsonify_array
+
+
+# the kinds of arrays whose items tolist converts to JSON values
+json_kinds = frozenset("biufU")
+
+
+@jsonify.register(numpy.ndarray)
+def jsonify_ndarray(value):
+    # tolist converts the items to Python scalars, which are jsonified
+    # further unless they are JSON values already (e.g. complex numbers,
+    # dates and bytes)
+    if value.dtype.kind in json_kinds:
+        return value.tolist()
+
+    return jsonify(value.tolist())
+
+
+@jsonify.register(numpy.generic)
+def _(value):
+    return jsonify(value.item())
+
+
+@unjsonify.register_factory(numpy.ndarray)
+def _(as_type):
+    return Array().get_unjsonify(as_type)
+
+
+@unjsonify.register_factory(numpy.generic)
+def _(as_type):
+    kind = numpy.dtype(as_type).kind
+    types = tuple(accepted_types.get(kind, ()))
+
+    def unjsonify_scalar(value):
+        if type(value) not in types:
+            raise UnjsonifyError(value, as_type)
+
+        try:
+            return as_type(value)
+        except (ValueError, OverflowError) as exc:
+            detail = exc.args[0]
+
+        raise UnjsonifyError(value, as_type, detail)
+
+    return unjsonify_scalar
+
+
+register_immutable(numpy.generic)
@@ -0,0 +1,248 @@
+"""
+Packing lists of dataclasses with fixed-size fields into binary records,
+using the struct module:
+
+    data = jsno.pack_many(samples)
+    samples = jsno.unpack_many[Sample](data)
+
+The record layout is derived from the field types:
+
+* int: 64-bit signed integer
+* float: 64-bit float
+* bool: one byte
+* enums with integer values: 64-bit signed integer
+* datetime.date: 32-bit signed integer (the proleptic ordinal)
+* datetime.datetime: 64-bit signed integer (microseconds since the Unix
+  epoch). The datetimes must be timezone-aware, and they are unpacked
+  in UTC.
+* datetime.timedelta: 64-bit signed integer (microseconds)
+
+Layouts for other types can be registered with `register_field_layout`.
+
+The records are packed in little-endian byte order without padding or
+headers, so the packed data is a plain array of records. Unpacking
+accepts any buffer, such as a memoryview or mmap, without copying it.
+"""
+
+import dataclasses
+import enum
+import operator
+import struct
+
+from typing import Any, Callable, Generic, NamedTuple, TypeVar, get_type_hints
+
+from jsno.cache import CodecCache
+from jsno.construction import get_constructor
+from jsno.lazy import load_registrations
+
+
+T = TypeVar("T")
+
+
+class FieldLayout(NamedTuple):
+    format: str
+    encode: Callable | None
+    decode: Callable | None
+
+
+field_layouts: dict[type, FieldLayout] = {
+    bool: FieldLayout("?", None, None),
+    int: FieldLayout("q", None, None),
+    float: FieldLayout("d", None, None),
+}
+
+
+def register_field_layout(
+        type_: type,
+        format: str,
+        encode: Callable | None = None,
+        decode: Callable | None = None,
+
+) -> None:
+
+    """
+    Register the struct format of a field type, and the functions for
+    converting the values to and from the packed values.
+    """
+
+    field_layouts[type_] = FieldLayout(format, encode, decode)
+
+
+def get_field_layout(type_) -> FieldLayout:
+    layout = field_layouts.get(type_)
+    if layout is None and load_registrations(type_):
+        layout = field_layouts.get(type_)
+
+    if layout is not None:
+        return layout
+
+    if isinstance(type_, type) and issubclass(type_, enum.Enum):
+        if all(isinstance(member.value, int) for member in type_):
+            return FieldLayout("q", operator.attrgetter("value"), type_)
+
+    raise TypeError(f"Cannot pack fields of type {type_!r}")
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Layout:
+    """
+    Binary record layout of a dataclass.
+    """
+
+    as_type: type
+    struct: struct.Struct
+    names: tuple[str, ...]
+    encoders: tuple[Callable | None, ...]
+    decoders: tuple[Callable | None, ...]
+
+    @staticmethod
+    def create(as_type: type) -> "Layout":
+        if not dataclasses.is_dataclass(as_type):
+            raise TypeError(f"Cannot pack {as_type!r}: not a dataclass")
+
+        type_hints = get_type_hints(as_type)
+        fields = [field for field in dataclasses.fields(as_type) if field.init]
+        layouts = [get_field_layout(type_hints[field.name]) for field in fields]
+
+        return Layout(
+            as_type=as_type,
+            struct=struct.Struct("<" + "".join(layout.format for layout in layouts)),
+            names=tuple(field.name for field in fields),
+            encoders=tuple(layout.encode for layout in layouts),
+            decoders=tuple(layout.decode for layout in layouts),
+        )
+
+    def get_items(self) -> Callable[[Any], tuple]:
+        """
+        Get a function returning the encoded field values of an object.
+        """
+
+        get_values: Callable[[Any], tuple]
+        if len(self.names) == 1:
+            get_single = operator.attrgetter(self.names[0])
+
+            def get_values(value) -> tuple:
+                return (get_single(value),)
+        else:
+            get_values = operator.attrgetter(*self.names)
+
+        if not any(self.encoders):
+            return get_values
+
+        encoders = self.encoders
+
+        def get_items(value) -> tuple:
+            return tuple(
+                item if encode is None else encode(item)
+                for (item, encode) in zip(get_values(value), encoders)
+            )
+
+        return get_items
+
+    def get_constructor(self) -> Callable[[tuple], Any]:
+        """
+        Get a function that creates an object from the unpacked items.
+        """
+
+        as_type = self.as_type
+        names = self.names
+        decoders = self.decoders
+
+        construct = get_constructor(as_type)
+        if construct is None and not any(
+            field.kw_only for field in dataclasses.fields(as_type) if field.init
+        ):
+            # the items are in the order of the __init__ arguments
+            if not any(decoders):
+                return lambda items: as_type(*items)
+
+            return lambda items: as_type(*(
+                item if decode is None else decode(item)
+                for (item, decode) in zip(items, decoders)
+            ))
+
+        construct_kwargs = construct or (lambda kwargs: as_type(**kwargs))
+
+        if not any(decoders):
+            return lambda items: construct_kwargs(dict(zip(names, items)))
+
+        def construct_decoded(items):
+            return construct_kwargs({
+                name: item if decode is None else decode(item)
+                for (name, item, decode) in zip(names, items, decoders)
+            })
+
+        return construct_decoded
+
+    def pack(self, values: list) -> bytes:
+        size = self.struct.size
+        buffer = bytearray(size * len(values))
+        pack_into = self.struct.pack_into
+        get_items = self.get_items()
+        as_type = self.as_type
+
+        for (index, value) in enumerate(values):
+            if type(value) is not as_type:
+                raise TypeError(f"Cannot pack {value!r} as {as_type.__qualname__}")
+            pack_into(buffer, index * size, *get_items(value))
+
+        return bytes(buffer)
+
+    def unpack(self, buffer) -> list:
+        if len(memoryview(buffer).cast("B")) % self.struct.size:
+            raise ValueError(
+                f"Buffer size is not a multiple of {self.as_type.__qualname__} "
+                f"record size ({self.struct.size})"
+            )
+
+        construct = self.get_constructor()
+        return [construct(items) for items in self.struct.iter_unpack(buffer)]
+
+
+class LayoutCache(CodecCache):
+    """
+    Cache that creates record layouts on demand
+    """
+    def __getitem__(self, key: type) -> Layout:
+        layout = self.get(key)
+        if layout is None:
+            layout = Layout.create(key)
+            self[key] = layout
+
+        return layout
+
+
+layouts = LayoutCache()
+
+
+def get_layout(as_type: type) -> Layout:
+    """
+    Get the binary record layout of a dataclass.
+    """
+    return layouts[as_type]
+
+
+def pack_many(values: list, as_type: type | None = None) -> bytes:
+    """
+    Pack a list of dataclass instances into binary records. The type
+    of the instances is taken from the first item, unless given.
+    """
+
+    if as_type is None:
+        if not values:
+            return b""
+        as_type = type(values[0])
+
+    return layouts[as_type].pack(values)
+
+
+class UnpackMany(Generic[T]):
+    """
+    Factory for type-specific functions unpacking binary records
+    """
+
+    def __getitem__(self, as_type: type[T]) -> Callable[[Any], list[T]]:
+        return layouts[as_type].unpack
+
+
+unpack_many: UnpackMany = UnpackMany()
@@ -0,0 +1,16 @@
+"""
+Jsonification and unjsonification for pathlib.Path
+"""
+
+import pathlib
+
+from jsno.immutable import register_immutable
+from jsno.interning import exact_key
+from jsno.standard import jsonify_as_string
+
+
+jsonify_as_string(pathlib.Path)
+register_immutable(pathlib.PurePath)
+
+# Windows paths that differ in case are equal, but not the same
+exact_key.register(pathlib.PurePath)(lambda value: (type(value), str(value)))
@@ -0,0 +1,101 @@
+"""
+Registries of jsonifiers and unjsonifiers.
+
+The default registry is used by `jsno.jsonify` and `jsno.unjsonify`. Other
+registries inherit its registrations, and can override them without
+affecting the code that uses the default registry:
+
+    api = jsno.Registry()
+
+    @api.jsonify.register(datetime.datetime)
+    def _(value):
+        return int(value.timestamp())
+
+    api.dumps(event)
+
+Each registry has caches of its own. Registering a type only drops
+the cached unjsonifiers that depend on the type, in the registry and
+the registries inheriting from it.
+"""
+
+import functools
+import json
+
+from typing import TYPE_CHECKING
+
+from jsno.jsonify import Jsonify, jsonify
+from jsno.jsonize import Loads, loads
+from jsno.unjsonify import Unjsonify, unjsonify
+
+if TYPE_CHECKING:
+    from jsno.codec import Codec
+    from jsno.deep import DeepJsonify, DeepUnjsonify
+
+
+class Registry:
+    """
+    Jsonify and unjsonify functions with registrations of their own,
+    inheriting the registrations of the parent registry.
+    """
+
+    parent: "Registry | None"
+    jsonify: Jsonify
+    unjsonify: Unjsonify
+    loads: Loads
+
+    def __init__(self, parent: "Registry | None" = None):
+        self.parent = parent or default_registry
+        self.jsonify = Jsonify(parent=self.parent.jsonify)
+        self.unjsonify = Unjsonify(parent=self.parent.unjsonify)
+        self.loads = Loads(self.unjsonify)
+
+    # the deep functions are created when first used, so that jsno.deep
+    # is not imported with the registries
+
+    @functools.cached_property
+    def deep_jsonify(self) -> "DeepJsonify":
+        """
+        Jsonify function for deeply nested values, using this registry's
+        jsonifiers.
+        """
+        import jsno.deep
+        if self.parent is None:
+            return jsno.deep.deep_jsonify
+
+        return jsno.deep.DeepJsonify(self.jsonify)
+
+    @functools.cached_property
+    def deep_unjsonify(self) -> "DeepUnjsonify":
+        """
+        Unjsonify function for deeply nested values, using this registry's
+        unjsonifiers.
+        """
+        import jsno.deep
+        if self.parent is None:
+            return jsno.deep.deep_unjsonify
+
+        return jsno.deep.DeepUnjsonify(self.unjsonify)
+
+    def register_codec(self, type_: type, codec: "Codec") -> None:
+        """
+        Use the codec for all the values of the type in this registry,
+        for example a different wire format:
+
+            api.register_codec(datetime.datetime, Epoch("ms"))
+        """
+        self.jsonify.register(type_)(codec.get_jsonify(type_))
+        self.unjsonify.register_factory(type_)(codec.get_unjsonify)
+
+    def dumps(self, value, **kwargs) -> str:
+        """
+        Turn the argument into JSON, using this registry's jsonifiers.
+        """
+        return json.dumps(self.jsonify(value), **kwargs)
+
+
+# the default registry wraps the module-level jsonify and unjsonify
+default_registry = object.__new__(Registry)
+default_registry.parent = None
+default_registry.jsonify = jsonify
+default_registry.unjsonify = unjsonify
+default_registry.loads = loads
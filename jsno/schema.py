@@ -55,17 +55,32 @@ class Schema(SchemaType):
     def _map_schema_field(self, name: str, type_, default) -> SchemaField:
         """
         Get the SchemaField for given field name, type, and default value.
+        The default value can also be given as a dataclasses.field.
         """
 
+        default_factory = None
+        if isinstance(default, dataclasses.Field):
+            if default.default_factory is not dataclasses.MISSING:
+                default_factory = default.default_factory
+                default = NotRequired
+            elif default.default is not dataclasses.MISSING:
+                default = default.default
+            else:
+                default = Required
+
         return SchemaField(
             name=name,
             json_name=get_property_name(type_, name),
             default=self._resolve_default(type_, default),
+            default_factory=default_factory,
             unjsonify=get_unjsonify_for_field(type_, name),
         )
 
     @functools.cached_property
     def _unjsonifier(self):
+        return self._create_unjsonifier()
+
+    def _create_unjsonifier(self):
         fields = [
             self._map_schema_field(
                 name=key,
@@ -1,30 +1,30 @@
 """
 Jsonification and unjsonification for standard Python types.
 
-* datetime.datetime
-* datetime.date
-* datetime.time
-* datetime.timezone
-* decimal.Decimal
-* pathlib.Path
-* zoneinfo.ZoneInfo
-* enum.Enum
+* None, str, bool, int, float
+* complex
 * ranges
+* re.Pattern
+* types.SimpleNamespace
+
+Bytes, tuples, enums and arrays are handled in jsno.buffers, jsno.tuple,
+jsno.enum and jsno.array, which are imported when the types are first
+seen. The types from other standard library modules are registered lazily
+too, see jsno.lazy.
 
 """
 
+import array
 import dataclasses
-import decimal
 import enum
-import pathlib
 import re
-import uuid
-import zoneinfo
 
 from types import NoneType, SimpleNamespace
 from typing import Any
 
+from jsno.immutable import register_immutable
 from jsno.jsonify import jsonify
+from jsno.lazy import register_lazy_types
 from jsno.unjsonify import unjsonify, typecheck, UnjsonifyError, cast
 
 
@@ -120,57 +120,6 @@ def _(value):
 register_cast_factory(float, (float, int))
 
 
-# enums
-
-
-@jsonify.register(enum.Enum)
-def _(enum):
-    return enum.name
-
-
-@unjsonify.register(enum.Enum)
-def _(value, as_type):
-    typecheck(value, str, as_type)
-    try:
-        return getattr(as_type, value)
-    except AttributeError:
-        pass
-
-    raise UnjsonifyError(value, as_type)
-
-
-# zoneinfo
-
-jsonify_as_string(zoneinfo.ZoneInfo, exceptions=(zoneinfo.ZoneInfoNotFoundError))
-
-# decimal
-
-
-@jsonify.register(decimal.Decimal)
-def _(value):
-    """
-    Always jsnonify Decimal as a string.
-    """
-    return str(value)
-
-
-@unjsonify.register(decimal.Decimal)
-def _(value, as_type):
-    typecheck(value, (str, int), as_type)
-
-    return as_type(value)
-
-
-# pathlib.Path
-
-jsonify_as_string(pathlib.Path)
-
-
-# uuid.UUID
-
-jsonify_as_string(uuid.UUID)
-
-
 # complex numbers
 
 jsonify_as_string(complex)
@@ -213,6 +162,9 @@ def _(value, as_type):
     return re.compile(value)
 
 
+register_immutable(re.Pattern)
+
+
 # types.SimpleNamespace
 
 @jsonify.register(SimpleNamespace)
@@ -224,3 +176,9 @@ def _(value):
 def _(value, as_type):
     typecheck(value, dict, as_type)
     return as_type(**value)
+
+
+register_lazy_types("jsno.array", array.array, memoryview)
+register_lazy_types("jsno.buffers", bytes, bytearray)
+register_lazy_types("jsno.enum", enum.Enum)
+register_lazy_types("jsno.tuple", tuple)
@@ -0,0 +1,279 @@
+"""
+Tabular representations for lists of dataclasses.
+
+Columnar stores the values of each field in a list of their own, so
+that the field names are not repeated for each object:
+
+    {"fields": ["x", "y"], "columns": {"x": [1, 2], "y": [3, 4]}}
+
+Rows stores each object as an array of field values, in the order given
+in the header. The repeated string values can be stored in a string
+table, and replaced in the rows by their indices:
+
+    {"fields": ["x", "kind"], "strings": ["a"], "encoded": [1], "rows": [[1, 0], [2, 0]]}
+"""
+
+import collections.abc
+import dataclasses
+
+from typing import Any, Callable, get_args, get_origin
+
+from jsno.codec import Codec
+from jsno.constraint import get_class_annotations, get_validators, validation
+from jsno.construction import get_constructor
+from jsno.fields_unjsonifier import SchemaField, UnjsonifyError, typecheck, unjsonify_context
+from jsno.jsonify import call_jsonify, jsonifications, jsonify_list
+from jsno.unjsonify import active_unjsonify
+from jsno.utils import JSON
+
+
+def get_row_type(codec: Codec, as_type) -> type:
+    """
+    Get the dataclass from a list[T] type.
+    """
+
+    args = get_args(as_type)
+    if (
+        get_origin(as_type) not in (list, collections.abc.Sequence) or
+        len(args) != 1 or
+        not (isinstance(args[0], type) and dataclasses.is_dataclass(args[0]))
+    ):
+        raise TypeError(f"{type(codec).__name__} requires a list of dataclasses, not {as_type!r}")
+
+    return args[0]
+
+
+def get_row_constructor(row_type: type) -> Callable[[dict], Any]:
+    """
+    Get the function that creates a dataclass instance from a dict
+    of field values.
+    """
+    return get_constructor(row_type) or (lambda kwargs: row_type(**kwargs))
+
+
+def validate_rows(rows: list, validators: list[Callable], value, as_type) -> None:
+    """
+    Check the created dataclass instances with the constraints of the
+    dataclass, as the dataclass unjsonifier does, unless trusted.
+    """
+
+    if not validators or validation.trusted:
+        return
+
+    try:
+        for row in rows:
+            for validate in validators:
+                validate(row)
+    except ValueError as exc:
+        raise UnjsonifyError(value, as_type, exc.args[0]) from None
+
+
+def resolve_row_fields(row_type: type) -> dict[str, SchemaField]:
+    """
+    Get the unjsonifiers of the dataclass's init fields, by JSON name.
+    """
+
+    fields = active_unjsonify().resolve_fields(
+        row_type,
+        [field.name for field in dataclasses.fields(row_type) if field.init],
+    )
+    return {field.json_name: field for field in fields}
+
+
+def get_jsonification(row_type: type, codec: Codec):
+    jsonification = jsonifications[row_type]
+    if jsonification.extra_data_property is not None:
+        raise TypeError(f"{type(codec).__name__} cannot jsonify extra data of {row_type.__qualname__}")
+
+    return jsonification
+
+
+def check_rows(values, row_type: type) -> None:
+    for value in values:
+        if type(value) is not row_type:
+            raise TypeError(f"Cannot jsonify {value!r} as a row of {row_type.__qualname__}")
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Columnar(Codec):
+    """
+    Jsonify a list of dataclasses as an object of columns, one for
+    each field. Every item must be an instance of the same dataclass.
+    """
+
+    def get_jsonify(self, as_type) -> Callable[[Any], JSON]:
+        row_type = get_row_type(self, as_type)
+
+        def jsonify_columnar(values) -> JSON:
+            check_rows(values, row_type)
+            jsonification = get_jsonification(row_type, self)
+
+            columns: dict[str, JSON] = {}
+            for field in jsonification.fields:
+                column = [getattr(value, field.name) for value in values]
+                if field.jsonify is call_jsonify:
+                    columns[field.json_name] = jsonify_list(column)
+                else:
+                    columns[field.json_name] = [field.jsonify(item) for item in column]
+
+            return {"fields": list(columns), "columns": columns}
+
+        return jsonify_columnar
+
+    def get_unjsonify(self, as_type) -> Callable[[JSON], Any]:
+        row_type = get_row_type(self, as_type)
+        fields = resolve_row_fields(row_type)
+        construct = get_row_constructor(row_type)
+        validators = get_validators(get_class_annotations(row_type))
+
+        def unjsonify_columnar(value):
+            typecheck(value, (dict, collections.abc.Mapping), as_type)
+            field_names = value.get("fields")
+            columns = value.get("columns")
+            typecheck(field_names, list, as_type)
+            typecheck(columns, (dict, collections.abc.Mapping), as_type)
+
+            names = []
+            decoded = []
+            for json_name in field_names:
+                field = fields.get(json_name)
+                if field is None:
+                    if unjsonify_context.on_extra_key == "error":
+                        raise UnjsonifyError(value, as_type, f"Unknown field: {json_name!r}")
+                    continue
+
+                column = columns.get(json_name)
+                typecheck(column, list, as_type)
+                if decoded and len(column) != len(decoded[0]):
+                    raise UnjsonifyError(value, as_type, f"Column length mismatch: {json_name!r}")
+
+                unjsonify_ = field.unjsonify
+                names.append(field.name)
+                decoded.append([unjsonify_(item) for item in column])
+
+            try:
+                result = [construct(dict(zip(names, row))) for row in zip(*decoded)]
+            except TypeError as exc:
+                raise UnjsonifyError(value, as_type, exc.args[0]) from None
+
+            validate_rows(result, validators, value, as_type)
+            return result
+
+        return unjsonify_columnar
+
+
+def encode_strings(rows: list[list], column_count: int) -> tuple[list[str], list[int]]:
+    """
+    Replace the values of the columns that contain only strings (or nulls)
+    by their indices in a string table. Returns the string table, and the
+    indices of the encoded columns.
+    """
+
+    table: dict[str, int] = {}
+    encoded = []
+
+    for index in range(column_count):
+        if not any(type(row[index]) is str for row in rows):
+            continue
+        if not all(type(row[index]) is str or row[index] is None for row in rows):
+            continue
+
+        encoded.append(index)
+        for row in rows:
+            if (item := row[index]) is not None:
+                row[index] = table.setdefault(item, len(table))
+
+    return (list(table), encoded)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Rows(Codec):
+    """
+    Jsonify a list of dataclasses as a header listing the fields, and
+    an array of field values for each object. If `strings` is true, the
+    columns containing strings are encoded using a string table. Every
+    item must be an instance of the same dataclass.
+    """
+
+    strings: bool = False
+
+    def get_jsonify(self, as_type) -> Callable[[Any], JSON]:
+        row_type = get_row_type(self, as_type)
+
+        def jsonify_rows(values) -> JSON:
+            check_rows(values, row_type)
+            fields = get_jsonification(row_type, self).fields
+
+            rows = [
+                [field.jsonify(getattr(value, field.name)) for field in fields]
+                for value in values
+            ]
+
+            result: dict[str, Any] = {"fields": [field.json_name for field in fields]}
+            if self.strings:
+                (strings, encoded) = encode_strings(rows, len(fields))
+                if encoded:
+                    result["strings"] = strings
+                    result["encoded"] = encoded
+
+            result["rows"] = rows
+            return result
+
+        return jsonify_rows
+
+    def get_unjsonify(self, as_type) -> Callable[[JSON], Any]:
+        row_type = get_row_type(self, as_type)
+        fields = resolve_row_fields(row_type)
+        construct = get_row_constructor(row_type)
+        validators = get_validators(get_class_annotations(row_type))
+
+        def unjsonify_rows(value):
+            typecheck(value, (dict, collections.abc.Mapping), as_type)
+            field_names = value.get("fields")
+            rows = value.get("rows")
+            strings = value.get("strings", [])
+            encoded = value.get("encoded", [])
+            typecheck(field_names, list, as_type)
+            typecheck(rows, list, as_type)
+            typecheck(strings, list, as_type)
+            typecheck(encoded, list, as_type)
+
+            plan = []
+            for (index, json_name) in enumerate(field_names):
+                field = fields.get(json_name)
+                if field is None:
+                    if unjsonify_context.on_extra_key == "error":
+                        raise UnjsonifyError(value, as_type, f"Unknown field: {json_name!r}")
+                    continue
+
+                plan.append((index, field.name, field.unjsonify, index in encoded))
+
+            result = []
+            for row in rows:
+                typecheck(row, list, as_type)
+                if len(row) != len(field_names):
+                    raise UnjsonifyError(value, as_type, f"Row length mismatch: {row!r}")
+
+                kwargs = {}
+                for (index, name, unjsonify_, is_encoded) in plan:
+                    item = row[index]
+                    if is_encoded and item is not None:
+                        if type(item) is not int or not 0 <= item < len(strings):
+                            raise UnjsonifyError(value, as_type, f"Invalid string index: {item!r}")
+
+                        item = strings[item]
+
+                    kwargs[name] = unjsonify_(item)
+
+                try:
+                    result.append(construct(kwargs))
+                    continue
+                except TypeError as exc:
+                    detail = exc.args[0]
+
+                raise UnjsonifyError(value, as_type, detail)
+
+            validate_rows(result, validators, value, as_type)
+            return result
+
+        return unjsonify_rows
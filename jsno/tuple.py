@@ -1,14 +1,88 @@
+"""
+Jsonification and unjsonification for tuples and NamedTuples.
+
+The unjsonifiers of typed tuples and NamedTuples are specialized per
+position. If the items are of native JSON types (str, int, float, bool)
+and have exactly the expected types, the tuple is constructed directly
+from the JSON array, which makes lists of coordinates and other small
+tuples fast to unjsonify.
+
+NamedTuples are jsonified as arrays by default. The `NamedTupleCodec`
+annotation selects the object form, keyed by the field names:
+
+    @dataclass
+    class Route:
+        start: Annotated[Point, jsno.NamedTupleCodec("object")]  # {"x": 1, "y": 2}
+"""
+
+import dataclasses
 import inspect
 import typing
 
 from collections.abc import Sequence
-from typing import Callable
+from typing import Any, Callable, Literal
+
+from jsno.abc import jsonify_sequence, unjsonify_sequence_factory
+from jsno.cache import CodecCache
+from jsno.codec import Codec
+from jsno.fields_unjsonifier import FieldsUnjsonifier
+from jsno.interning import shared
+from jsno.jsonify import call_jsonify, get_field_jsonify, jsonify, native_types, register_container
+from jsno.property_name import get_property_name
+from jsno.unjsonify import (
+    active_unjsonify, unjsonify, typecheck, ReferThrough, UnjsonifyError, resolve_field_unjsonifiers,
+)
+from jsno.utils import JSON
+
+
+NamedTupleMode = Literal["array", "object"]
+
+# the item types that are used as they are, if the JSON values have them
+native_item_types = {str, int, float, bool}
+
+
+def is_namedtuple(as_type) -> bool:
+    return isinstance(as_type, type) and issubclass(as_type, tuple) and hasattr(as_type, "_fields")
+
+
+def get_unjsonify_items(
+    as_type,
+    item_types: typing.Sequence,
+    unjsonifiers: list[Callable],
+    make: Callable[[typing.Iterable], tuple],
+) -> Callable[[JSON], tuple]:
+    """
+    Create the unjsonifier of a fixed-length tuple, unjsonifying the items
+    of a JSON array with the per-position unjsonifiers. The tuple is made
+    from the list of the unjsonified items by `make`.
+    """
+
+    count = len(unjsonifiers)
+
+    def unjsonify_items(value):
+        typecheck(value, (list, Sequence), as_type)
+
+        if len(value) != count:
+            raise UnjsonifyError(value, as_type, f"Expected {count} items")
+
+        return make([unjsonify_(item) for (unjsonify_, item) in zip(unjsonifiers, value)])
 
-from jsno.abc import unjsonify_sequence_factory
-from jsno.unjsonify import unjsonify, typecheck, UnjsonifyError
+    if not all(item_type in native_item_types for item_type in item_types):
+        return unjsonify_items
 
+    json_types = tuple(item_types)
 
-def unjsonify_typed_factory(as_type: type) -> Callable:
+    def unjsonify_native_items(value):
+        # fast path: the items have the expected types, and can be used as is
+        if type(value) is list and tuple(map(type, value)) == json_types:
+            return make(value)
+
+        return unjsonify_items(value)
+
+    return unjsonify_native_items
+
+
+def unjsonify_typed_factory(as_type) -> Callable:
     arg_types = typing.get_args(as_type)
 
     if arg_types and len(arg_types) == 2 and arg_types[1] is Ellipsis:
@@ -18,22 +92,61 @@ def unjsonify_typed_factory(as_type: type) -> Callable:
 
     # tuple types of the form tuple[int, str, ...] are not supported now
 
+    origin = typing.get_origin(as_type)
+    make = tuple if origin is tuple else origin
+
     unjsonifiers = [unjsonify[type_] for type_ in arg_types]
+    return get_unjsonify_items(as_type, arg_types, unjsonifiers, make)
+
+
+def get_unjsonify_namedtuple(as_type, mode: NamedTupleMode, ref_type=None) -> Callable:
+    """
+    Create the unjsonifier of a typed NamedTuple. Inside a recursive
+    definition, the unjsonifier of `ref_type` (the NamedTuple, possibly
+    annotated) is looked up when it's first called.
+    """
 
-    def specialized(value):
-        if len(value) != len(arg_types):
-            raise UnjsonifyError(value, as_type)
+    registry = active_unjsonify()
+    if as_type in registry._context_stack:
+        return ReferThrough(as_type if ref_type is None else ref_type, registry)
 
-        return as_type(
-            unjsonify_(item)
-            for (item, unjsonify_) in zip(value, unjsonifiers)
-        )
+    fields = resolve_field_unjsonifiers(as_type)
 
-    return specialized
+    if mode == "object":
+        unjsonifier = FieldsUnjsonifier(as_type, fields)
+
+        def unjsonify_object(value):
+            kwargs = unjsonifier.unjsonify_fields(value)
+            try:
+                return as_type(**kwargs)
+            except TypeError as exc:
+                detail = exc.args[0]
+
+            raise UnjsonifyError(value, as_type, detail)
+
+        return shared(unjsonify_object)
+
+    item_types = typing.get_type_hints(as_type, include_extras=True)
+    unjsonifiers = {field.name: field.unjsonify for field in fields}
+
+    return shared(get_unjsonify_items(
+        as_type,
+        [item_types[name] for name in as_type._fields],
+        [unjsonifiers[name] for name in as_type._fields],
+        as_type._make,
+    ))
 
 
 @unjsonify.register_factory(tuple)
 def _(as_type):
+    if is_namedtuple(as_type) and inspect.get_annotations(as_type):
+        return get_unjsonify_namedtuple(as_type, "array")
+
+    # equal tuples can be shared in interning sessions
+    return shared(unjsonify_tuple_factory(as_type))
+
+
+def unjsonify_tuple_factory(as_type):
     """
     Unjsonify tuples. Handles several variants of tuples:
 
@@ -41,37 +154,125 @@ def _(as_type):
     * typed tuple: tuple[int, str, bool]
     * n-ary monotyped tuple: tuple[T, ...]
     * untyped namedtuple
-    * typing.NamedTuple
+
+    typing.NamedTuples are handled by get_unjsonify_namedtuple.
     """
 
     if hasattr(as_type, '__args__'):
         return unjsonify_typed_factory(as_type)
 
-    annotations = inspect.get_annotations(as_type)
-    if annotations:
-        # typing.NamedTuple
+    make = tuple if as_type is tuple else as_type._make
+
+    def specialized_untyped(value):
+        typecheck(value, (list, Sequence), as_type)
+
+        try:
+            return make(value)
+        except TypeError as exc:
+            detail = exc.args[0]
+
+        raise UnjsonifyError(value, as_type, detail)
+
+    return specialized_untyped
+
+
+# jsonification
+
+
+def get_jsonify_namedtuple(as_type, mode: NamedTupleMode) -> Callable[[Any], JSON]:
+    try:
+        type_hints = typing.get_type_hints(as_type, include_extras=True)
+    except NameError:
+        # unresolvable forward references
+        type_hints = {}
 
-        def specialized_typed_namedtuple(value):
-            typecheck(value, (list, Sequence), as_type)
+    jsonifiers = [get_field_jsonify(type_hints.get(name, Any)) for name in as_type._fields]
+
+    if mode == "object":
+        defaults = as_type._field_defaults
+        fields = [
+            (index, json_name, jsonify_, name in defaults and defaults[name] is None)
+            for (index, (name, jsonify_)) in enumerate(zip(as_type._fields, jsonifiers))
+            if (json_name := get_property_name(type_hints.get(name, Any), name))
+        ]
+
+        def jsonify_object(value):
+            return {
+                json_name: jsonify_(value[index])
+                for (index, json_name, jsonify_, optional) in fields
+                if not (optional and value[index] is None)
+            }
+
+        return jsonify_object
+
+    if all(jsonify_ is call_jsonify for jsonify_ in jsonifiers):
+        return jsonify_sequence
+
+    return lambda value: [jsonify_(item) for (jsonify_, item) in zip(jsonifiers, value)]
+
+
+class NamedTupleJsonifierCache(CodecCache):
+    """
+    Cache of the jsonifiers of the NamedTuple classes.
+    """
 
-            if len(annotations) != len(value):
-                raise UnjsonifyError(value, as_type)
+    def __getitem__(self, cls: type) -> Callable:
+        jsonifier = self.get(cls)
+        if jsonifier is None:
+            jsonifier = get_jsonify_namedtuple(cls, "array")
+            self[cls] = jsonifier
 
-            return as_type(*(
-                unjsonify[type_](val)
-                for (val, (_, type_)) in zip(value, annotations.items())
-            ))
+        return jsonifier
+
+
+namedtuple_jsonifiers = NamedTupleJsonifierCache()
+
+
+def jsonify_plain_tuple(value: tuple) -> list[JSON]:
+    if native_types.issuperset(map(type, value)):
+        # no need to jsonify the items one by one
+        return list(value)
+
+    return jsonify_sequence(value)
+
+
+@jsonify.register(tuple)
+def jsonify_tuple(value):
+    cls = type(value)
+    if cls is tuple or not hasattr(cls, "_fields"):
+        return jsonify_plain_tuple(value)
+
+    # fast path: look up the jsonifier directly from the class
+    entry = getattr(cls, namedtuple_jsonifiers.attribute, None)
+    if entry is not None and entry[0] is cls:
+        return entry[1](value)
+
+    return namedtuple_jsonifiers[cls](value)
+
+
+register_container(tuple, jsonify_plain_tuple, jsonify_tuple)
+
+
+def check_namedtuple(as_type) -> None:
+    if not is_namedtuple(as_type):
+        raise TypeError(f"{as_type!r} is not a NamedTuple")
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class NamedTupleCodec(Codec):
+    """
+    Annotation for selecting the wire form of a NamedTuple: "array" for a
+    JSON array of the items, or "object" for a JSON object keyed by the
+    field names. Can be given for a field, or for a registry with
+    Registry.register_codec.
+    """
 
-        return specialized_typed_namedtuple
+    mode: NamedTupleMode = "array"
 
-    else:
-        # untyped tuple
-        def specialized_untyped(value):
-            if as_type is tuple:
-                # just plain tuple
-                return tuple(value)
-            else:
-                # namedtuple
-                return as_type(*value)
+    def get_jsonify(self, as_type) -> Callable[[Any], JSON]:
+        check_namedtuple(as_type)
+        return get_jsonify_namedtuple(as_type, self.mode)
 
-        return specialized_untyped
+    def get_unjsonify(self, as_type) -> Callable[[JSON], Any]:
+        check_namedtuple(as_type)
+        return get_unjsonify_namedtuple(as_type, self.mode, typing.Annotated[as_type, self])
@@ -1,13 +1,11 @@
-import functools
-
-from jsno.unjsonify import unjsonify, resolve_field_unjsonifiers, ReferThrough
+from jsno.unjsonify import active_unjsonify, resolve_field_unjsonifiers, ReferThrough
 from jsno.fields_unjsonifier import create_unjsonifier
 
 
-@functools.cache
 def unjsonify_typeddict_factory(as_type):
-    if as_type in unjsonify._context_stack:
-        return ReferThrough(as_type)
+    registry = active_unjsonify()
+    if as_type in registry._context_stack:
+        return ReferThrough(as_type, registry)
 
     required_keys = as_type.__required_keys__
 
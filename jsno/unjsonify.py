@@ -1,20 +1,26 @@
+import contextlib
 import dataclasses
 import functools
 import threading
+import weakref
 import time
 import types
 
 from collections.abc import Callable, Mapping
 from typing import (
-    Annotated, Any, Union, Literal, NewType, Self, Type, TypeVar, TypeAliasType,
+    Annotated, Any, NamedTuple, Union, Literal, NewType, Self, Type, TypeVar, TypeAliasType,
     get_args, get_origin, get_type_hints,
     Required, NotRequired,
 )
 
+from jsno.cache import CacheInfo, CodecCache
 from jsno.fields_unjsonifier import (
     UnjsonifyError, SchemaField, create_unjsonifier, typecheck, unjsonify_context
 )
-from jsno.constraint import get_validators, get_class_annotations
+from jsno.constraint import get_validators, get_class_annotations, trusted, validation
+from jsno.immutable import is_immutable_type
+from jsno.interning import Categorical, interned, interning, shared
+from jsno.lazy import load_registrations
 
 from jsno.property_name import get_property_name
 from jsno.utils import DictWithoutKey, get_typename, JSON
@@ -24,7 +30,73 @@ T = TypeVar("T")
 
 
 class SchemaType:
-    pass
+    def _create_unjsonifier(self) -> Callable:
+        raise NotImplementedError
+
+
+class Specialization(NamedTuple):
+    """
+    A cached unjsonifier, and the types whose registrations were used
+    in specializing it.
+    """
+    unjsonify: Callable
+    dependencies: frozenset
+
+
+class Unresolved:
+    """
+    Dependency of the unjsonifiers that resolve their dependencies lazily,
+    on the first call. Such unjsonifiers are invalidated by any registration.
+    """
+
+
+class Scope(threading.local):
+    """
+    The thread's specialization state: the registry specializing an
+    unjsonifier, and the dependencies of the unjsonifiers being specialized.
+    """
+
+    registry: "Unjsonify | None" = None
+
+    def __init__(self) -> None:
+        self.dependencies: list[set] = []
+
+
+scope = Scope()
+
+
+def active_unjsonify() -> "Unjsonify":
+    """
+    Get the registry that is specializing unjsonifiers in this thread,
+    or the default one.
+    """
+    return scope.registry or unjsonify
+
+
+def depends_on(dependencies: frozenset, type_) -> bool:
+    """
+    Check if a registration for the type affects an unjsonifier
+    with the given dependencies.
+    """
+
+    for dependency in dependencies:
+        if dependency is type_ or dependency is Unresolved:
+            return True
+
+        if not (isinstance(dependency, type) and isinstance(type_, type)):
+            continue
+
+        try:
+            if issubclass(dependency, type_):
+                return True
+
+            # variant unjsonifiers specialize the subclasses at call-time
+            if get_variantfamily(dependency) and issubclass(type_, dependency):
+                return True
+        except TypeError:
+            return True
+
+    return False
 
 
 def cast(value: Any, as_type: Any) -> Any:
@@ -51,6 +123,12 @@ def cast(value: Any, as_type: Any) -> Any:
 
 @functools.singledispatch
 def unjsonify_factory(as_type):
+    # the factories are dispatched by the origin of parameterized generics
+    if load_registrations(origin := get_origin(as_type) or as_type):
+        factory = unjsonify_factory.dispatch(origin)
+        if factory is not unjsonify_factory.registry[object]:
+            return factory(as_type)
+
     if dataclasses.is_dataclass(as_type):
         return get_unjsonify_dataclass(as_type)
 
@@ -74,11 +152,12 @@ class ReferThrough:
     the call-time, used for handling recursive definitions.
     """
     as_type: type
+    registry: "Unjsonify"
     specialized: Callable | None = None
 
     def __call__(self, value):
         if self.specialized is None:
-            self.specialized = unjsonify[self.as_type]
+            self.specialized = self.registry[self.as_type]
 
         return self.specialized(value)
 
@@ -114,7 +193,8 @@ def resolve_field_unjsonifiers(as_type, field_names=None, required_keys=frozense
             if (type_ := type_hints.get(name))
         ]
 
-    unjsonify._context_stack.add(as_type)
+    context_stack = active_unjsonify()._context_stack
+    context_stack.add(as_type)
     try:
         return [
             SchemaField(
@@ -127,21 +207,69 @@ def resolve_field_unjsonifiers(as_type, field_names=None, required_keys=frozense
             if (json_name := get_property_name(type_, name))
         ]
     finally:
-        unjsonify._context_stack.remove(as_type)
+        context_stack.remove(as_type)
+
+
+def is_shareable(as_type) -> bool:
+    """
+    Check if equal instances of a dataclass can be shared: the instances
+    must be immutable, and compared by all their fields.
+    """
+
+    params = as_type.__dataclass_params__
+    return (
+        params.frozen and
+        params.eq and
+        all(field.compare for field in dataclasses.fields(as_type))
+    )
 
 
 def get_unjsonify_dataclass(as_type):
-    if as_type in unjsonify._context_stack:
-        return ReferThrough(as_type)
+    registry = active_unjsonify()
+    if as_type in registry._context_stack:
+        return ReferThrough(as_type, registry)
+
+    unjsonify_ = create_unjsonify_dataclass(as_type, registry)
+    return shared(unjsonify_) if is_shareable(as_type) else unjsonify_
+
+
+def create_unjsonify_dataclass(as_type, registry: "Unjsonify"):
+    # imported here, as they're not needed for importing jsno
+    from jsno import codegen
+    from jsno.construction import get_constructor
+
+    compiled = codegen.load_unjsonifier(as_type, registry.resolve_fields)
+    if compiled is not None:
+        if scope.dependencies:
+            scope.dependencies[-1].add(Unresolved)
+        return compiled
+
+    construct = get_constructor(as_type)
 
     unjsonifier = create_unjsonifier(
         as_type=as_type,
         fields=resolve_field_unjsonifiers(
             as_type,
-            field_names=[field.name for field in dataclasses.fields(as_type)]
+            field_names=[
+                field.name for field in dataclasses.fields(as_type)
+                # fields with init=False are not read, if bypassing __init__
+                if construct is None or field.init
+            ]
         )
     )
 
+    if construct is not None:
+        def specialized_without_init(value):
+            kwargs = unjsonifier.unjsonify_fields(value)
+            try:
+                return construct(kwargs)
+            except TypeError as exc:
+                detail = exc.args[0]
+
+            raise UnjsonifyError(value, as_type, detail)
+
+        return specialized_without_init
+
     def specialized(value):
         kwargs = unjsonifier.unjsonify_fields(value)
         try:
@@ -154,7 +282,13 @@ def get_unjsonify_dataclass(as_type):
     return specialized
 
 
-def get_unjsonify_variant(as_type: type, family: VariantFamily | OrphanVariant) -> Callable:
+def get_unjsonify_variant(
+        as_type: type,
+        family: VariantFamily | OrphanVariant,
+        registry: "Unjsonify",
+
+) -> Callable:
+
     """
     Get the unjsonify function specialized for a variant family
     """
@@ -181,7 +315,8 @@ def get_unjsonify_variant(as_type: type, family: VariantFamily | OrphanVariant)
                 raise UnjsonifyError(value, as_type, f"not subclass of {as_type}: {label}")
 
             include_label = family.includes_label(variant_type)
-            unjsonify_variant = unjsonify.specialize(variant_type)
+            with registry.specializing():
+                unjsonify_variant = registry.specialize(variant_type)
             cache[label] = (unjsonify_variant, include_label)
         else:
             (unjsonify_variant, include_label) = entry
@@ -208,14 +343,6 @@ def get_unjsonify_literal(as_type: type) -> Callable:
     return specialized
 
 
-def unjsonify_self(value):
-    self_type = unjsonify_context.self_type
-    if self_type is None:
-        raise TypeError("Self used without context")
-
-    return unjsonify[self_type](value)
-
-
 def get_validating_unjsonify(
         as_type: type,
         unjsonify: Callable,
@@ -230,29 +357,78 @@ def get_validating_unjsonify(
     if not validators:
         return unjsonify
 
-    def specialized(value):
-        result = unjsonify(value)
-        for validate in validators:
+    if len(validators) == 1:
+        [validate] = validators
+
+        def specialized_single(value):
+            result = unjsonify(value)
+            if validation.trusted:
+                return result
+
             try:
                 validate(result)
-                continue
+                return result
             except ValueError as exc:
                 detail = exc.args[0]
 
             raise UnjsonifyError(value, as_type, detail)
 
-        return result
+        return specialized_single
+
+    def specialized(value):
+        result = unjsonify(value)
+        if validation.trusted:
+            return result
+
+        try:
+            for validate in validators:
+                validate(result)
+            return result
+        except ValueError as exc:
+            detail = exc.args[0]
+
+        raise UnjsonifyError(value, as_type, detail)
 
     return specialized
 
 
-@dataclasses.dataclass
 class Unjsonify:
-    def __init__(self) -> None:
-        self._cache: dict[type, Callable] = {}
+    def __init__(self, parent: "Unjsonify | None" = None) -> None:
+        self.parent = parent
+        self._factories = (
+            unjsonify_factory if parent is None
+            else functools.singledispatch(self._inherited_factory)
+        )
+        self._children: weakref.WeakSet[Unjsonify] = weakref.WeakSet()
+        self._cache: CodecCache = CodecCache()
         self._lock: threading.RLock = threading.RLock()
         self._context_stack: set[type] = set()
         self._delay: int = 0
+        self._memo_sizes: dict[type, int] = {}
+        self._batches: dict[type, Callable] = {}
+        self._memos: dict[type, Any] = {}
+
+        self._cache.pin(JSON, Specialization(lambda it: it, frozenset()))
+        self._cache.pin(Self, Specialization(self.unjsonify_self, frozenset()))
+
+        if parent is not None:
+            parent._children.add(self)
+
+    def _inherited_factory(self, as_type):
+        assert self.parent is not None
+        return self.parent.dispatch_factory(as_type)(as_type)
+
+    def dispatch_factory(self, type_) -> Callable:
+        """
+        Get the unjsonifier factory registered for the type, or for
+        its closest base class. Falls back to the parent registry.
+        """
+
+        factory = self._factories.dispatch(type_)
+        if self.parent is not None and factory is self._factories.registry[object]:
+            return self.parent.dispatch_factory(type_)
+
+        return factory
 
     def specialize(self, type_) -> Callable:
         if isinstance(type_, NewType):
@@ -261,6 +437,10 @@ class Unjsonify:
         if isinstance(type_, TypeAliasType):
             type_ = type_.__value__
 
+        if isinstance(origin := get_origin(type_), TypeAliasType):
+            # parameterized generic type alias
+            type_ = origin.__value__[get_args(type_)]
+
         if origin := get_origin(type_):
             # special cases needed for constructs in typing module, as
             # singledispatch fails cannot handle Union and Literal
@@ -272,11 +452,14 @@ class Unjsonify:
             # covers list[X], dict[K,V], etc.
 
         try:
-            factory = unjsonify_factory.dispatch(origin or type_)
+            factory = self.dispatch_factory(origin or type_)
         except TypeError:
             typename = get_typename(type(type_))
             raise TypeError(f"Cannot unjsonify as {repr(type_)} of type {typename}")
 
+        if scope.dependencies:
+            scope.dependencies[-1].add(origin or type_)
+
         unjsonify_ = factory(type_)
 
         if isinstance(type_, type):
@@ -286,27 +469,56 @@ class Unjsonify:
             return unjsonify_
 
     def _dispatch(self, type_) -> Callable:
-        if isinstance(type_, type) and (family := get_variantfamily(type_)):
-            return get_unjsonify_variant(type_, family)
+        if isinstance(type_, SchemaType):
+            return type_._create_unjsonifier()
+        elif isinstance(type_, type) and (family := get_variantfamily(type_)):
+            scope.dependencies[-1].add(type_)
+            return get_unjsonify_variant(type_, family, self)
         else:
             return self.specialize(type_)
 
+    @contextlib.contextmanager
+    def specializing(self):
+        """
+        Make this registry specialize the unjsonifiers looked up from the
+        default registry, for example by the unjsonifier factories. Yields
+        the set that collects the dependencies of the specialized unjsonifiers.
+        """
+
+        previous = scope.registry
+        scope.registry = self
+        scope.dependencies.append(set())
+        try:
+            yield scope.dependencies[-1]
+        finally:
+            scope.dependencies.pop()
+            scope.registry = previous
+
     def __getitem__(self, type_: Type[T]) -> Callable[[JSON], T]:
         """
         Return the unjsonify function specialized for the given type.
         """
 
-        try:
-            unjsonify = self._cache.get(type_)
-        except TypeError:
-            if isinstance(type_, SchemaType):
-                return type_._unjsonifier
-            else:
-                return self._dispatch(type_)
+        registry = scope.registry
+        if registry is not None and registry is not self:
+            # another registry is specializing an unjsonifier, so the
+            # types it depends on are resolved in that registry
+            return registry[type_]
+
+        if isinstance(type_, SchemaType) and self.parent is None:
+            # schemas cache their default unjsonifiers themselves
+            return type_._unjsonifier
+
+        entry = self._cache.get(type_)
+        if entry is None:
+            entry = self._create(type_)
+
+        if scope.dependencies:
+            scope.dependencies[-1].update(entry.dependencies)
 
-        if unjsonify is not None:
-            return unjsonify
+        return entry.unjsonify
 
+    def _create(self, type_) -> Specialization:
         try:
             # first do a non-blocking lock
             acquired = self._lock.acquire(blocking=False)
@@ -316,31 +528,62 @@ class Unjsonify:
 
                 # check again if the another thread has initialized the
                 # unjsonifier already
-                if unjsonify := self._cache.get(type_):
-                    return unjsonify
+                if (entry := self._cache.get(type_)) is not None:
+                    return entry
 
-            if get_origin(type_) is Annotated:
-                args = get_args(type_)
-                real_type = args[0]
-                validators = get_validators(args[1:])
+            with self.specializing() as dependencies:
+                if get_origin(type_) is Annotated:
+                    from jsno.codec import Codec
+                    args = get_args(type_)
+                    real_type = args[0]
+                    validators = get_validators(args[1:])
 
-                return get_validating_unjsonify(real_type, self[real_type], validators)
+                    if codec := Codec.get_annotation(type_):
+                        unjsonify = codec.get_unjsonify(real_type)
+                    else:
+                        unjsonify = self[real_type]
+
+                    if Categorical.get_annotation(type_):
+                        unjsonify = interned(unjsonify)
+
+                    unjsonify = get_validating_unjsonify(real_type, unjsonify, validators)
+                else:
+                    unjsonify = self._dispatch(type_)
+
+                    if isinstance(type_, type) and (maxsize := self.get_memo_size(type_)):
+                        unjsonify = self._memoized(type_, unjsonify, maxsize)
+
+            entry = Specialization(unjsonify, frozenset(dependencies))
 
-            unjsonify = self._dispatch(type_)
             if isinstance(unjsonify, ReferThrough):
                 # Don't cache ReferThroughts
-                return unjsonify
+                return entry
 
             if self._delay:
                 # only for concurrency testing
                 time.sleep(self._delay)
 
-            self._cache[type_] = unjsonify
-            return unjsonify
+            self._cache[type_] = entry
+            return entry
 
         finally:
             self._lock.release()
 
+    def resolve_fields(self, as_type, field_names=None) -> list[SchemaField]:
+        """
+        Resolve the field unjsonifiers of a class in this registry.
+        """
+
+        with self._lock, self.specializing():
+            return resolve_field_unjsonifiers(as_type, field_names)
+
+    def unjsonify_self(self, value):
+        self_type = unjsonify_context.self_type
+        if self_type is None:
+            raise TypeError("Self used without context")
+
+        return self[self_type](value)
+
     def register(self, type_):
         def decorator(func):
             @self.register_factory(type_)
@@ -361,11 +604,124 @@ class Unjsonify:
         return decorator
 
     def register_factory(self, type_):
-        self._cache.clear()
-        self._cache[JSON] = lambda it: it
-        self._cache[Self] = unjsonify_self
+        if isinstance(type_, type):
+            # load the lazy registrations first, so that they don't
+            # override this one
+            load_registrations(type_)
+
+        register = self._factories.register(type_)
+
+        def decorator(factory):
+            register(factory)
+            self.invalidate(type_)
+            return factory
+
+        return decorator
+
+    def register_batch(self, type_: type):
+        """
+        Register a function that unjsonifies a list of JSON values as the
+        type at once: func(values, as_type) -> list. It's used for lists and
+        other sequences of the type, instead of unjsonifying each item
+        separately. The function may raise ValueError for invalid values.
+        """
+
+        def decorator(func):
+            self._batches[type_] = func
+            self.invalidate(type_)
+            return func
+
+        return decorator
+
+    def get_batch(self, type_) -> Callable | None:
+        """
+        Get the batch unjsonifier for the type, or None if there's none.
+        The registrations for single values override the batch
+        unjsonifiers of the parent registry.
+        """
+
+        if not isinstance(type_, type):
+            return None
+
+        if scope.dependencies:
+            scope.dependencies[-1].add(type_)
+
+        if (batch := self._batches.get(type_)) is not None:
+            return batch
+
+        if self.parent is None or type_ in self._factories.registry:
+            return None
+
+        return self.parent.get_batch(type_)
+
+    def invalidate(self, type_) -> None:
+        """
+        Drop the cached unjsonifiers that depend on the registrations
+        for the type, in this registry and the registries inheriting it.
+        """
+
+        self._cache.invalidate(lambda entry: depends_on(entry.dependencies, type_))
+
+        for child in list(self._children):
+            child.invalidate(type_)
+
+    def memoize(self, type_: type, maxsize: int = 1024) -> None:
+        """
+        Cache the results of unjsonifying strings and integers as the type,
+        so that the repeated values are parsed only once. The type must be
+        immutable, as the results are shared. Setting maxsize to 0 disables
+        the memoization.
+        """
+
+        if maxsize and not is_immutable_type(type_):
+            raise TypeError(f"Cannot memoize mutable type {get_typename(type_)}")
+
+        self._memo_sizes[type_] = maxsize
+        self.invalidate(type_)
+
+    def get_memo_size(self, type_) -> int:
+        """
+        Get the size of the memo for the type, or 0 if not memoized.
+        """
 
-        return unjsonify_factory.register(type_)
+        if (maxsize := self._memo_sizes.get(type_)) is not None:
+            return maxsize
+
+        return self.parent.get_memo_size(type_) if self.parent is not None else 0
+
+    def _memoized(self, type_, unjsonify: Callable, maxsize: int) -> Callable:
+        memo = functools.lru_cache(maxsize=maxsize, typed=True)(unjsonify)
+        self._memos[type_] = memo
+
+        def unjsonify_memoized(value):
+            if type(value) is str or type(value) is int:
+                return memo(value)
+            return unjsonify(value)
+
+        return unjsonify_memoized
+
+    def memo_info(self, type_):
+        """
+        Get the hit and miss statistics of the memo for the type, or None
+        if the type has not been unjsonified with a memo.
+        """
+
+        memo = self._memos.get(type_)
+        return memo.cache_info() if memo is not None else None
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Get the statistics of the unjsonifier cache.
+        """
+        return self._cache.cache_info()
+
+    def set_cache_size(self, maxsize: int) -> None:
+        """
+        Set the maximum number of cached unjsonifiers for types that are
+        not classes, such as parameterized generics and Annotated types.
+        Unjsonifiers for classes are released with the class.
+        """
+        self._cache.resize(maxsize)
 
     def context(self, **kwargs):
         return unjsonify_context(**kwargs)
@@ -373,6 +729,20 @@ class Unjsonify:
     def ignore_extra_keys(self):
         return self.context(on_extra_key="ignore")
 
+    def trusted(self) -> contextlib.AbstractContextManager:
+        """
+        Skip evaluating the constraints in this context, for data that
+        is known to be valid, such as data written by this application.
+        """
+        return trusted()
+
+    def interning(self, keys: bool = False, objects: bool = True, maxsize: int = 1_000_000):
+        """
+        Share the repeated strings and immutable objects unjsonified in
+        the context. See jsno.interning.
+        """
+        return interning(keys=keys, objects=objects, maxsize=maxsize)
+
 
 unjsonify = Unjsonify()
 
@@ -0,0 +1,14 @@
+"""
+Jsonification and unjsonification for uuid.UUID
+"""
+
+import uuid
+
+from jsno.immutable import register_immutable
+from jsno.interning import exact_key
+from jsno.standard import jsonify_as_string
+
+
+jsonify_as_string(uuid.UUID)
+register_immutable(uuid.UUID)
+exact_key.register(uuid.UUID)(lambda value: (type(value), value.int))
@@ -0,0 +1,16 @@
+"""
+Jsonification and unjsonification for zoneinfo.ZoneInfo
+"""
+
+import zoneinfo
+
+from jsno.immutable import register_immutable
+from jsno.interning import exact_key
+from jsno.standard import jsonify_as_string
+from jsno.unjsonify import unjsonify
+
+
+jsonify_as_string(zoneinfo.ZoneInfo, exceptions=(zoneinfo.ZoneInfoNotFoundError))
+register_immutable(zoneinfo.ZoneInfo)
+exact_key.register(zoneinfo.ZoneInfo)(lambda value: (type(value), value))
+unjsonify.memoize(zoneinfo.ZoneInfo, maxsize=256)
@@ -0,0 +1,94 @@
+import dataclasses
+import sys
+
+from jsno import jsonify, unjsonify
+from jsno.deep import deep_jsonify, deep_unjsonify
+from performance.utils import measure_time
+from tests.test_ast_example import Add, Expression, LiteralInt, Multiply, Reference
+
+
+@dataclasses.dataclass
+class Node:
+    name: str
+    children: list["Node"]
+
+
+def deep_expression(depth):
+    expression = LiteralInt(0)
+    for i in range(depth):
+        if i % 2:
+            expression = Add(LiteralInt(i), expression)
+        else:
+            expression = Multiply(expression, Reference("x"))
+
+    return expression
+
+
+def deep_node(depth):
+    node = Node("leaf", [])
+    for i in range(depth):
+        node = Node(f"node{i}", [node])
+
+    return node
+
+
+def wide_node(depth):
+    if depth == 0:
+        return Node("leaf", [])
+
+    return Node(f"node{depth}", [wide_node(depth - 1), wide_node(depth - 1)])
+
+
+def measure(function, *args, rounds=5):
+    """
+    Get the best time of calling the function in milliseconds, and
+    its result. Recursion errors are reported as None.
+    """
+
+    best = None
+    result = None
+    for _ in range(rounds):
+        try:
+            with measure_time() as time:
+                result = function(*args)
+        except RecursionError:
+            return (None, None)
+
+        best = time.total if best is None else min(best, time.total)
+
+    return (best / 1000, result)
+
+
+def format_time(total):
+    return "RecursionError" if total is None else f"{total:>8.2f} ms"
+
+
+def measure_case(name, value, as_type):
+    (jsonify_time, jsonified) = measure(jsonify, value)
+    (deep_jsonify_time, deep_jsonified) = measure(deep_jsonify, value)
+    (unjsonify_time, _) = measure(unjsonify[as_type], deep_jsonified)
+    (deep_unjsonify_time, _) = measure(deep_unjsonify[as_type], deep_jsonified)
+
+    print(
+        f"{name:<28}"
+        f" | jsonify {format_time(jsonify_time):>14} -> deep {format_time(deep_jsonify_time):>14}"
+        f" | unjsonify {format_time(unjsonify_time):>14} -> deep {format_time(deep_unjsonify_time):>14}"
+    )
+
+
+def main(depth=10_000):
+    depth = int(depth)
+
+    # the recursive functions need a large recursion limit for the deep trees
+    sys.setrecursionlimit(20 * depth + 1000)
+
+    measure_case("Expression, depth 500", deep_expression(500), Expression)
+    measure_case("Node chain, depth 500", deep_node(500), Node)
+
+    measure_case(f"Expression, depth {depth}", deep_expression(depth), Expression)
+    measure_case(f"Node chain, depth {depth}", deep_node(depth), Node)
+    measure_case("Node tree, depth 13", wide_node(13), Node)
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
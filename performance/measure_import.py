@@ -0,0 +1,109 @@
+"""
+Measure the time it takes to import jsno, by running the import in
+fresh interpreters. Also prints the slowest modules imported, as
+reported by `python -X importtime`, and checks the import time against
+the reference time.
+"""
+
+import statistics
+import subprocess
+import sys
+
+from performance.utils import measure_time
+
+
+REFERENCE_MS = 41.9
+"""
+Median `-X importtime` cumulative time of jsno on the reference machine,
+when the registrations of the standard library types were first made
+lazy. Pass the reference measured on another machine to main.
+"""
+
+
+def measure_import(n):
+    with measure_time() as total_time:
+        for _ in range(n):
+            subprocess.run([sys.executable, "-c", "import jsno"], check=True)
+
+    with measure_time() as baseline_time:
+        for _ in range(n):
+            subprocess.run([sys.executable, "-c", "pass"], check=True)
+
+    # measured times are in microseconds
+    per_import = (total_time.total - baseline_time.total) / n / 1000
+    print(f'import jsno {per_import:>8.2f} ms (interpreter start up excluded)')
+
+
+def parse_importtime(output):
+    """
+    Parse the output of -X importtime into (module, self, cumulative) tuples
+    of the modules imported by importing jsno. Times are in microseconds.
+    """
+
+    entries = []
+
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        (self_us, cumulative_us, module) = line.removeprefix("import time:").split("|")
+        if not module.startswith("  "):
+            # a top-level import. Its dependencies are listed before it
+            if module.strip() == "jsno":
+                return entries + [("jsno", int(self_us), int(cumulative_us))]
+            entries = []
+            continue
+
+        entries.append((module.strip(), int(self_us), int(cumulative_us)))
+
+    return []
+
+
+def run_importtime() -> list[tuple[str, int, int]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import jsno"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    return parse_importtime(result.stderr)
+
+
+def report_importtime(count=15):
+    entries = run_importtime()
+    jsno_total = sum(cumulative for (module, _, cumulative) in entries if module == "jsno")
+
+    print(f'-X importtime: jsno {jsno_total / 1000:.2f} ms cumulative')
+    for (module, self_us, cumulative_us) in sorted(entries, key=lambda it: -it[2])[1:count]:
+        print(f'  {module:<36} self {self_us / 1000:>6.2f} ms cumulative {cumulative_us / 1000:>6.2f} ms')
+
+
+def check_importtime(n, reference_ms) -> bool:
+    """
+    Check that the median cumulative import time of jsno is not above
+    the reference time.
+    """
+
+    totals = [
+        cumulative
+        for _ in range(n)
+        for (module, _, cumulative) in run_importtime()
+        if module == "jsno"
+    ]
+    median_ms = statistics.median(totals) / 1000
+
+    ok = median_ms <= reference_ms
+    print(f'-X importtime: jsno {median_ms:.2f} ms median, reference {reference_ms:.2f} ms: {"ok" if ok else "SLOWER"}')
+    return ok
+
+
+def main(n=20, reference_ms=REFERENCE_MS):
+    n = int(n)
+    measure_import(n)
+    report_importtime()
+    return 0 if check_importtime(n, float(reference_ms)) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(*sys.argv[1:]))
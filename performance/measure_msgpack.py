@@ -0,0 +1,84 @@
+"""
+Compare the MessagePack encoding with JSON:
+
+    python -m performance.measure_msgpack [N]
+"""
+
+import dataclasses
+import sys
+
+import jsno
+
+from performance.utils import measure_time
+from tests.test_dataclasses import Box, Brick, Color, Material
+
+
+def measure_case(name, value, as_type):
+    with measure_time() as dumps_time:
+        text = jsno.dumps(value)
+
+    with measure_time() as loads_time:
+        jsno.loads[as_type](text)
+
+    with measure_time() as packb_time:
+        data = jsno.packb(value)
+
+    with measure_time() as unpackb_time:
+        jsno.unpackb[as_type](data)
+
+    print(
+        f'{name:<24}'
+        f' | dumps {dumps_time.total / 1000:>7.1f} ms {len(text):>9} bytes'
+        f' | loads {loads_time.total / 1000:>7.1f} ms'
+        f' | packb {packb_time.total / 1000:>7.1f} ms {len(data):>9} bytes'
+        f' | unpackb {unpackb_time.total / 1000:>7.1f} ms'
+    )
+
+
+@dataclasses.dataclass
+class Record:
+    name: str
+    counter: int
+    enabled: bool
+    number: float
+
+
+@dataclasses.dataclass
+class Attachment:
+    name: str
+    data: bytes
+
+
+def main(n=10000):
+    n = int(n)
+
+    box = Box(
+        name="Example box",
+        width=100.1,
+        height=99.8,
+        bricks=[
+            Brick(width=3, height=2, color=color, material=material)
+            for color in Color
+            for material in list(Material) + [None]
+        ]
+    )
+
+    for _ in range(3):
+        print()
+        print(f'N = {n}')
+
+        measure_case(
+            "Records",
+            [Record(name="item", counter=2014123, enabled=False, number=132.1)] * n,
+            list[Record],
+        )
+        measure_case("Dataclasses", [box] * (n // 10), list[Box])
+        measure_case(
+            "Binary data",
+            [Attachment(name="file", data=bytes(range(256)) * 4)] * (n // 10),
+            list[Attachment],
+        )
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
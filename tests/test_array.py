@@ -0,0 +1,88 @@
+import array
+
+from dataclasses import dataclass
+from typing import Annotated
+
+import pytest
+
+import jsno
+from jsno import UnjsonifyError
+
+
+def test_jsonify_array():
+    assert jsno.jsonify(array.array("q", [1, 2, 3])) == [1, 2, 3]
+    assert jsno.jsonify(array.array("d", [1.5, 2.5])) == [1.5, 2.5]
+
+
+def test_jsonify_memoryview():
+    assert jsno.jsonify(memoryview(array.array("i", [1, 2]))) == [1, 2]
+    assert jsno.jsonify(memoryview(b"abc")) == jsno.jsonify(b"abc")
+
+
+def test_unjsonify_array():
+    value = jsno.unjsonify[array.array[int]]([1, 2, 3])
+    assert value == array.array("q", [1, 2, 3])
+
+    value = jsno.unjsonify[array.array[float]]([1, 2.5])
+    assert value == array.array("d", [1.0, 2.5])
+
+    assert jsno.unjsonify[array.array]([1, 2]).typecode == "q"
+    assert jsno.unjsonify[array.array]([1, 2.5]).typecode == "d"
+
+
+def test_unjsonify_array_rejects_invalid_items():
+    with pytest.raises(UnjsonifyError):
+        jsno.unjsonify[array.array[int]]([1, 2.5])
+
+    with pytest.raises(UnjsonifyError):
+        jsno.unjsonify[array.array[float]]([1.5, True])
+
+    with pytest.raises(UnjsonifyError):
+        jsno.unjsonify[array.array[int]]("123")
+
+    with pytest.raises(UnjsonifyError):
+        jsno.unjsonify[array.array[int]]([2 ** 64])
+
+
+def test_packed_list():
+    value = jsno.unjsonify[Annotated[list[float], jsno.packed]]([1.0, 2.0])
+    assert value == array.array("d", [1.0, 2.0])
+
+    value = jsno.unjsonify[Annotated[list[int], jsno.Packed("H")]]([1, 2])
+    assert value == array.array("H", [1, 2])
+
+    with pytest.raises(UnjsonifyError):
+        jsno.unjsonify[Annotated[list[int], jsno.Packed("H")]]([-1])
+
+    with pytest.raises(TypeError):
+        jsno.unjsonify[Annotated[list[str], jsno.packed]]
+
+
+def test_packed_memoryview():
+    value = jsno.unjsonify[Annotated[memoryview, jsno.Packed("f")]]([1.5, 2.5])
+    assert value.format == "f"
+    assert value.tolist() == [1.5, 2.5]
+
+
+def test_unjsonify_memoryview():
+    assert jsno.unjsonify[memoryview](jsno.jsonify(b"abc")).tobytes() == b"abc"
+    assert jsno.unjsonify[memoryview]([1, 2]).tolist() == [1, 2]
+
+
+@dataclass
+class Series:
+    name: str
+    samples: Annotated[list[float], jsno.packed]
+    counts: array.array[int]
+
+
+def test_dataclass_with_arrays():
+    value = Series("x", array.array("d", [1.0, 2.0]), array.array("q", [3]))
+    json = jsno.jsonify(value)
+    assert json == {"name": "x", "samples": [1.0, 2.0], "counts": [3]}
+    assert jsno.unjsonify[Series](json) == value
+
+
+def test_msgpack_memoryview():
+    data = jsno.packb(memoryview(b"abc"))
+    assert jsno.unpackb[memoryview](data).tobytes() == b"abc"
@@ -0,0 +1,132 @@
+import decimal
+
+from dataclasses import dataclass
+
+import pytest
+
+import jsno
+from jsno import Registry, UnjsonifyError
+
+
+calls = []
+
+
+@jsno.jsonify_with_method
+@dataclass(frozen=True)
+class Money:
+    cents: int
+
+    def jsonify(self):
+        calls.append("jsonify")
+        return f"{self.cents / 100:.2f}"
+
+    @classmethod
+    def unjsonify(cls, value):
+        calls.append("unjsonify")
+        return cls(round(decimal.Decimal(value) * 100))
+
+    @classmethod
+    def jsonify_many(cls, values):
+        calls.append("jsonify_many")
+        return [f"{value.cents / 100:.2f}" for value in values]
+
+    @classmethod
+    def unjsonify_many(cls, values):
+        calls.append("unjsonify_many")
+        return [cls(round(decimal.Decimal(value) * 100)) for value in values]
+
+
+@dataclass
+class Invoice:
+    lines: list[Money]
+    total: Money
+
+
+def test_method_batch():
+    calls.clear()
+
+    invoice = Invoice(lines=[Money(100), Money(250)], total=Money(350))
+    json = jsno.jsonify(invoice)
+
+    assert json == {"lines": ["1.00", "2.50"], "total": "3.50"}
+    assert jsno.unjsonify[Invoice](json) == invoice
+    assert sorted(calls) == ["jsonify", "jsonify_many", "unjsonify", "unjsonify_many"]
+
+
+def test_mixed_list_is_jsonified_item_by_item():
+    calls.clear()
+    assert jsno.jsonify([Money(100), 1]) == ["1.00", 1]
+    assert calls == ["jsonify"]
+
+
+def test_batch_for_tuples():
+    calls.clear()
+    assert jsno.jsonify((Money(100), Money(200))) == ["1.00", "2.00"]
+    assert jsno.unjsonify[tuple[Money, ...]](["1.00", "2.00"]) == (Money(100), Money(200))
+    assert calls == ["jsonify_many", "unjsonify_many"]
+
+
+@dataclass(frozen=True)
+class GeoPoint:
+    lat: float
+    lon: float
+
+
+def test_registry_batch():
+    registry = Registry()
+
+    @registry.jsonify.register_batch(GeoPoint)
+    def _(values):
+        return {"lat": [value.lat for value in values], "lon": [value.lon for value in values]}
+
+    @registry.unjsonify.register_batch(GeoPoint)
+    def _(values, as_type):
+        if len(values) != 2 or len(values["lat"]) != len(values["lon"]):
+            raise ValueError("Mismatched coordinates")
+        return [as_type(lat, lon) for (lat, lon) in zip(values["lat"], values["lon"])]
+
+    points = [GeoPoint(1.0, 2.0), GeoPoint(3.0, 4.0)]
+    assert registry.jsonify(points) == {"lat": [1.0, 3.0], "lon": [2.0, 4.0]}
+
+    # the default registry is not affected
+    assert jsno.jsonify(points) == [{"lat": 1.0, "lon": 2.0}, {"lat": 3.0, "lon": 4.0}]
+    assert jsno.unjsonify[list[GeoPoint]](jsno.jsonify(points)) == points
+
+
+def test_batch_errors():
+    registry = Registry()
+
+    @registry.unjsonify.register_batch(GeoPoint)
+    def _(values, as_type):
+        raise ValueError("Invalid points")
+
+    with pytest.raises(UnjsonifyError, match="Invalid points"):
+        registry.unjsonify[list[GeoPoint]]([])
+
+
+def test_registering_batch_invalidates_lists():
+    registry = Registry()
+    assert registry.unjsonify[list[GeoPoint]]([{"lat": 1, "lon": 2}]) == [GeoPoint(1, 2)]
+
+    @registry.unjsonify.register_batch(GeoPoint)
+    def _(values, as_type):
+        return [as_type(*value) for value in values]
+
+    assert registry.unjsonify[list[GeoPoint]]([[1, 2]]) == [GeoPoint(1, 2)]
+
+
+def test_single_value_registration_overrides_inherited_batch():
+    calls.clear()
+    registry = Registry()
+
+    @registry.jsonify.register(Money)
+    def _(value):
+        return value.cents
+
+    @registry.unjsonify.register(Money)
+    def _(value, as_type):
+        return as_type(value)
+
+    assert registry.jsonify([Money(100), Money(200)]) == [100, 200]
+    assert registry.unjsonify[list[Money]]([100, 200]) == [Money(100), Money(200)]
+    assert calls == []
@@ -0,0 +1,102 @@
+import io
+
+from dataclasses import dataclass
+
+import pytest
+
+import jsno
+from jsno import jsonify, unjsonify, UnjsonifyError
+from jsno.buffers import dump, load
+from jsno.msgpack import pack
+
+
+@dataclass
+class Image:
+    name: str
+    thumbnail: bytes
+    raw: memoryview
+
+
+def test_bytes_like():
+    assert jsonify(bytearray(b"foobar!")) == "Zm9vYmFyIQ=="
+    assert jsonify(memoryview(b"foobar!")) == "Zm9vYmFyIQ=="
+
+    assert unjsonify[bytearray]("Zm9vYmFyIQ==") == bytearray(b"foobar!")
+
+    # bytes-like values are accepted as such
+    assert unjsonify[bytes](bytearray(b"abc")) == b"abc"
+    assert unjsonify[bytes](memoryview(b"abc")) == b"abc"
+
+    for value in ["Zm9vä", "abc", 123, None, {"$buffer": 0}]:
+        with pytest.raises(UnjsonifyError):
+            unjsonify[bytes](value)
+
+
+def test_out_of_band():
+    image = Image("cat", b"x" * 2000, memoryview(b"small"))
+
+    with jsno.out_of_band() as buffers:
+        value = jsonify(image)
+
+    assert value == {"name": "cat", "thumbnail": {"$buffer": 0}, "raw": "c21hbGw="}
+    assert [buffer.tobytes() for buffer in buffers] == [b"x" * 2000]
+
+    with jsno.out_of_band(buffers):
+        assert unjsonify[Image](value) == image
+
+    # references are not resolved outside the context
+    with pytest.raises(UnjsonifyError):
+        unjsonify[Image](value)
+
+
+def test_out_of_band_threshold():
+    with jsno.out_of_band(threshold=0) as buffers:
+        value = jsonify([b"", bytearray(b"a"), memoryview(b"b")])
+
+    assert value == [{"$buffer": 0}, {"$buffer": 1}, {"$buffer": 2}]
+    assert [buffer.tobytes() for buffer in buffers] == [b"", b"a", b"b"]
+
+
+def test_invalid_reference():
+    with jsno.out_of_band([memoryview(b"abc")]):
+        for value in [{"$buffer": 1}, {"$buffer": -1}, {"$buffer": "0"}, {"$buffer": 0, "x": 1}]:
+            with pytest.raises(UnjsonifyError):
+                unjsonify[bytes](value)
+
+
+def test_frames():
+    image = Image("cat", b"\x00\xff" * 1000, memoryview(b"\x01" * 5000))
+
+    data = jsno.dumpb(image)
+    assert len(data) < 8000
+
+    result = jsno.loadb[Image](data)
+    assert result == image
+
+    # memoryviews refer to the frame directly
+    assert result.raw.obj is data
+
+    file = io.BytesIO()
+    dump(image, file)
+    assert file.getvalue() == data
+
+    file.seek(0)
+    assert load[Image](file) == image
+
+
+def test_invalid_frame():
+    data = jsno.dumpb(b"x" * 2000)
+
+    with pytest.raises(ValueError):
+        jsno.loadb[bytes](data[:-1])
+
+    with pytest.raises(ValueError):
+        load[bytes](io.BytesIO(data[:-1]))
+
+
+def test_msgpack_buffers():
+    file = io.BytesIO()
+    pack(Image("cat", b"x" * 100_000, memoryview(b"abc")), file)
+
+    assert jsno.unpackb[Image](file.getvalue()) == Image("cat", b"x" * 100_000, memoryview(b"abc"))
+    assert jsno.unpackb[bytearray](jsno.packb(bytearray(b"abc"))) == bytearray(b"abc")
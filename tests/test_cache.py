@@ -0,0 +1,184 @@
+import dataclasses
+import gc
+import weakref
+
+from typing import Annotated
+
+import pytest
+
+from jsno import jsonify, unjsonify, Constraint, Registry, Schema, UnjsonifyError
+from jsno.cache import CodecCache
+
+
+def make_class():
+    @dataclasses.dataclass
+    class Item:
+        name: str
+        count: Annotated[int, Constraint.range(min=0)]
+
+    return Item
+
+
+def test_codecs_are_released_with_class():
+    item_class = make_class()
+
+    assert jsonify(item_class(name="x", count=1)) == {"name": "x", "count": 1}
+    assert unjsonify[item_class]({"name": "x", "count": 1}) == item_class(name="x", count=1)
+    assert unjsonify[list[item_class]]([]) == []
+
+    ref = weakref.ref(item_class)
+
+    # clear the parameterized types referring to the class
+    unjsonify._cache.lru.clear()
+
+    del item_class
+    gc.collect()
+
+    assert ref() is None
+
+
+def test_codec_is_not_inherited_by_subclass():
+
+    @dataclasses.dataclass
+    class Base:
+        name: str
+
+    @dataclasses.dataclass
+    class Derived(Base):
+        count: int = 0
+
+    assert unjsonify[Base]({"name": "x"}) == Base(name="x")
+    assert unjsonify[Derived]({"name": "x", "count": 1}) == Derived(name="x", count=1)
+    assert jsonify(Base(name="x")) == {"name": "x"}
+    assert jsonify(Derived(name="x")) == {"name": "x", "count": 0}
+
+
+def test_annotated_unjsonifier_is_cached():
+    Positive = Annotated[int, Constraint.range(min=1)]
+    assert unjsonify[Positive] is unjsonify[Positive]
+
+
+def test_unhashable_type_is_cached_by_identity():
+    ListOfSchema = list[Schema({"name": str})]
+    assert unjsonify[ListOfSchema] is unjsonify[ListOfSchema]
+
+
+def test_cache_statistics():
+    before = unjsonify.cache_info()
+
+    unjsonify[list[make_class()]]
+    after = unjsonify.cache_info()
+
+    assert after.misses > before.misses
+
+    unjsonify[list[int]]
+    unjsonify[list[int]]
+    assert unjsonify.cache_info().hits > after.hits
+
+
+def test_lru_eviction():
+    cache = CodecCache(maxsize=2)
+
+    cache[list[int]] = 1
+    cache[list[str]] = 2
+    assert cache.get(list[int]) == 1
+
+    cache[list[float]] = 3
+
+    assert cache.get(list[str]) is None
+    assert cache.get(list[int]) == 1
+    assert cache.get(list[float]) == 3
+
+    info = cache.cache_info()
+    assert info.evictions == 1
+    assert info.currsize == 2
+
+    cache.resize(1)
+    assert cache.cache_info().evictions == 2
+
+
+def test_builtin_classes_are_cached():
+    cache = CodecCache()
+    cache[int] = 1
+
+    assert cache.get(int) == 1
+
+    cache.clear()
+    assert cache.get(int) is None
+
+
+def test_set_cache_size():
+    maxsize = unjsonify.cache_info().maxsize
+    try:
+        unjsonify.set_cache_size(10)
+        assert unjsonify.cache_info().maxsize == 10
+    finally:
+        unjsonify.set_cache_size(maxsize)
+
+
+def test_memoized_dates():
+    import datetime
+
+    registry = Registry()
+    values = registry.unjsonify[list[datetime.date]](["2026-01-02", "2026-01-02", "2026-01-03"])
+
+    assert values == [datetime.date(2026, 1, 2), datetime.date(2026, 1, 2), datetime.date(2026, 1, 3)]
+    assert values[0] is values[1]
+
+    info = registry.unjsonify.memo_info(datetime.date)
+    assert (info.hits, info.misses) == (1, 2)
+
+
+def test_memoize_type():
+    import decimal
+
+    registry = Registry()
+    registry.unjsonify.memoize(decimal.Decimal, maxsize=2)
+
+    values = registry.unjsonify[list[decimal.Decimal]](["1.5", "1.5", 2, 2])
+    assert values[0] is values[1]
+    assert values[2] is values[3]
+    assert registry.unjsonify.memo_info(decimal.Decimal).maxsize == 2
+
+    # not memoized in the default registry
+    values = unjsonify[list[decimal.Decimal]](["1.5", "1.5"])
+    assert values[0] is not values[1]
+
+
+def test_disable_memo():
+    import datetime
+
+    registry = Registry()
+    registry.unjsonify.memoize(datetime.date, maxsize=0)
+
+    values = registry.unjsonify[list[datetime.date]](["2026-01-02", "2026-01-02"])
+    assert values[0] is not values[1]
+
+
+def test_memo_is_typed():
+    registry = Registry()
+    registry.unjsonify.memoize(int)
+
+    assert registry.unjsonify[int](1) == 1
+
+    # booleans are not mixed with the memoized integers
+    with pytest.raises(UnjsonifyError):
+        registry.unjsonify[int](True)
+
+
+def test_errors_are_not_memoized():
+    import datetime
+
+    registry = Registry()
+
+    for _ in range(2):
+        with pytest.raises(UnjsonifyError):
+            registry.unjsonify[datetime.date]("2026-13-01")
+
+
+def test_cannot_memoize_mutable_type():
+    with pytest.raises(TypeError):
+        unjsonify.memoize(list)
+
+    with pytest.raises(TypeError):
+        unjsonify.memoize(Schema)
@@ -0,0 +1,81 @@
+import datetime
+
+from dataclasses import dataclass
+from typing import Annotated
+
+import pytest
+
+import jsno
+from jsno import jsonify, unjsonify, UnjsonifyError
+from jsno.datetime import EpochMillis, Seconds
+
+
+def parse_version(value):
+    (major, minor) = value.split(".")
+    return (int(major), int(minor))
+
+
+@dataclass
+class Message:
+    checksum: bytes // jsno.codec(jsno.Hex)
+    token: bytes // jsno.codec(jsno.Base64(urlsafe=True))
+    sent: datetime.datetime // jsno.codec(EpochMillis)
+    version: tuple[int, int] // jsno.codec(lambda value: "%d.%d" % value, parse_version)
+    timeout: Annotated[datetime.timedelta, jsno.codec(Seconds()), jsno.property_name("timeoutSeconds")]
+    received: datetime.datetime // jsno.codec(EpochMillis) | None = None
+
+
+message = Message(
+    checksum=b"\x01\xff",
+    token=b"\xfb\xff",
+    sent=datetime.datetime(2026, 1, 2, tzinfo=datetime.timezone.utc),
+    version=(1, 2),
+    timeout=datetime.timedelta(seconds=30),
+)
+
+message_json = {
+    "checksum": "01ff",
+    "token": "-_8=",
+    "sent": 1767312000000,
+    "version": "1.2",
+    "timeoutSeconds": 30,
+}
+
+
+def test_jsonify_field_codecs():
+    assert jsonify(message) == message_json
+
+
+def test_unjsonify_field_codecs():
+    assert unjsonify[Message](message_json) == message
+
+
+def test_optional_field_codec():
+    value = Message(**{**message.__dict__, "received": message.sent})
+    json = {**message_json, "received": 1767312000000}
+
+    assert jsonify(value) == json
+    assert unjsonify[Message](json) == value
+
+
+def test_invalid_values():
+    with pytest.raises(UnjsonifyError):
+        unjsonify[Message]({**message_json, "checksum": "xyz"})
+
+    with pytest.raises(UnjsonifyError):
+        unjsonify[Message]({**message_json, "token": "!"})
+
+    with pytest.raises(UnjsonifyError):
+        unjsonify[Message]({**message_json, "version": "1"})
+
+
+def test_codec_types():
+    assert isinstance(jsno.codec(jsno.Hex), jsno.Hex)
+    assert jsno.codec(EpochMillis) is EpochMillis
+
+    with pytest.raises(TypeError):
+        jsno.codec(str)
+
+
+def test_bytearray():
+    assert unjsonify[bytearray // jsno.codec(jsno.Hex)]("01ff") == bytearray(b"\x01\xff")
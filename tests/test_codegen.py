@@ -0,0 +1,152 @@
+import dataclasses
+import sys
+
+from typing import Annotated
+
+import pytest
+
+import jsno
+from jsno import codegen, unjsonify, UnjsonifyError
+from jsno.compile import main
+from jsno.unjsonify import resolve_field_unjsonifiers
+
+
+UserId = int
+
+
+@dataclasses.dataclass
+class Point:
+    x: int
+    y: float
+    label: str | None = None
+
+
+@dataclasses.dataclass
+class Polygon:
+    name: Annotated[str, jsno.property_name("polygon-name")]
+    points: list[Point]
+
+
+@pytest.fixture
+def codec_cache(tmp_path):
+    jsno.set_codec_cache(tmp_path)
+    try:
+        yield tmp_path
+    finally:
+        jsno.set_codec_cache(None)
+
+
+def make_class():
+    @dataclasses.dataclass
+    class Item:
+        count: int
+        point: Point
+        tags: list[str] = dataclasses.field(default_factory=list)
+
+    return Item
+
+
+def test_fingerprint_is_stable():
+    assert codegen.get_fingerprint(make_class()) == codegen.get_fingerprint(make_class())
+
+
+def test_fingerprint_changes_with_fields():
+    @dataclasses.dataclass
+    class Item:
+        count: float
+
+    assert codegen.get_fingerprint(Item) != codegen.get_fingerprint(make_class())
+
+
+def test_fingerprint_changes_with_string_annotations(codec_cache, monkeypatch):
+    def make_user():
+        @dataclasses.dataclass
+        class User:
+            id: "UserId"
+
+        return User
+
+    user_class = make_user()
+    fingerprint = codegen.get_fingerprint(user_class)
+    assert unjsonify[user_class]({"id": 5}).id == 5
+
+    monkeypatch.setattr(sys.modules[__name__], "UserId", str)
+    user_class = make_user()
+    assert codegen.get_fingerprint(user_class) != fingerprint
+
+    with pytest.raises(UnjsonifyError, match="Cannot unjsonify as str"):
+        unjsonify[user_class]({"id": 5})
+
+
+def test_unjsonify_with_codec_cache(codec_cache):
+    json = {"count": 3, "point": {"x": 1, "y": 2}}
+
+    item_class = make_class()
+    item = unjsonify[item_class](json)
+    assert item == item_class(count=3, point=Point(x=1, y=2.0))
+    assert type(item.point.y) is float
+
+    cached = set(codec_cache.iterdir())
+    assert codec_cache / f"{codegen.get_fingerprint(item_class)}.codec" in cached
+
+    # a class with the same fingerprint loads the codec from the cache
+    item_class = make_class()
+    assert unjsonify[item_class](json) == item_class(count=3, point=Point(x=1, y=2.0))
+    assert set(codec_cache.iterdir()) == cached
+
+
+def test_cached_codec_errors(codec_cache):
+    item_class = make_class()
+
+    with pytest.raises(UnjsonifyError):
+        unjsonify[item_class]({"count": "3", "point": {"x": 1, "y": 2}})
+
+    with pytest.raises(UnjsonifyError):
+        unjsonify[item_class]({"count": 3})
+
+    with pytest.raises(UnjsonifyError):
+        unjsonify[item_class]({"count": 3, "point": {"x": 1, "y": 2}, "extra": 1})
+
+    with unjsonify.ignore_extra_keys():
+        assert unjsonify[item_class]({"count": 3, "point": {"x": 1, "y": 2}, "extra": 1})
+
+
+def test_corrupted_cache_entry(codec_cache):
+    item_class = make_class()
+    path = codec_cache / f"{codegen.get_fingerprint(item_class)}.codec"
+    path.write_bytes(b"garbage")
+
+    assert unjsonify[item_class]({"count": 3, "point": {"x": 1, "y": 2}}).count == 3
+
+
+def test_generate_module(tmp_path, monkeypatch):
+    output = tmp_path / "polygon_codecs.py"
+    assert main([f"{Polygon.__module__}:Polygon", "-o", str(output)]) == 0
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(codegen, "precompiled", {})
+    try:
+        __import__("polygon_codecs")
+        assert Polygon in codegen.precompiled
+
+        unjsonify_polygon = codegen.load_unjsonifier(Polygon, resolve_field_unjsonifiers)
+
+        json = {"polygon-name": "triangle", "points": [{"x": 0, "y": 0}, {"x": 1, "y": 1, "label": "b"}]}
+        assert unjsonify_polygon(json) == Polygon(
+            name="triangle",
+            points=[Point(x=0, y=0.0), Point(x=1, y=1.0, label="b")]
+        )
+    finally:
+        sys.modules.pop("polygon_codecs", None)
+
+
+def test_generate_module_for_local_class_fails():
+    with pytest.raises(SystemExit):
+        main([f"{Point.__module__}:make_class.<locals>.Item"])
+
+
+def test_install_out_of_date_codec():
+    with pytest.warns(UserWarning):
+        codegen.install(Point, lambda *args: None, fingerprint="outdated")
+
+    assert Point not in codegen.precompiled
@@ -4,6 +4,7 @@ from typing import Annotated
 import pytest
 
 from jsno import unjsonify, Constraint, UnjsonifyError, constraint
+from jsno.constraint import RangeConstraint
 
 
 def test_function_constraint():
@@ -130,3 +131,119 @@ def test_dataclass_constraint():
 
     with pytest.raises(UnjsonifyError):
         unjsonify[Range]({"min": 99, "max": 0})
+
+
+def test_compiled_constraints():
+    Name = Annotated[str, Constraint.len(min=2, max=4), Constraint.regex("[a-z]*", name="Lowercase")]
+
+    assert unjsonify[Name]("abc") == "abc"
+
+    # the error tells the first violated constraint
+    for (value, detail) in [
+        ("a", "Length must be in range 2..4"),
+        ("abcde", "Length must be in range 2..4"),
+        ("ABC", "Lowercase"),
+    ]:
+        with pytest.raises(UnjsonifyError) as exc_info:
+            unjsonify[Name](value)
+
+        assert exc_info.value.detail == f"Violates constraint: {detail}"
+
+
+def test_regex_constraint_on_other_types():
+    Code = Annotated[int, Constraint.regex("[0-9]{3}")]
+
+    assert unjsonify[Code](123) == 123
+
+    with pytest.raises(UnjsonifyError):
+        unjsonify[Code](12)
+
+
+def test_overridden_evaluate():
+    class Even(RangeConstraint):
+        def evaluate(self, value):
+            return super().evaluate(value) and value % 2 == 0
+
+    EvenNumber = Annotated[int, Even(min=0), Constraint.range(max=10)]
+
+    assert unjsonify[EvenNumber](4) == 4
+    assert unjsonify[list[EvenNumber]]([2, 4]) == [2, 4]
+
+    for value in [3, -2, 12]:
+        with pytest.raises(UnjsonifyError):
+            unjsonify[EvenNumber](value)
+
+
+def test_overridden_validate():
+    class Even(Constraint):
+        def validate(self, value):
+            if value % 2:
+                raise ValueError("odd")
+
+    class Positive(RangeConstraint):
+        def validate(self, value):
+            if value <= 0:
+                raise ValueError("not positive")
+
+    EvenNumber = Annotated[int, Even(), Constraint.range(max=10)]
+    PositiveNumber = Annotated[int, Positive(max=10), Constraint.range(max=5)]
+
+    assert unjsonify[EvenNumber](4) == 4
+    assert unjsonify[Annotated[int, Even()]](4) == 4
+    assert unjsonify[PositiveNumber](2) == 2
+    assert unjsonify[list[PositiveNumber]]([1, 2]) == [1, 2]
+
+    for (as_type, value, detail) in [
+        (EvenNumber, 3, "odd"),
+        (Annotated[int, Even()], 3, "odd"),
+        (EvenNumber, 12, "Violates constraint: Value must be at most 10"),
+        (PositiveNumber, -1, "not positive"),
+        (PositiveNumber, 7, "Violates constraint: Value must be at most 5"),
+    ]:
+        with pytest.raises(UnjsonifyError) as exc_info:
+            unjsonify[as_type](value)
+
+        assert exc_info.value.detail == detail
+
+
+def test_bulk_constraints():
+    Items = list[Annotated[int, Constraint.range(min=0, max=10)]]
+    Words = set[Annotated[str, Constraint.len(max=3)]]
+
+    assert unjsonify[Items]([]) == []
+    assert unjsonify[Items]([0, 5, 10]) == [0, 5, 10]
+    assert unjsonify[Words](["a", "abc"]) == {"a", "abc"}
+
+    with pytest.raises(UnjsonifyError) as exc_info:
+        unjsonify[Items]([0, 11, 5])
+
+    assert exc_info.value.value == 11
+
+    with pytest.raises(UnjsonifyError):
+        unjsonify[Words](["a", "abcd"])
+
+    with pytest.raises(UnjsonifyError):
+        unjsonify[Items]([0, "1"])
+
+
+def test_float_range_list():
+    Items = list[Annotated[float, Constraint.range(min=0.0)]]
+
+    # NaNs are not in any range
+    with pytest.raises(UnjsonifyError):
+        unjsonify[Items]([1.0, float("nan"), 2.0])
+
+
+def test_trusted():
+    Items = list[Annotated[int, Constraint.range(min=0, max=10)]]
+
+    with unjsonify.trusted():
+        assert unjsonify[Items]([11]) == [11]
+        assert unjsonify[Range]({"min": 99, "max": 0}) == Range(min=99, max=0)
+
+        # other checks are still done
+        with pytest.raises(UnjsonifyError):
+            unjsonify[Items](["1"])
+
+    with pytest.raises(UnjsonifyError):
+        unjsonify[Items]([11])
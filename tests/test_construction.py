@@ -0,0 +1,82 @@
+import dataclasses
+
+from typing import ClassVar
+
+import pytest
+
+from jsno import bypass_init, unjsonify, UnjsonifyError
+
+
+@bypass_init()
+@dataclasses.dataclass(frozen=True, slots=True)
+class Point:
+    x: int
+    y: int = 0
+    tags: list[str] = dataclasses.field(default_factory=list)
+
+
+@bypass_init()
+@dataclasses.dataclass(frozen=True)
+class Label:
+    text: str
+    length: int = dataclasses.field(init=False)
+    unit: ClassVar[str] = "px"
+
+    def __post_init__(self):
+        object.__setattr__(self, "length", len(self.text))
+
+
+@bypass_init(post_init=False)
+@dataclasses.dataclass
+class Counter:
+    count: int
+    calls: int = dataclasses.field(init=False, default=0)
+
+    def __post_init__(self):
+        raise AssertionError("should not be called")
+
+
+@bypass_init()
+@dataclasses.dataclass
+class WithInitVar:
+    value: int
+    scale: dataclasses.InitVar[int] = 1
+
+    def __post_init__(self, scale):
+        self.value *= scale
+
+
+def test_unjsonify_frozen_slotted_dataclass():
+    point = unjsonify[Point]({"x": 1, "y": 2})
+
+    assert point == Point(1, 2)
+    assert point.tags == []
+    assert unjsonify[Point]({"x": 1}).tags is not point.tags
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        point.x = 3  # type: ignore
+
+
+def test_missing_required_field():
+    with pytest.raises(UnjsonifyError, match="'x'"):
+        unjsonify[Point]({"y": 2})
+
+
+def test_post_init_is_called():
+    assert unjsonify[Label]({"text": "abc"}).length == 3
+
+
+def test_post_init_can_be_skipped():
+    counter = unjsonify[Counter]({"count": 5})
+
+    assert counter.count == 5
+    assert counter.calls == 0
+
+
+def test_field_without_init_is_not_read():
+    with pytest.raises(UnjsonifyError, match="Extra keys"):
+        unjsonify[Label]({"text": "abc", "length": 5})
+
+
+def test_init_vars_fall_back_to_init():
+    assert unjsonify[WithInitVar]({"value": 2}) == WithInitVar(2)
@@ -1,9 +1,13 @@
 import datetime
 import zoneinfo
 
+from dataclasses import dataclass
+from random import Random
+from typing import Annotated
+
 import pytest
 
-from jsno import jsonify, unjsonify, UnjsonifyError
+from jsno import jsonify, unjsonify, Registry, UnjsonifyError
 
 
 helsinki = zoneinfo.ZoneInfo("Europe/Helsinki")
@@ -183,3 +187,153 @@ def test_unjsonify_timezone_utc_negative():
 def test_unjsonify_timezone_failure():
     with pytest.raises(UnjsonifyError):
         unjsonify[datetime.timezone]("UTC03:30:00")
+
+
+def test_epoch_datetime():
+    from jsno.datetime import Epoch
+
+    value = datetime.datetime(2026, 1, 2, 3, 4, 5, 678000, tzinfo=datetime.timezone.utc)
+
+    for (unit, expected) in [("s", 1767323045.678), ("ms", 1767323045678), ("us", 1767323045678000)]:
+        as_type = Annotated[datetime.datetime, Epoch(unit)]
+        assert jsonify[as_type](value) == expected
+        assert unjsonify[as_type](expected) == value
+
+    as_type = Annotated[datetime.datetime, Epoch()]
+    assert jsonify[as_type](value.astimezone(helsinki)) == 1767323045.678
+
+    with pytest.raises(ValueError):
+        jsonify[as_type](datetime.datetime(2026, 1, 2))
+
+    with pytest.raises(UnjsonifyError):
+        unjsonify[as_type](True)
+
+    with pytest.raises(UnjsonifyError):
+        unjsonify[as_type]("1767323045")
+
+
+def test_epoch_far_from_epoch():
+    from jsno.datetime import EPOCH, EpochMillis
+
+    as_type = Annotated[datetime.datetime, EpochMillis]
+    values = [20524840122260, -9930991435481, 2**32 * 1000 - 1, -2**32 * 1000 + 1, 253402300799999]
+
+    # numbers from the whole range of datetimes
+    random = Random(0)
+    values += [random.randrange(-62135596800000, 253402300800000) for _ in range(1000)]
+    expected = [EPOCH + datetime.timedelta(milliseconds=value) for value in values]
+
+    assert [unjsonify[as_type](value) for value in values] == expected
+    assert unjsonify[list[as_type]](values) == expected
+    assert unjsonify[Annotated[list[datetime.datetime], EpochMillis]](values) == expected
+
+    with pytest.raises(UnjsonifyError):
+        unjsonify[as_type](253402300800000)
+
+
+def test_epoch_date():
+    from jsno.datetime import Epoch
+
+    as_type = Annotated[datetime.date, Epoch("ms")]
+    assert jsonify[as_type](datetime.date(2026, 1, 2)) == 1767312000000
+    assert unjsonify[as_type](1767312000000) == datetime.date(2026, 1, 2)
+
+    with pytest.raises(UnjsonifyError):
+        unjsonify[as_type](1767312000001)
+
+
+def test_epoch_list():
+    from jsno.datetime import Epoch
+
+    as_type = Annotated[list[datetime.datetime], Epoch("ms")]
+    values = [
+        datetime.datetime(2026, 1, 2, tzinfo=datetime.timezone.utc),
+        datetime.datetime(2026, 1, 3, tzinfo=datetime.timezone.utc),
+    ]
+
+    assert jsonify[as_type](values) == [1767312000000, 1767398400000]
+    assert unjsonify[as_type]([1767312000000, 1767398400000]) == values
+
+    with pytest.raises(UnjsonifyError):
+        unjsonify[as_type]([1767312000000, None])
+
+
+def test_seconds():
+    from jsno.datetime import Seconds
+
+    as_type = Annotated[datetime.timedelta, Seconds()]
+    assert jsonify[as_type](datetime.timedelta(minutes=1, milliseconds=500)) == 60.5
+    assert jsonify[as_type](datetime.timedelta(days=-1)) == -86400
+    assert unjsonify[as_type](60.5) == datetime.timedelta(minutes=1, milliseconds=500)
+
+    as_type = Annotated[datetime.time, Seconds("ms")]
+    assert jsonify[as_type](datetime.time(1, 2, 3, 4000)) == 3723004
+    assert unjsonify[as_type](3723004) == datetime.time(1, 2, 3, 4000)
+
+    with pytest.raises(UnjsonifyError):
+        unjsonify[as_type](86400000)
+
+
+@pytest.mark.parametrize("value, text", [
+    (datetime.timedelta(0), "PT0S"),
+    (datetime.timedelta(days=3), "P3D"),
+    (datetime.timedelta(days=1, hours=2, minutes=30), "P1DT2H30M"),
+    (datetime.timedelta(seconds=4.5), "PT4.5S"),
+    (datetime.timedelta(microseconds=1), "PT0.000001S"),
+    (-datetime.timedelta(hours=23), "-PT23H"),
+])
+def test_iso_duration(value, text):
+    from jsno.datetime import ISODuration
+
+    as_type = Annotated[datetime.timedelta, ISODuration()]
+    assert jsonify[as_type](value) == text
+    assert unjsonify[as_type](text) == value
+
+
+def test_iso_duration_parsing():
+    from jsno.datetime import ISODuration
+
+    as_type = Annotated[datetime.timedelta, ISODuration()]
+    assert unjsonify[as_type]("P2W") == datetime.timedelta(weeks=2)
+    assert unjsonify[as_type]("PT90M") == datetime.timedelta(minutes=90)
+
+    for text in ["P", "PT", "-P", "P1Y", "P1M", "P1DT", "PT1.1234567S", "1D"]:
+        with pytest.raises(UnjsonifyError):
+            unjsonify[as_type](text)
+
+
+def test_codec_type_is_checked():
+    from jsno.datetime import Epoch
+
+    with pytest.raises(TypeError):
+        unjsonify[Annotated[datetime.timedelta, Epoch()]]
+
+
+def test_registry_wire_format():
+    from jsno.datetime import Epoch, Seconds
+
+    api = Registry()
+    api.register_codec(datetime.datetime, Epoch("ms"))
+    api.register_codec(datetime.timedelta, Seconds())
+
+    @dataclass
+    class Event:
+        time: datetime.datetime
+        duration: datetime.timedelta
+        times: list[datetime.datetime]
+
+    event = Event(
+        time=datetime.datetime(2026, 1, 2, tzinfo=datetime.timezone.utc),
+        duration=datetime.timedelta(seconds=1.5),
+        times=[],
+    )
+
+    assert api.jsonify(event) == {"time": 1767312000000, "duration": 1.5, "times": []}
+    assert api.unjsonify[Event]({"time": 1767312000000, "duration": 1.5, "times": [0]}) == Event(
+        time=event.time,
+        duration=event.duration,
+        times=[datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)],
+    )
+
+    # the default registry still uses ISO strings
+    assert jsonify(event)["time"] == "2026-01-02T00:00:00Z"
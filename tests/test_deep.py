@@ -0,0 +1,168 @@
+import datetime
+
+from dataclasses import dataclass, field
+from typing import Annotated
+
+import pytest
+
+import jsno
+from jsno import deep_jsonify, deep_unjsonify, jsonify, unjsonify, Constraint, Registry, UnjsonifyError
+from tests.test_ast_example import Add, Expression, LiteralInt, Multiply, Reference
+from tests.test_variant import expr, Expression as BooleanExpression
+
+
+@dataclass
+class Node:
+    name: str
+    children: list["Node"] = field(default_factory=list)
+    attributes: dict[str, "Node"] = field(default_factory=dict)
+    parent: "Node | None" = None
+
+
+@dataclass
+@jsno.extra_data(property="metadata")
+class Tagged:
+    node: Node
+    metadata: dict = field(default_factory=dict)
+
+
+@dataclass
+@Constraint(lambda it: it.size > 0)
+class Sized:
+    size: int
+    nodes: Annotated[list[Node], Constraint.len(max=2)]
+
+
+@dataclass
+class Event:
+    time: datetime.datetime
+    nested: list[Node]
+
+
+def deep_expression(depth):
+    expression = LiteralInt(0)
+    for i in range(depth):
+        if i % 2:
+            expression = Add(LiteralInt(i), expression)
+        else:
+            expression = Multiply(expression, Reference("x"))
+
+    return expression
+
+
+def get_depth(expression):
+    depth = 0
+    while not isinstance(expression, LiteralInt):
+        expression = expression.right if isinstance(expression, Add) else expression.left
+        depth += 1
+
+    return depth
+
+
+def test_deep_expression():
+    value = deep_expression(10_000)
+
+    with pytest.raises(RecursionError):
+        jsonify(value)
+
+    jsonified = deep_jsonify(value)
+    assert jsonified["type"] == "Add"
+    assert jsonified["left"] == {"type": "LiteralInt", "value": 9_999}
+
+    result = deep_unjsonify[Expression](jsonified)
+    assert type(result) is Add
+    assert get_depth(result) == 10_000
+
+
+def test_deep_lists():
+    value: list = []
+    for _ in range(10_000):
+        value = [value, 1]
+
+    jsonified = deep_jsonify(value)
+    for _ in range(10_000):
+        assert len(jsonified) == 2
+        jsonified = jsonified[0]
+
+    assert jsonified == []
+
+
+def test_same_results():
+    node = Node(
+        "root",
+        children=[Node("a"), Node("b", parent=Node("p"))],
+        attributes={"x": Node("x")},
+    )
+
+    for (value, as_type) in [
+        (node, Node),
+        (expr, BooleanExpression),
+        ([expr, {"a": (1, 2)}, None], list),
+        (Tagged(node, {"extra": [1, 2]}), Tagged),
+        (Sized(1, [Node("a")]), Sized),
+        (Event(datetime.datetime(2026, 10, 1), [node]), Event),
+    ]:
+        jsonified = deep_jsonify(value)
+        assert jsonified == jsonify(value)
+        assert deep_unjsonify[as_type](jsonified) == unjsonify[as_type](jsonified)
+
+
+def test_errors():
+    with pytest.raises(UnjsonifyError, match="Required key not found|missing"):
+        deep_unjsonify[Node]({"children": [{"children": []}]})
+
+    with pytest.raises(UnjsonifyError, match="Extra keys: 'other'"):
+        deep_unjsonify[Node]({"name": "a", "children": [{"name": "b", "other": 1}]})
+
+    with pytest.raises(UnjsonifyError, match="unknown type"):
+        deep_unjsonify[Expression]({"type": "Add", "left": {"type": "Unknown"}, "right": {"type": "Reference", "name": "x"}})
+
+    with pytest.raises(UnjsonifyError):
+        deep_unjsonify[Sized]({"size": 0, "nodes": []})
+
+    with pytest.raises(UnjsonifyError):
+        deep_unjsonify[Sized]({"size": 1, "nodes": [{"name": "a"}] * 3})
+
+    # the constraints are not evaluated for trusted data
+    with unjsonify.trusted():
+        assert deep_unjsonify[Sized]({"size": 0, "nodes": []}) == Sized(0, [])
+
+    # deep values are shown shortened in the messages
+    jsonified = deep_jsonify(deep_expression(5_000))
+    jsonified["other"] = 1
+
+    with pytest.raises(UnjsonifyError, match="Extra keys"):
+        deep_unjsonify[Expression](jsonified)
+
+
+def test_max_depth():
+    value = deep_expression(100)
+    jsonified = deep_jsonify(value, max_depth=101)
+
+    with pytest.raises(ValueError, match="nested more than 100 levels"):
+        deep_jsonify(value, max_depth=100)
+
+    assert get_depth(deep_unjsonify[Expression](jsonified, max_depth=101)) == 100
+
+    with pytest.raises(UnjsonifyError, match="nested more than 100 levels"):
+        deep_unjsonify[Expression](jsonified, max_depth=100)
+
+
+def test_registry():
+    api = Registry()
+
+    @api.jsonify.register(datetime.datetime)
+    def _(value):
+        return int(value.timestamp())
+
+    @api.unjsonify.register(datetime.datetime)
+    def _(value, as_type):
+        return datetime.datetime.fromtimestamp(value)
+
+    event = Event(datetime.datetime(2026, 10, 1), [Node("a", children=[Node("b")])])
+
+    jsonified = api.deep_jsonify(event)
+    assert jsonified == api.jsonify(event)
+    assert type(jsonified["time"]) is int
+
+    assert api.deep_unjsonify[Event](jsonified) == event
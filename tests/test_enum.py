@@ -0,0 +1,134 @@
+import enum
+
+from dataclasses import dataclass
+from typing import Annotated
+
+import pytest
+
+import jsno
+from jsno import jsonify, unjsonify, EnumCodec, Registry, UnjsonifyError
+
+
+class Color(enum.Enum):
+    RED = "red"
+    GREEN = "green"
+    CRIMSON = "red"
+
+    def describe(self):
+        return self.value
+
+
+class Level(enum.IntEnum):
+    LOW = 1
+    HIGH = 2
+
+
+class Permission(enum.Flag):
+    READ = 1
+    WRITE = 2
+    EXECUTE = 4
+    READ_WRITE = 3
+
+
+@jsno.enum_mode("value")
+class Status(enum.Enum):
+    ACTIVE = 1
+    DELETED = "1"
+
+
+def test_name_mode():
+    assert jsonify(Color.GREEN) == "GREEN"
+    assert unjsonify[Color]("GREEN") is Color.GREEN
+
+    # aliases
+    assert jsonify(Color.CRIMSON) == "RED"
+    assert unjsonify[Color]("CRIMSON") is Color.RED
+
+
+def test_only_members_are_accepted():
+    for value in ["describe", "__class__", "_value2member_map_", "red", 1, None]:
+        with pytest.raises(UnjsonifyError):
+            unjsonify[Color](value)
+
+
+def test_value_mode():
+    assert jsonify([Status.ACTIVE, Status.DELETED]) == [1, "1"]
+    assert unjsonify[list[Status]]([1, "1"]) == [Status.ACTIVE, Status.DELETED]
+
+    for value in ["ACTIVE", True, 1.0]:
+        with pytest.raises(UnjsonifyError):
+            unjsonify[Status](value)
+
+
+def test_flag_names():
+    assert jsonify(Permission.READ | Permission.EXECUTE) == ["READ", "EXECUTE"]
+    assert jsonify(Permission.READ_WRITE) == ["READ", "WRITE"]
+    assert jsonify(Permission(0)) == []
+
+    assert unjsonify[Permission](["READ", "EXECUTE"]) == Permission.READ | Permission.EXECUTE
+    assert unjsonify[Permission](["READ_WRITE"]) == Permission.READ_WRITE
+    assert unjsonify[Permission]([]) == Permission(0)
+
+    # single names and "|"-separated names are accepted, too
+    assert unjsonify[Permission]("WRITE") == Permission.WRITE
+    assert unjsonify[Permission]("READ|WRITE") == Permission.READ_WRITE
+
+    with pytest.raises(UnjsonifyError):
+        unjsonify[Permission](["READ", "DELETE"])
+
+    with pytest.raises(UnjsonifyError):
+        unjsonify[Permission](3)
+
+
+def test_flag_int_mode():
+    as_type = Annotated[Permission, EnumCodec("int")]
+
+    assert jsonify[as_type](Permission.READ | Permission.EXECUTE) == 5
+    assert unjsonify[as_type](5) == Permission.READ | Permission.EXECUTE
+    assert unjsonify[as_type](1) is Permission.READ
+
+    with pytest.raises(UnjsonifyError):
+        unjsonify[as_type](8)
+
+
+def test_int_mode():
+    @dataclass
+    class Reading:
+        level: Annotated[Level, EnumCodec("int")]
+
+    assert jsonify(Reading(Level.HIGH)) == {"level": 2}
+    assert unjsonify[Reading]({"level": 2}) == Reading(Level.HIGH)
+
+    with pytest.raises(UnjsonifyError):
+        unjsonify[Reading]({"level": True})
+
+    with pytest.raises(TypeError):
+        unjsonify[Annotated[Color, EnumCodec("int")]]
+
+
+def test_registry_mode():
+    registry = Registry()
+    registry.register_codec(Color, EnumCodec("value"))
+
+    assert registry.jsonify([Color.RED]) == ["red"]
+    assert registry.unjsonify[list[Color]](["red"]) == [Color.RED]
+
+    assert jsonify([Color.RED]) == ["RED"]
+
+
+def test_changing_mode():
+    class Size(enum.Enum):
+        SMALL = 1
+
+    assert jsonify(Size.SMALL) == "SMALL"
+    assert unjsonify[Size]("SMALL") is Size.SMALL
+
+    jsno.enum_mode("value")(Size)
+
+    assert jsonify(Size.SMALL) == 1
+    assert unjsonify[Size](1) is Size.SMALL
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        jsno.enum_mode("label")
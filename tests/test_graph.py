@@ -0,0 +1,267 @@
+import datetime
+import decimal
+
+from dataclasses import dataclass, field
+
+import pytest
+
+import jsno
+from jsno import GraphRegistry, Registry, UnjsonifyError
+from tests.test_variant import And, Expression, Not, Or, Variable
+
+
+@dataclass(frozen=True)
+class Material:
+    name: str
+    density: float
+
+
+@dataclass
+class Brick:
+    width: int
+    material: Material
+
+
+@dataclass
+class Box:
+    bricks: list[Brick]
+    spare: Material | None = None
+
+
+@dataclass(eq=False)
+class Person:
+    name: str
+    friends: list["Person"] = field(default_factory=list)
+
+
+graph = GraphRegistry()
+
+
+def test_shared_objects():
+    oak = Material("oak", 0.7)
+    box = Box([Brick(1, oak), Brick(2, oak), Brick(3, Material("steel", 7.8))], spare=oak)
+
+    jsonified = graph.jsonify(box)
+    assert jsonified == {
+        "bricks": [
+            {"width": 1, "material": {"name": "oak", "density": 0.7, "$id": 0}},
+            {"width": 2, "material": {"$ref": 0}},
+            {"width": 3, "material": {"name": "steel", "density": 7.8}},
+        ],
+        "spare": {"$ref": 0},
+    }
+
+    result = graph.unjsonify[Box](jsonified)
+    assert result == box
+    assert result.bricks[0].material is result.bricks[1].material is result.spare
+
+    # the default registry is not affected
+    assert jsno.jsonify(box)["spare"] == {"name": "oak", "density": 0.7}
+
+
+@dataclass(frozen=True)
+class Price:
+    amount: decimal.Decimal
+    at: datetime.datetime
+
+
+@dataclass
+class Order:
+    prices: list[Price]
+
+
+def test_equal_frozen_objects():
+    box = Box([Brick(1, Material("oak", 0.7)), Brick(2, Material("oak", 0.7))])
+    by_value = GraphRegistry(by_value=True)
+
+    assert by_value.jsonify(box)["bricks"][1]["material"] == {"$ref": 0}
+    assert graph.jsonify(box)["bricks"][1]["material"] == {"name": "oak", "density": 0.7}
+
+    # equal values that are not the same are not shared
+    box = Box([Brick(1, Material("oak", 1)), Brick(2, Material("oak", 1.0))])
+    assert by_value.jsonify(box)["bricks"][1]["material"] == {"name": "oak", "density": 1.0}
+
+    utc = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+    order = Order([
+        Price(decimal.Decimal("1.0"), utc),
+        Price(decimal.Decimal("1.00"), utc.astimezone(datetime.timezone(datetime.timedelta(hours=2)))),
+        Price(decimal.Decimal("1.0"), utc),
+    ])
+
+    jsonified = by_value.jsonify(order)
+    assert jsonified["prices"][1] == {"amount": "1.00", "at": "2020-01-01T02:00:00+02:00"}
+    assert jsonified["prices"][2] == {"$ref": 0}
+
+    result = by_value.unjsonify[Order](jsonified)
+    assert [str(price.amount) for price in result.prices] == ["1.0", "1.00", "1.0"]
+    assert result.prices[1].at.utcoffset() == datetime.timedelta(hours=2)
+    assert by_value.deep_jsonify(order) == jsonified
+
+
+def test_cycles():
+    alice = Person("alice")
+    bob = Person("bob", [alice])
+    alice.friends += [bob, alice]
+
+    jsonified = graph.jsonify(alice)
+    assert jsonified == {
+        "name": "alice",
+        "friends": [{"name": "bob", "friends": [{"$ref": 0}]}, {"$ref": 0}],
+        "$id": 0,
+    }
+
+    result = graph.loads[Person](graph.dumps(alice))
+    assert result.name == "alice"
+    assert result.friends[0].friends[0] is result
+    assert result.friends[1] is result
+
+
+def test_variants():
+    x = Variable("x")
+    expression = And(Not(x), Or(x, Not(x)))
+
+    jsonified = graph.jsonify(expression)
+    assert jsonified["right"]["left"] == {"$ref": 0}
+
+    result = graph.unjsonify[Expression](jsonified)
+    assert result == expression
+    assert result.left.expr is result.right.left is result.right.right.expr
+
+
+def test_sessions():
+    oak = Material("oak", 0.7)
+
+    # each call has a session of its own
+    assert graph.jsonify(Brick(1, oak)) == graph.jsonify(Brick(1, oak))
+    assert graph.jsonify([oak, oak]) == [{"name": "oak", "density": 0.7, "$id": 0}, {"$ref": 0}]
+
+    bricks = graph.unjsonify[list[Brick]](graph.jsonify([Brick(1, oak), Brick(2, oak)]))
+    assert bricks[0].material is bricks[1].material
+
+
+def test_invalid_references():
+    for value in [{"$ref": 1}, {"$ref": 0, "name": "oak"}]:
+        with pytest.raises(UnjsonifyError, match="Invalid reference"):
+            graph.unjsonify[list[Material]]([{"name": "oak", "density": 0.7, "$id": 0}, value])
+
+    with pytest.raises(UnjsonifyError, match="Reference to Brick"):
+        graph.unjsonify[tuple[Brick, Material]]([
+            {"width": 1, "material": {"name": "oak", "density": 0.7}, "$id": 0},
+            {"$ref": 0},
+        ])
+
+
+def test_parent_registry():
+    api = Registry()
+
+    @api.jsonify.register(Material)
+    def _(value):
+        return value.name
+
+    @api.unjsonify.register(Material)
+    def _(value, as_type):
+        return Material(value, 0.0)
+
+    api_graph = GraphRegistry(api)
+    brick = Brick(1, Material("oak", 0.7))
+    jsonified = api_graph.jsonify([brick, brick])
+
+    assert jsonified == [{"width": 1, "material": "oak", "$id": 0}, {"$ref": 0}]
+
+    bricks = api_graph.unjsonify[list[Brick]](jsonified)
+    assert bricks[0] is bricks[1]
+    assert bricks[0].material == Material("oak", 0.0)
+
+
+@dataclass(eq=False)
+class Link:
+    name: str
+    next: "Link | None" = None
+    other: "Link | None" = None
+
+
+def test_deep_functions():
+    oak = Material("oak", 0.7)
+    box = Box([Brick(1, oak), Brick(2, oak)], spare=oak)
+    expression = And(Not(Variable("x")), Or(Variable("x"), Not(Variable("x"))))
+
+    for (value, as_type) in [
+        ([oak, oak], list[Material]),
+        (box, Box),
+        ([box, box], list[Box]),
+        (expression, Expression),
+    ]:
+        jsonified = graph.deep_jsonify(value)
+        assert jsonified == graph.jsonify(value)
+        assert graph.deep_unjsonify[as_type](jsonified) == graph.unjsonify[as_type](jsonified) == value
+
+    result = graph.deep_unjsonify[Box](graph.deep_jsonify(box))
+    assert result.bricks[0].material is result.bricks[1].material is result.spare
+
+    alice = Person("alice")
+    alice.friends += [Person("bob", [alice]), alice]
+
+    jsonified = graph.deep_jsonify(alice)
+    assert jsonified == graph.jsonify(alice)
+
+    result = graph.deep_unjsonify[Person](jsonified)
+    assert result.friends[0].friends[0] is result.friends[1] is result
+
+
+@jsno.bypass_init()
+@dataclass(eq=False)
+class Counted:
+    name: str
+    next: "Counted | None" = None
+
+    def __init__(self, *args, **kwargs):
+        raise AssertionError("__init__ called")
+
+
+def test_bypass_init():
+    first = Counted.__new__(Counted)
+    first.name = "a"
+    first.next = first
+
+    jsonified = graph.jsonify(first)
+    assert jsonified == {"name": "a", "next": {"$ref": 0}, "$id": 0}
+
+    for result in [graph.unjsonify[Counted](jsonified), graph.deep_unjsonify[Counted](jsonified)]:
+        assert result.name == "a"
+        assert result.next is result
+
+
+def test_deep_chain():
+    first = link = Link("0")
+    for i in range(1, 3_000):
+        link.next = Link(str(i), other=first)
+        link = link.next
+
+    link.next = first
+
+    with pytest.raises(RecursionError):
+        graph.jsonify(first)
+
+    jsonified = graph.deep_jsonify(first)
+    assert jsonified["$id"] == 0
+    assert jsonified["next"]["other"] == {"$ref": 0}
+
+    result = graph.deep_unjsonify[Link](jsonified)
+    link = result
+    for i in range(3_000):
+        assert link.name == str(i)
+        assert i == 0 or link.other is result
+        link = link.next
+
+    assert link is result
+
+
+def test_deep_invalid_references():
+    with pytest.raises(UnjsonifyError, match="Invalid reference"):
+        graph.deep_unjsonify[list[Material]]([{"$ref": 0}, {"name": "oak", "density": 0.7, "$id": 0}])
+
+    with pytest.raises(UnjsonifyError, match="Invalid id"):
+        graph.deep_unjsonify[Link]({"name": "a", "$id": "0"})
+
+    with pytest.raises(UnjsonifyError, match="Extra keys"):
+        graph.deep_unjsonify[Link]({"name": "a", "next": {"$ref": 0}, "$id": 0, "extra": 1})
@@ -0,0 +1,33 @@
+import dataclasses
+import datetime
+import decimal
+import enum
+
+from jsno.immutable import is_immutable
+
+
+class Color(enum.Enum):
+    RED = "red"
+
+
+@dataclasses.dataclass(frozen=True)
+class Frozen:
+    value: tuple
+
+
+@dataclasses.dataclass
+class Mutable:
+    value: int
+
+
+def test_immutable_values():
+    for value in [
+        None, True, 1, 1.5, 1j, "x", b"x", range(3), (1, ("a", None)), frozenset({1}),
+        Color.RED, int, datetime.date(2024, 1, 2), decimal.Decimal("1.5"), Frozen((1, 2)),
+    ]:
+        assert is_immutable(value), value
+
+
+def test_mutable_values():
+    for value in [[], {}, set(), bytearray(), (1, []), Frozen(([],)), Mutable(1), object()]:
+        assert not is_immutable(value), value
@@ -0,0 +1,171 @@
+import datetime
+import decimal
+import threading
+
+from dataclasses import dataclass, field
+from typing import Annotated, NamedTuple
+
+import jsno
+from jsno import unjsonify
+
+
+@dataclass(frozen=True)
+class Location:
+    country: str
+    city: str
+
+
+@dataclass
+class Visit:
+    status: Annotated[str, jsno.categorical]
+    location: Location
+    tags: dict[str, int]
+
+
+def make_visits(count):
+    return [
+        {
+            "status": "ok".join(["", ""]) + "ok",  # distinct string objects
+            "location": {"country": "FI", "city": "Helsinki"},
+            "tags": {"x" + str(index % 2): index},
+        }
+        for index in range(count)
+    ]
+
+
+def test_no_sharing_outside_session():
+    visits = unjsonify[list[Visit]](make_visits(2))
+    assert visits[0].location == visits[1].location
+    assert visits[0].location is not visits[1].location
+
+
+def test_share_frozen_dataclasses():
+    with unjsonify.interning() as session:
+        visits = unjsonify[list[Visit]](make_visits(3))
+
+    assert visits[0].location is visits[1].location is visits[2].location
+    assert session.hits >= 2
+
+
+def test_intern_categorical_strings():
+    data = make_visits(2)
+    assert data[0]["status"] is not data[1]["status"]
+
+    with unjsonify.interning():
+        visits = unjsonify[list[Visit]](data)
+
+    assert visits[0].status is visits[1].status
+
+
+def test_intern_keys():
+    data = make_visits(4)
+    assert next(iter(data[0]["tags"])) is not next(iter(data[2]["tags"]))
+
+    with unjsonify.interning(keys=True):
+        visits = unjsonify[list[Visit]](data)
+
+    assert next(iter(visits[0].tags)) is next(iter(visits[2].tags))
+
+
+def test_objects_can_be_disabled():
+    with unjsonify.interning(objects=False):
+        visits = unjsonify[list[Visit]](make_visits(2))
+
+    assert visits[0].location is not visits[1].location
+
+
+def test_bounded_tables():
+    with unjsonify.interning(maxsize=1) as session:
+        unjsonify[list[Location]]([
+            {"country": "FI", "city": "Helsinki"},
+            {"country": "SE", "city": "Stockholm"},
+        ])
+
+    assert len(session.values) == 1
+
+
+def test_values_of_different_types_are_not_mixed():
+    with unjsonify.interning():
+        values = unjsonify[list[tuple[int | bool]]]([[1], [True]])
+
+    assert type(values[0][0]) is int
+    assert type(values[1][0]) is bool
+
+
+@dataclass(frozen=True)
+class Entry:
+    at: datetime.datetime
+    amount: decimal.Decimal
+    delta: float
+
+
+def test_equal_values_that_are_not_the_same_are_not_mixed():
+    data = [
+        {"at": "2020-01-01T00:00:00Z", "amount": "1.0", "delta": 0.0},
+        {"at": "2020-01-01T02:00:00+02:00", "amount": "1.00", "delta": -0.0},
+    ]
+
+    with unjsonify.interning():
+        entries = unjsonify[list[Entry]](data)
+        items = unjsonify[list[tuple[float, decimal.Decimal]]]([[0.0, "1.0"], [-0.0, "1.00"]])
+
+    assert entries[0] == entries[1]
+    assert entries[1].at.utcoffset() == datetime.timedelta(hours=2)
+    assert str(entries[1].amount) == "1.00"
+    assert str(entries[1].delta) == "-0.0"
+
+    assert [(str(left), str(right)) for (left, right) in items] == [("0.0", "1.0"), ("-0.0", "1.00")]
+
+    # identical values are still shared
+    with unjsonify.interning():
+        entries = unjsonify[list[Entry]](2 * [data[0]])
+        items = unjsonify[list[tuple[float, decimal.Decimal]]](2 * [[0.0, "1.0"]])
+
+    assert entries[0] is entries[1]
+    assert items[0] is items[1]
+
+
+class Pair(NamedTuple):
+    left: int
+    right: int
+
+
+def test_share_tuples():
+    with unjsonify.interning():
+        pairs = unjsonify[list[Pair]]([[1, 2], [1, 2]])
+        tuples = unjsonify[list[tuple[int, int]]]([[1, 2], [1, 2]])
+
+    assert pairs[0] is pairs[1]
+    assert type(pairs[0]) is Pair
+    assert tuples[0] is tuples[1]
+    assert type(tuples[0]) is tuple
+
+
+@dataclass(frozen=True)
+class Labeled:
+    value: int
+    label: str = field(compare=False)
+
+
+def test_dont_share_partially_compared_dataclasses():
+    with unjsonify.interning():
+        values = unjsonify[list[Labeled]]([
+            {"value": 1, "label": "a"},
+            {"value": 1, "label": "b"},
+        ])
+
+    assert [value.label for value in values] == ["a", "b"]
+
+
+def test_session_is_thread_local():
+    results = []
+
+    def decode():
+        results.extend(unjsonify[list[Location]](2 * [{"country": "FI", "city": "Turku"}]))
+
+    with unjsonify.interning():
+        thread = threading.Thread(target=decode)
+        thread.start()
+        thread.join()
+
+    assert results[0] is not results[1]
@@ -126,3 +126,115 @@ def test_namedtuple():
 
     entry = LogEntry(date=datetime.date(2023, 8, 5), message="ok")
     assert jsonify(entry) == ["2023-08-05", "ok"]
+
+
+def test_jsonify_native_tuple():
+    value = ("x", 1, 2.5, None, True)
+    assert jsonify(value) == ["x", 1, 2.5, None, True]
+    assert jsonify([(1, 2), (3, datetime.date(2023, 7, 15))]) == [[1, 2], [3, "2023-07-15"]]
+
+
+def test_jsonify_set_order():
+    assert jsonify({3, 1, 2}) == [1, 2, 3]
+    assert jsonify({datetime.date(2023, 7, 16), datetime.date(2023, 7, 15)}) == ["2023-07-15", "2023-07-16"]
+
+    # mixed types are grouped by the type name
+    assert jsonify({"b", 2, "a", 1}) == [1, 2, "a", "b"]
+
+
+def test_jsonify_unsorted_sets():
+    value = {"c", "a", "b"}
+
+    with jsonify.unsorted_sets():
+        assert jsonify(value) == list(value)
+        assert jsonify({"items": frozenset(value)}) == {"items": list(frozenset(value))}
+
+    assert jsonify(value) == ["a", "b", "c"]
+
+
+def test_jsonify_collections():
+    assert jsonify(collections.deque([1, datetime.date(2023, 7, 15)])) == [1, "2023-07-15"]
+    assert jsonify(collections.Counter("abb")) == {"a": 1, "b": 2}
+
+    value = collections.OrderedDict(b=1, a=datetime.date(2023, 7, 15))
+    assert jsonify(value) == {"b": 1, "a": "2023-07-15"}
+    assert type(jsonify(collections.OrderedDict(a=1))) is dict
+    assert type(jsonify(collections.defaultdict(list))) is dict
+
+
+def test_registering_overrides_container():
+    from jsno.abc import jsonify_set
+    from jsno.jsonify import register_container
+
+    class Bag(frozenset):
+        pass
+
+    register_container(Bag, jsonify_set)
+    assert jsonify(Bag({2, 1})) == [1, 2]
+
+    @jsonify.register(Bag)
+    def _(value):
+        return {"bag": sorted(value)}
+
+    assert jsonify(Bag({2, 1})) == {"bag": [1, 2]}
+
+
+def test_containers_are_registered_with_dispatched_jsonifiers():
+    from jsno.jsonify import container_jsonifiers, generic_jsonify
+
+    # tuples are registered when they are first jsonified
+    jsonify((1, 2))
+
+    for cls in [tuple, set, frozenset, collections.deque, collections.OrderedDict, collections.Counter]:
+        assert generic_jsonify.dispatch(cls) is container_jsonifiers[cls][1]
+
+
+def test_registering_after_use():
+    from jsno import Registry
+
+    class Base:
+        pass
+
+    class Derived(Base):
+        pass
+
+    registry = Registry()
+
+    jsonify.register(Base)(lambda value: "base")
+    assert jsonify(Derived()) == "base"
+    assert registry.jsonify(Derived()) == "base"
+
+    # the new registrations apply to the already seen types, also in
+    # the inheriting registries
+    jsonify.register(Derived)(lambda value: "derived")
+    assert jsonify(Derived()) == "derived"
+    assert registry.jsonify(Derived()) == "derived"
+
+    # the registry's own registrations take precedence over the parent's
+    registry.jsonify.register(Base)(lambda value: "registry base")
+    assert registry.jsonify(Derived()) == "registry base"
+    assert jsonify(Derived()) == "derived"
+
+
+def test_dispatch_misses():
+    from jsno import Registry
+
+    class Unknown:
+        pass
+
+    # load the datetime registrations first, as registering clears the
+    # exact-type tables
+    jsonify(datetime.date(2023, 7, 15))
+
+    registry = Registry()
+    registry.jsonify.register(Unknown)(lambda value: "unknown")
+
+    for _ in range(3):
+        assert registry.jsonify(Unknown()) == "unknown"
+        assert registry.jsonify(datetime.date(2023, 7, 15)) == "2023-07-15"
+
+        with pytest.raises(TypeError):
+            jsonify(Unknown())
+
+    assert dict(registry.jsonify.dispatch_misses()) == {Unknown: 1, datetime.date: 1}
+    assert dict(jsonify.dispatch_misses())[Unknown] == 3
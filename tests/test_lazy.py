@@ -0,0 +1,121 @@
+import subprocess
+import sys
+
+
+def run_python(code):
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip()
+
+
+def test_import_does_not_load_standard_library_modules():
+    output = run_python(
+        "import sys; "
+        "before = set(sys.modules); "
+        "import jsno; "
+        "print(sorted({'base64', 'datetime', 'decimal', 'pathlib', 'uuid', 'zoneinfo'} & (set(sys.modules) - before)))"
+    )
+    assert output == "[]"
+
+
+def test_import_does_not_load_optional_encodings():
+    output = run_python(
+        "import sys, jsno; "
+        "jsno.Registry(); "
+        "modules = ['jsno.array', 'jsno.buffers', 'jsno.codegen', 'jsno.construction', 'jsno.deep', 'jsno.enum', "
+        "'jsno.graph', 'jsno.msgpack', 'jsno.packing', 'jsno.tabular', 'jsno.tuple']; "
+        "print(sorted(name for name in modules if name in sys.modules))"
+    )
+    assert output == "[]"
+
+
+def test_optional_encodings_are_loaded_on_access():
+    output = run_python(
+        "import jsno; "
+        "from jsno import packb; "
+        "from jsno.registry import default_registry; "
+        "print(jsno.unpackb[list[int]](packb([1])), jsno.Registry().deep_jsonify([1]), "
+        "default_registry.deep_jsonify is jsno.deep_jsonify, jsno.Rows.__module__)"
+    )
+    assert output == "[1] [1] True jsno.tabular"
+
+
+def test_annotations_are_loaded_on_access():
+    output = run_python(
+        "import jsno; "
+        "print(jsno.Hex(), jsno.EnumCodec('int'), jsno.NamedTupleCodec('object'), jsno.packed, jsno.bypass_init.__module__)"
+    )
+    assert output == "Hex() EnumCodec(mode='int') NamedTupleCodec(mode='object') Packed(typecode=None) jsno.construction"
+
+
+def test_builtin_type_registrations_are_loaded_on_first_use():
+    output = run_python(
+        "import array, enum, jsno\n"
+        "class Color(enum.Enum):\n"
+        "    RED = 1\n"
+        "print(jsno.jsonify([(1, 2), b'ab', Color.RED, array.array('q', [3])]), "
+        "jsno.unjsonify[tuple[bytes, Color]](['YWI=', 'RED']), "
+        "jsno.Registry().unjsonify[array.array]([1, 2]))"
+    )
+    assert output == "[[1, 2], 'YWI=', 'RED', [3]] (b'ab', <Color.RED: 1>) array('q', [1, 2])"
+
+
+def test_registrations_are_loaded_on_jsonify():
+    output = run_python(
+        "import sys, datetime, jsno; "
+        "assert 'jsno.datetime' not in sys.modules; "
+        "print(jsno.jsonify(datetime.date(2023, 7, 30)))"
+    )
+    assert output == "2023-07-30"
+
+
+def test_registrations_are_loaded_on_unjsonify():
+    output = run_python(
+        "import decimal, jsno; "
+        "print(repr(jsno.unjsonify[list[decimal.Decimal]](['1.5'])))"
+    )
+    assert output == "[Decimal('1.5')]"
+
+
+def test_registrations_are_loaded_on_jsonify_as_type():
+    output = run_python(
+        "import uuid, jsno; "
+        "print(jsno.jsonify[uuid.UUID](uuid.UUID(int=1)))"
+    )
+    assert output == "00000000-0000-0000-0000-000000000001"
+
+
+def test_registrations_are_loaded_for_subclasses():
+    output = run_python(
+        "import datetime, jsno\n"
+        "class Day(datetime.date):\n"
+        "    pass\n"
+        "print(jsno.jsonify(Day(2023, 7, 30)), jsno.unjsonify[Day]('2023-07-30'))"
+    )
+    assert output == "2023-07-30 2023-07-30"
+
+
+def test_custom_registration_overrides_lazy_registration():
+    output = run_python(
+        "import datetime, jsno\n"
+        "@jsno.jsonify.register(datetime.date)\n"
+        "def _(value):\n"
+        "    return value.toordinal()\n"
+        "print(jsno.jsonify(datetime.date(2023, 7, 30)), jsno.jsonify(datetime.datetime(2023, 7, 30)))"
+    )
+    assert output == "738731 2023-07-30T00:00:00"
+
+
+def test_unknown_type_still_fails():
+    output = run_python(
+        "import datetime, jsno\n"
+        "try:\n"
+        "    jsno.unjsonify[datetime.tzinfo]\n"
+        "except TypeError as exc:\n"
+        "    print(exc)"
+    )
+    assert output == "Unjsonify not defined for tzinfo"
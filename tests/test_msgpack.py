@@ -0,0 +1,79 @@
+import dataclasses
+import datetime
+import io
+
+import pytest
+
+from jsno import packb, unpackb, UnjsonifyError
+from jsno.msgpack import decode, pack, unpack, CHUNK_SIZE
+
+
+@dataclasses.dataclass
+class Blob:
+    name: str
+    data: bytes
+    created: datetime.date
+    tags: list[str]
+    size: int | None = None
+
+
+def test_pack_and_unpack_dataclass():
+    blob = Blob(name="x", data=b"\x00\xff", created=datetime.date(2024, 1, 2), tags=["a"], size=2)
+    data = packb(blob)
+
+    # bytes are packed as binary, not as base64
+    assert b"\xc4\x02\x00\xff" in data
+    assert unpackb[Blob](data) == blob
+
+
+@pytest.mark.parametrize("value", [
+    None, True, False,
+    0, 1, 127, 128, 255, 256, 65535, 65536, 2 ** 32, 2 ** 64 - 1,
+    -1, -32, -33, -128, -129, -32768, -32769, -2 ** 31 - 1, -2 ** 63,
+    0.0, 1.5, -2.25,
+    "", "x", "ä" * 40, "y" * 300, "z" * 70000,
+    [], [1, [2, [3]]], list(range(20)), list(range(70000)),
+    {}, {"a": 1}, {str(i): i for i in range(20)},
+])
+def test_round_trip(value):
+    assert decode(packb(value)) == value
+
+
+def test_known_encodings():
+    assert packb(None) == b"\xc0"
+    assert packb([1, -1]) == b"\x92\x01\xff"
+    assert packb({"a": "b"}) == b"\x81\xa1a\xa1b"
+    assert packb(1.5) == b"\xcb\x3f\xf8\x00\x00\x00\x00\x00\x00"
+    assert packb(300) == b"\xcd\x01\x2c"
+
+
+def test_decode_float32():
+    assert decode(b"\xca\x3f\xc0\x00\x00") == 1.5
+
+
+def test_pack_to_file():
+    value = [b"x" * 1000] * (2 * CHUNK_SIZE // 1000)
+    file = io.BytesIO()
+    pack(value, file)
+
+    assert file.getvalue() == packb(value)
+
+    file.seek(0)
+    assert unpack[list[bytes]](file) == value
+
+
+def test_errors():
+    with pytest.raises(OverflowError):
+        packb(2 ** 64)
+
+    with pytest.raises(ValueError, match="Truncated"):
+        decode(b"\x92\x01")
+
+    with pytest.raises(ValueError, match="Extra data"):
+        decode(b"\x01\x02")
+
+    with pytest.raises(ValueError, match="Unsupported"):
+        decode(b"\xc1")
+
+    with pytest.raises(UnjsonifyError):
+        unpackb[bytes](packb("text"))
@@ -0,0 +1,118 @@
+from dataclasses import dataclass
+from typing import Annotated
+
+import pytest
+
+import jsno
+from jsno import UnjsonifyError
+
+numpy = pytest.importorskip("numpy")
+npt = pytest.importorskip("numpy.typing")
+
+from jsno.numpy import Array  # noqa: E402
+
+
+def test_jsonify_array():
+    assert jsno.jsonify(numpy.array([[1, 2], [3, 4]])) == [[1, 2], [3, 4]]
+    assert jsno.jsonify(numpy.array([1.5, 2.5], dtype="float32")) == [1.5, 2.5]
+    assert jsno.jsonify(numpy.array([True, False])) == [True, False]
+
+
+def test_jsonify_array_of_other_kinds():
+    dates = numpy.array(["2020-01-01", "2020-01-02"], dtype="datetime64[D]")
+    assert jsno.jsonify(dates) == ["2020-01-01", "2020-01-02"]
+    assert jsno.jsonify(numpy.array([1 + 2j])) == jsno.jsonify([1 + 2j])
+    assert jsno.jsonify(numpy.array([b"ab"])) == jsno.jsonify([b"ab"])
+    assert jsno.jsonify(numpy.array(["a", "b"])) == ["a", "b"]
+
+
+def test_jsonify_scalar():
+    value = jsno.jsonify(numpy.int64(3))
+    assert value == 3 and type(value) is int
+    assert type(jsno.jsonify(numpy.float32(1.5))) is float
+
+
+def test_unjsonify_array():
+    array = jsno.unjsonify[numpy.ndarray]([[1, 2], [3, 4]])
+    assert array.shape == (2, 2)
+    assert array.dtype.kind == "i"
+
+
+def test_unjsonify_typed_array():
+    array = jsno.unjsonify[npt.NDArray[numpy.float32]]([1, 2.5])
+    assert array.dtype == numpy.float32
+    assert array.tolist() == [1.0, 2.5]
+
+
+def test_unjsonify_array_rejects_invalid_items():
+    with pytest.raises(UnjsonifyError):
+        jsno.unjsonify[npt.NDArray[numpy.float64]]([1.0, True])
+
+    with pytest.raises(UnjsonifyError):
+        jsno.unjsonify[npt.NDArray[numpy.int64]]([1, 2.5])
+
+    with pytest.raises(UnjsonifyError):
+        jsno.unjsonify[numpy.ndarray](["a", "b"])
+
+    with pytest.raises(UnjsonifyError):
+        jsno.unjsonify[numpy.ndarray]([[1, 2], [3]])
+
+
+def test_unjsonify_array_with_shape():
+    as_type = Annotated[numpy.ndarray, Array(dtype="uint8", shape=(None, 3))]
+
+    array = jsno.unjsonify[as_type]([[1, 2, 3], [4, 5, 6]])
+    assert array.dtype == numpy.uint8
+
+    with pytest.raises(UnjsonifyError):
+        jsno.unjsonify[as_type]([[1, 2], [3, 4]])
+
+    with pytest.raises(UnjsonifyError):
+        jsno.unjsonify[as_type]([1, 2, 3])
+
+
+def test_base64_encoding():
+    as_type = Annotated[numpy.ndarray, Array(dtype="float32", encoding="base64")]
+    array = numpy.arange(6, dtype="float32").reshape(2, 3)
+
+    json = jsno.jsonify[as_type](array)
+    assert json["shape"] == [2, 3]
+    assert isinstance(json["data"], str)
+
+    result = jsno.unjsonify[as_type](json)
+    assert result.dtype == numpy.float32
+    assert (result == array).all()
+
+    # the result is writable, like arrays unjsonified from lists
+    result[0, 0] = 10
+    assert result.flags.writeable
+
+    with pytest.raises(UnjsonifyError):
+        jsno.unjsonify[as_type](dict(json, dtype="<f8"))
+
+    with pytest.raises(UnjsonifyError):
+        jsno.unjsonify[as_type](dict(json, shape=[4, 4]))
+
+
+def test_dataclass_with_arrays():
+
+    @dataclass
+    class Measurement:
+        name: str
+        values: npt.NDArray[numpy.float64]
+        count: numpy.int32
+
+    value = Measurement(name="x", values=numpy.array([1.0, 2.0]), count=numpy.int32(2))
+    json = jsno.jsonify(value)
+    assert json == {"name": "x", "values": [1.0, 2.0], "count": 2}
+
+    result = jsno.unjsonify[Measurement](json)
+    assert result.values.dtype == numpy.float64
+    assert type(result.count) is numpy.int32
+
+
+def test_unjsonify_scalar_rejects_bool():
+    with pytest.raises(UnjsonifyError):
+        jsno.unjsonify[numpy.float64](True)
+
+    assert jsno.unjsonify[numpy.bool_](True)
@@ -0,0 +1,88 @@
+import dataclasses
+import datetime
+import enum
+import mmap
+
+import pytest
+
+from jsno import bypass_init, pack_many, unpack_many
+from jsno.packing import get_layout
+
+
+class Level(enum.IntEnum):
+    LOW = 1
+    HIGH = 2
+
+
+@dataclasses.dataclass(frozen=True)
+class Reading:
+    sensor: int
+    value: float
+    valid: bool
+    level: Level
+    day: datetime.date
+    at: datetime.datetime
+    duration: datetime.timedelta
+
+
+@bypass_init()
+@dataclasses.dataclass(frozen=True, slots=True)
+class Point:
+    x: float
+    y: float
+
+
+readings = [
+    Reading(
+        sensor=index,
+        value=index * 1.5,
+        valid=index % 2 == 0,
+        level=Level.HIGH,
+        day=datetime.date(2024, 1, 2),
+        at=datetime.datetime(2024, 1, 2, 3, 4, 5, 6, tzinfo=datetime.timezone.utc),
+        duration=datetime.timedelta(seconds=index),
+    )
+    for index in range(3)
+]
+
+
+def test_pack_and_unpack():
+    data = pack_many(readings)
+
+    assert len(data) == 3 * get_layout(Reading).struct.size
+    assert unpack_many[Reading](data) == readings
+
+
+def test_unpack_from_memoryview_and_mmap():
+    points = [Point(1.0, 2.0), Point(3.0, 4.5)]
+    data = pack_many(points)
+
+    assert unpack_many[Point](memoryview(data)) == points
+
+    with mmap.mmap(-1, len(data)) as buffer:
+        buffer.write(data)
+        assert unpack_many[Point](buffer) == points
+
+
+def test_pack_empty():
+    assert pack_many([]) == b""
+    assert unpack_many[Point](b"") == []
+
+
+def test_pack_errors():
+
+    @dataclasses.dataclass
+    class Named:
+        name: str
+
+    with pytest.raises(TypeError):
+        pack_many([Named("x")])
+
+    with pytest.raises(TypeError):
+        pack_many([Point(1.0, 2.0), readings[0]])
+
+    with pytest.raises(ValueError):
+        pack_many([dataclasses.replace(readings[0], at=datetime.datetime(2024, 1, 2))])
+
+    with pytest.raises(ValueError):
+        unpack_many[Point](b"123")
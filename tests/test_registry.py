@@ -0,0 +1,176 @@
+import dataclasses
+import datetime
+
+import pytest
+
+import jsno
+
+from jsno import jsonify, unjsonify, Registry, UnjsonifyError, variantfamily, variantlabel
+
+
+@dataclasses.dataclass
+class Event:
+    name: str
+    at: datetime.date
+
+
+def make_epoch_registry(parent=None):
+    registry = Registry(parent)
+
+    @registry.jsonify.register(datetime.date)
+    def _(value):
+        return value.toordinal()
+
+    @registry.unjsonify.register(datetime.date)
+    def _(value, as_type):
+        return as_type.fromordinal(value)
+
+    return registry
+
+
+def test_registry_overrides_default_registrations():
+    registry = make_epoch_registry()
+    event = Event(name="launch", at=datetime.date(2024, 1, 2))
+    ordinal = datetime.date(2024, 1, 2).toordinal()
+
+    assert registry.jsonify(event) == {"name": "launch", "at": ordinal}
+    assert registry.unjsonify[Event]({"name": "launch", "at": ordinal}) == event
+    assert registry.unjsonify[list[datetime.date]]([ordinal]) == [event.at]
+
+    # the default registry is not affected
+    assert jsonify(event) == {"name": "launch", "at": "2024-01-02"}
+    assert unjsonify[Event]({"name": "launch", "at": "2024-01-02"}) == event
+
+
+def test_registry_inherits_registrations():
+    registry = Registry()
+
+    assert registry.jsonify({"a": [1, 2.5]}) == {"a": [1, 2.5]}
+    assert registry.unjsonify[dict[str, int]]({"a": 1}) == {"a": 1}
+    assert registry.unjsonify[datetime.date]("2024-01-02") == datetime.date(2024, 1, 2)
+
+
+def test_registry_inherits_from_parent_registry():
+    parent = make_epoch_registry()
+    child = Registry(parent)
+    ordinal = datetime.date(2024, 1, 2).toordinal()
+
+    assert child.unjsonify[datetime.date](ordinal) == datetime.date(2024, 1, 2)
+    assert child.jsonify[datetime.date](datetime.date(2024, 1, 2)) == ordinal
+
+
+def test_registry_dumps_and_loads():
+    registry = make_epoch_registry()
+    event = Event(name="launch", at=datetime.date(2024, 1, 2))
+
+    text = registry.dumps(event)
+    assert registry.loads[Event](text) == event
+    assert jsno.loads[Event](jsno.dumps(event)) == event
+
+
+def test_registration_in_parent_invalidates_child():
+    parent = Registry()
+    child = Registry(parent)
+
+    @dataclasses.dataclass
+    class Temperature:
+        celsius: float
+
+    assert child.unjsonify[list[Temperature]]([{"celsius": 1.5}]) == [Temperature(1.5)]
+
+    @parent.unjsonify.register(Temperature)
+    def _(value, as_type):
+        return as_type(celsius=value)
+
+    assert child.unjsonify[list[Temperature]]([1.5]) == [Temperature(1.5)]
+
+
+def test_registration_drops_only_dependent_specializations():
+    registry = Registry()
+
+    @dataclasses.dataclass
+    class Money:
+        cents: int
+
+    @dataclasses.dataclass
+    class Order:
+        total: Money
+
+    @dataclasses.dataclass
+    class Unrelated:
+        name: str
+
+    order = registry.unjsonify[Order]
+    unrelated = registry.unjsonify[Unrelated]
+    integers = registry.unjsonify[list[int]]
+
+    @registry.unjsonify.register(Money)
+    def _(value, as_type):
+        return as_type(cents=round(value * 100))
+
+    assert registry.unjsonify[Unrelated] is unrelated
+    assert registry.unjsonify[list[int]] is integers
+    assert registry.unjsonify[Order] is not order
+    assert registry.unjsonify[Order]({"total": 1.25}) == Order(Money(125))
+
+
+def test_registration_for_base_class_invalidates_subclasses():
+    registry = Registry()
+
+    class Base:
+        pass
+
+    @dataclasses.dataclass
+    class Derived(Base):
+        name: str
+
+    assert registry.unjsonify[Derived]({"name": "x"}) == Derived(name="x")
+
+    @registry.unjsonify.register(Base)
+    def _(value, as_type):
+        return as_type(name=value)
+
+    assert registry.unjsonify[Derived]("x") == Derived(name="x")
+
+
+@dataclasses.dataclass
+class Node:
+    at: datetime.date
+    children: list["Node"]
+
+
+def test_recursive_types_resolve_in_registry():
+    registry = make_epoch_registry()
+    ordinal = datetime.date(2024, 1, 2).toordinal()
+    value = {"at": ordinal, "children": [{"at": ordinal, "children": []}]}
+
+    node = registry.unjsonify[Node](value)
+    assert node.children[0].at == datetime.date(2024, 1, 2)
+
+    with pytest.raises(UnjsonifyError):
+        unjsonify[Node](value)
+
+
+def test_variants_resolve_in_registry():
+    registry = make_epoch_registry()
+
+    @variantfamily(label="type")
+    class Shape:
+        pass
+
+    @variantlabel("dated")
+    @dataclasses.dataclass
+    class Dated(Shape):
+        at: datetime.date
+
+    ordinal = datetime.date(2024, 1, 2).toordinal()
+    assert registry.unjsonify[Shape]({"type": "dated", "at": ordinal}) == Dated(datetime.date(2024, 1, 2))
+
+
+def test_schema_resolves_in_registry():
+    registry = make_epoch_registry()
+    schema = jsno.Schema({"at": datetime.date})
+    ordinal = datetime.date(2024, 1, 2).toordinal()
+
+    assert registry.unjsonify[schema]({"at": ordinal}) == {"at": datetime.date(2024, 1, 2)}
+    assert unjsonify[schema]({"at": "2024-01-02"}) == {"at": datetime.date(2024, 1, 2)}
@@ -1,3 +1,5 @@
+import dataclasses
+
 from datetime import date
 from typing import NotRequired, Annotated
 
@@ -196,3 +198,37 @@ def test_property_name_with_funcion_args_schema():
     schema = Schema.from_arguments(testfunc)
 
     assert testfunc(**schema.unjsonify({"class-name": "abc"})) == "abc"
+
+
+def test_schema_immutable_default_is_shared():
+    default = ("a", 1)
+    result = Schema({"value": (tuple, default)}).unjsonify({})
+
+    assert result["value"] is default
+
+
+def test_schema_mutable_default_is_copied():
+    default = {"tags": []}
+    result = Schema({"value": (dict, default)}).unjsonify({})
+
+    assert result["value"] == default
+    assert result["value"] is not default
+    assert result["value"]["tags"] is not default["tags"]
+
+
+def test_schema_default_factory():
+    result = Schema({"items": (list[int], dataclasses.field(default_factory=list))}).unjsonify({})
+
+    assert result == {"items": []}
+
+
+def test_schema_default_given_as_field():
+    schema = Schema({
+        "count": (int, dataclasses.field(default=0)),
+        "name": (str, dataclasses.field()),
+    })
+
+    assert schema.unjsonify({"name": "x"}) == {"count": 0, "name": "x"}
+
+    with pytest.raises(UnjsonifyError):
+        schema.unjsonify({})
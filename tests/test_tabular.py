@@ -0,0 +1,193 @@
+import dataclasses
+import datetime
+
+from typing import Annotated
+
+import pytest
+
+from jsno import jsonify, unjsonify, Columnar, Constraint, Registry, Rows, UnjsonifyError
+
+
+@dataclasses.dataclass
+class Sample:
+    name: str
+    value: float
+    at: datetime.date | None = None
+
+
+Samples = Annotated[list[Sample], Columnar()]
+
+
+@dataclasses.dataclass
+class Export:
+    title: str
+    samples: Samples
+
+
+samples = [
+    Sample("a", 1.5, datetime.date(2024, 1, 2)),
+    Sample("b", 2.0),
+]
+
+columnar = {
+    "fields": ["name", "value", "at"],
+    "columns": {
+        "name": ["a", "b"],
+        "value": [1.5, 2.0],
+        "at": ["2024-01-02", None],
+    },
+}
+
+
+def test_jsonify_columnar():
+    assert jsonify[Samples](samples) == columnar
+
+
+def test_unjsonify_columnar():
+    assert unjsonify[Samples](columnar) == samples
+
+
+def test_columnar_field():
+    export = Export(title="x", samples=samples)
+    value = {"title": "x", "samples": columnar}
+
+    assert jsonify(export) == value
+    assert unjsonify[Export](value) == export
+
+
+def test_columnar_missing_column_uses_defaults():
+    value = {"fields": ["name", "value"], "columns": {"name": ["a"], "value": [1]}}
+    assert unjsonify[Samples](value) == [Sample("a", 1)]
+
+
+def test_columnar_errors():
+    with pytest.raises(UnjsonifyError, match="length"):
+        unjsonify[Samples]({"fields": ["name", "value"], "columns": {"name": ["a"], "value": []}})
+
+    with pytest.raises(UnjsonifyError, match="Unknown field"):
+        unjsonify[Samples]({"fields": ["size"], "columns": {"size": [1]}})
+
+    with pytest.raises(UnjsonifyError):
+        unjsonify[Samples]({"fields": ["name"], "columns": {"name": ["a"]}})
+
+    with unjsonify.ignore_extra_keys():
+        value = {"fields": ["name", "value", "size"], "columns": {"name": ["a"], "value": [1], "size": [1]}}
+        assert unjsonify[Samples](value) == [Sample("a", 1)]
+
+
+def test_columnar_requires_same_class():
+
+    @dataclasses.dataclass
+    class Special(Sample):
+        pass
+
+    with pytest.raises(TypeError):
+        jsonify[Samples]([Special("a", 1.0)])
+
+    with pytest.raises(TypeError):
+        jsonify[Annotated[list[int], Columnar()]]([1])
+
+
+@dataclasses.dataclass
+@Constraint(lambda it: it.lo <= it.hi, name="ordered")
+class Interval:
+    lo: int
+    hi: int
+
+
+def test_columnar_constraints():
+    Intervals = Annotated[list[Interval], Columnar()]
+    value = jsonify[Intervals]([Interval(1, 5), Interval(5, 1)])
+
+    with pytest.raises(UnjsonifyError, match="ordered"):
+        unjsonify[Intervals](value)
+
+    with unjsonify.trusted():
+        assert unjsonify[Intervals](value) == [Interval(1, 5), Interval(5, 1)]
+
+
+def test_columnar_in_registry():
+    registry = Registry()
+
+    @registry.jsonify.register(datetime.date)
+    def _(value):
+        return value.toordinal()
+
+    @registry.unjsonify.register(datetime.date)
+    def _(value, as_type):
+        return as_type.fromordinal(value)
+
+    value = registry.jsonify[Samples](samples)
+    assert value["columns"]["at"] == [datetime.date(2024, 1, 2).toordinal(), None]
+    assert registry.unjsonify[Samples](value) == samples
+
+
+@dataclasses.dataclass
+class Event:
+    kind: str
+    count: int
+    note: str | None = None
+
+
+Events = Annotated[list[Event], Rows(strings=True)]
+
+events = [
+    Event("click", 1),
+    Event("view", 2, "first"),
+    Event("click", 3),
+]
+
+
+def test_jsonify_rows():
+    assert jsonify[Annotated[list[Event], Rows()]](events) == {
+        "fields": ["kind", "count", "note"],
+        "rows": [["click", 1, None], ["view", 2, "first"], ["click", 3, None]],
+    }
+
+
+def test_jsonify_rows_with_string_table():
+    assert jsonify[Events](events) == {
+        "fields": ["kind", "count", "note"],
+        "strings": ["click", "view", "first"],
+        "encoded": [0, 2],
+        "rows": [[0, 1, None], [1, 2, 2], [0, 3, None]],
+    }
+
+
+def test_unjsonify_rows():
+    assert unjsonify[Events](jsonify[Events](events)) == events
+    assert unjsonify[Events]({"fields": ["count", "kind"], "rows": [[1, "x"]]}) == [Event("x", 1)]
+
+
+def test_rows_nested_values():
+    Nested = Annotated[list[Export], Rows(strings=True)]
+    exports = [Export(title="x", samples=samples)]
+
+    value = jsonify[Nested](exports)
+    assert value["rows"] == [[0, columnar]]
+    assert unjsonify[Nested](value) == exports
+
+
+def test_rows_constraints():
+    IntervalRows = Annotated[list[Interval], Rows()]
+
+    with pytest.raises(UnjsonifyError, match="ordered"):
+        unjsonify[IntervalRows]({"fields": ["lo", "hi"], "rows": [[1, 5], [5, 1]]})
+
+    with unjsonify.trusted():
+        assert unjsonify[IntervalRows]({"fields": ["lo", "hi"], "rows": [[5, 1]]}) == [Interval(5, 1)]
+
+
+def test_rows_errors():
+    with pytest.raises(UnjsonifyError, match="Row length"):
+        unjsonify[Events]({"fields": ["kind", "count"], "rows": [["x"]]})
+
+    with pytest.raises(UnjsonifyError, match="string index"):
+        unjsonify[Events]({"fields": ["kind", "count"], "strings": [], "encoded": [0], "rows": [[0, 1]]})
+
+    for index in [-1, True, 1.0, "0", 2]:
+        with pytest.raises(UnjsonifyError, match="Invalid string index"):
+            unjsonify[Events]({"fields": ["kind", "count"], "strings": ["a", "b"], "encoded": [0], "rows": [[index, 1]]})
+
+    with pytest.raises(UnjsonifyError):
+        unjsonify[Events]({"fields": ["count"], "rows": [[1]]})
@@ -0,0 +1,111 @@
+import datetime
+
+from dataclasses import dataclass
+from typing import Annotated, NamedTuple
+
+import pytest
+
+import jsno
+from jsno import jsonify, unjsonify, NamedTupleCodec, Registry, UnjsonifyError
+from jsno.datetime import EpochSeconds
+
+
+class Point(NamedTuple):
+    x: float
+    y: float
+
+
+class Sample(NamedTuple):
+    time: datetime.datetime // jsno.codec(EpochSeconds)
+    value: Annotated[int, jsno.Constraint.range(min=1)]
+    label: str | None = None
+
+
+class Node(NamedTuple):
+    name: str
+    children: "list[Node]"
+
+
+def test_native_items():
+    assert unjsonify[tuple[float, str]]([1.5, "a"]) == (1.5, "a")
+    assert unjsonify[list[Point]]([[1.5, 2.5]]) == [Point(1.5, 2.5)]
+
+    # items of other types are converted
+    assert unjsonify[Point]([1, 2]) == Point(1.0, 2.0)
+    assert type(unjsonify[Point]([1, 2]).x) is float
+
+    for value in [[1.5], [1.5, 2.5, 3.5], [1.5, "a"], {"x": 1.5, "y": 2.5}, None]:
+        with pytest.raises(UnjsonifyError):
+            unjsonify[Point](value)
+
+
+def test_field_types():
+    time = datetime.datetime(2026, 1, 2, tzinfo=datetime.timezone.utc)
+
+    assert jsonify(Sample(time, 3)) == [1767312000, 3, None]
+    assert unjsonify[Sample]([1767312000, 3, "x"]) == Sample(time, 3, "x")
+
+    with pytest.raises(UnjsonifyError):
+        unjsonify[Sample]([1767312000, 0, None])
+
+
+def test_untyped():
+    with pytest.raises(UnjsonifyError):
+        unjsonify[tuple](None)
+
+    with pytest.raises(UnjsonifyError):
+        unjsonify[tuple[int, int]](3)
+
+
+def test_recursive():
+    tree = Node("a", [Node("b", []), Node("c", [Node("d", [])])])
+
+    assert jsonify(tree) == ["a", [["b", []], ["c", [["d", []]]]]]
+    assert unjsonify[Node](jsonify(tree)) == tree
+
+
+def test_object_form():
+    @dataclass
+    class Route:
+        start: Annotated[Point, NamedTupleCodec("object")]
+        first: Annotated[Sample, NamedTupleCodec("object")]
+        last: Annotated[Sample, NamedTupleCodec("object")]
+
+    time = datetime.datetime(2026, 1, 2, tzinfo=datetime.timezone.utc)
+    route = Route(Point(1.0, 2.0), Sample(time, 1), Sample(time, 2, "x"))
+
+    json_value = {
+        "start": {"x": 1.0, "y": 2.0},
+        "first": {"time": 1767312000, "value": 1},
+        "last": {"time": 1767312000, "value": 2, "label": "x"},
+    }
+
+    assert jsonify(route) == json_value
+    assert unjsonify[Route](json_value) == route
+
+    for value in [{"x": 1.0}, {"x": 1.0, "y": 2.0, "z": 3.0}, [1.0, 2.0]]:
+        with pytest.raises(UnjsonifyError):
+            unjsonify[Annotated[Point, NamedTupleCodec("object")]](value)
+
+
+def test_recursive_object_form():
+    Tree = Annotated[Node, NamedTupleCodec("object")]
+
+    class Forest(NamedTuple):
+        trees: list[Tree]
+
+    forest = Forest([Node("a", [Node("b", [])])])
+    assert unjsonify[Forest]([[{"name": "a", "children": [["b", []]]}]]) == forest
+
+
+def test_registry_form():
+    registry = Registry()
+    registry.register_codec(Point, NamedTupleCodec("object"))
+
+    assert registry.jsonify([Point(1.0, 2.0)]) == [{"x": 1.0, "y": 2.0}]
+    assert registry.unjsonify[list[Point]]([{"x": 1.0, "y": 2.0}]) == [Point(1.0, 2.0)]
+
+    assert jsonify([Point(1.0, 2.0)]) == [[1.0, 2.0]]
+
+    with pytest.raises(TypeError):
+        registry.register_codec(tuple, NamedTupleCodec("object"))